@@ -0,0 +1,48 @@
+"""
+benchmark grabs per second of the old per call capture_screenshot path
+against the persistent CaptureEngine session
+
+run from the repo root: python -m benchmarks.bench_capture
+"""
+import argparse
+import time
+from components.capture_engine import CaptureEngine
+from components.main_window import capture_screenshot
+
+
+def grabs_per_second(grab, seconds):
+    """calls grab for the given amount of seconds and returns grabs per second"""
+    grab()
+    count = 0
+    start = time.perf_counter()
+    while time.perf_counter() - start < seconds:
+        grab()
+        count += 1
+    return count / (time.perf_counter() - start)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--monitor", type=int, default=1)
+    parser.add_argument("--seconds", type=float, default=3.0)
+    parser.add_argument(
+        "--sizes", type=int, nargs="+", default=[64, 200, 400, 800]
+    )
+    args = parser.parse_args()
+
+    print(f"{'region':>10} {'per call':>12} {'session':>12} {'speedup':>8}")
+    for size in args.sizes:
+        monitor = {"left": 0, "top": 0, "width": size, "height": size}
+        per_call = grabs_per_second(
+            lambda: capture_screenshot(monitor, args.monitor), args.seconds
+        )
+        with CaptureEngine(monitor, args.monitor) as engine:
+            session = grabs_per_second(engine.grab, args.seconds)
+        print(
+            f"{size:>4}x{size:<5} {per_call:>10.1f}/s {session:>10.1f}/s "
+            f"{session / per_call:>7.2f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
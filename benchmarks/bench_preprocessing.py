@@ -0,0 +1,67 @@
+"""
+benchmark the old PIL upscale_image + adaptive_thresholding pipeline against the
+numpy preprocessing module on a few frame sizes
+
+run from the repo root: python -m benchmarks.bench_preprocessing
+"""
+import argparse
+import timeit
+import numpy as np
+from PIL import Image, ImageDraw
+from components.ocr_worker import adaptive_thresholding, upscale_image
+from components.preprocessing import (
+    OTSU,
+    SAUVOLA,
+    THRESHOLD_FIRST,
+    UPSCALE_FIRST,
+    bgra_to_gray,
+    preprocess,
+)
+
+SIZES = [(400, 60), (800, 200), (1280, 360), (1920, 1080)]
+
+
+def make_frame(width, height):
+    """noisy background with lines of text, returned as raw bgra like mss gives"""
+    rng = np.random.default_rng(0)
+    background = rng.integers(20, 90, (height, width), dtype=np.uint8)
+    image = Image.fromarray(background).convert("RGB")
+    draw = ImageDraw.Draw(image)
+    for y in range(5, height - 15, 24):
+        draw.text((10, y), "The quick brown fox jumps over the lazy dog " * 4, fill="white")
+    bgra = np.dstack([np.asarray(image)[:, :, ::-1], np.full((height, width), 255, np.uint8)])
+    return bgra.tobytes()
+
+
+def old_pipeline(raw, width, height):
+    """what the capture loop and ocr worker did before"""
+    bgra = np.frombuffer(raw, dtype=np.uint8).reshape(height, width, 4)
+    image = Image.frombytes("RGB", (width, height), bgra[:, :, 2::-1].tobytes())
+    image = image.convert("L")
+    return adaptive_thresholding(upscale_image(image))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--repeat", type=int, default=10)
+    args = parser.parse_args()
+
+    cases = {
+        "old pil": lambda raw, w, h: old_pipeline(raw, w, h),
+        "otsu": lambda raw, w, h: preprocess(bgra_to_gray(raw, w, h), OTSU, order=THRESHOLD_FIRST),
+        "sauvola": lambda raw, w, h: preprocess(bgra_to_gray(raw, w, h), SAUVOLA, order=THRESHOLD_FIRST),
+        "otsu upscale first": lambda raw, w, h: preprocess(bgra_to_gray(raw, w, h), OTSU, order=UPSCALE_FIRST),
+    }
+
+    print(f"{'frame':>10}" + "".join(f"{name:>20}" for name in cases))
+    for width, height in SIZES:
+        raw = make_frame(width, height)
+        row = f"{width:>4}x{height:<5}"
+        for run in cases.values():
+            seconds = timeit.timeit(lambda: run(raw, width, height), number=args.repeat)
+            row += f"{seconds / args.repeat * 1000:>17.2f} ms"
+        print(row)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,67 @@
+"""
+benchmark the sklearn tf-idf similarity against the hashed n-gram dedup history
+for comparing a new line to the previous ones
+
+run from the repo root: python -m benchmarks.bench_similarity
+"""
+import argparse
+import timeit
+from sklearn.feature_extraction.text import TfidfVectorizer
+from sklearn.metrics.pairwise import cosine_similarity
+from components.dedup import DedupHistory
+from components.text_processor import TextProcessor, missing_corpora
+
+LINES = [
+    "This is a test sentence with some common English stopwords",
+    "A test sentence containing a few frequent English stopwords",
+    "Where did you put the key to the old lighthouse",
+    "I left it under the mat by the front door like always",
+    "We should leave before the storm gets any worse tonight",
+]
+
+
+def sklearn_similarity(text1, text2):
+    """the tf-idf part of TextProcessor.calculate_similarity without stopwords"""
+    vectorizer = TfidfVectorizer().fit([text1, text2])
+    tfidf_matrix = vectorizer.transform([text1, text2])
+    return cosine_similarity(tfidf_matrix)[0, 1]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--number", type=int, default=500)
+    args = parser.parse_args()
+
+    # remove_stopwords falls back to the raw text without the corpus, that would
+    # time the fallback instead of the real path
+    if "stopwords" in missing_corpora():
+        current = sklearn_similarity
+        current_name = "tf-idf only (no nltk data)"
+    else:
+        text_processor = TextProcessor()
+        current = lambda a, b: text_processor.calculate_similarity(a, b, "en")
+        current_name = "calculate_similarity"
+
+    def run_current():
+        for previous, line in zip(LINES, LINES[1:]):
+            current(previous, line)
+
+    history = DedupHistory(depth=len(LINES))
+
+    def run_history():
+        history.clear()
+        for line in LINES:
+            history.is_duplicate(line)
+
+    # lines checked per run, every line but the first is compared to the one before
+    for name, run, checks in (
+        (current_name, run_current, len(LINES) - 1),
+        ("dedup history", run_history, len(LINES)),
+    ):
+        seconds = timeit.timeit(run, number=args.number)
+        per_line = seconds / args.number / checks * 1e6
+        print(f"{name:>30}: {per_line:10.1f} us per line")
+
+
+if __name__ == "__main__":
+    main()
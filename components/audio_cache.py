@@ -0,0 +1,166 @@
+"""audio cache class"""
+import hashlib
+import os
+import threading
+from collections import OrderedDict
+from components.translation_cache import normalize_source
+
+TTS_CACHE_PATH = os.path.join(os.path.expanduser("~"), ".livescreentranslator", "tts")
+
+
+def audio_key(text, language_code, backend_name):
+    """content address of a clip, sha256 of the backend, language and text"""
+    content = f"{backend_name}\0{language_code}\0{normalize_source(text)}"
+    return hashlib.sha256(content.encode("utf-8")).hexdigest()
+
+
+class AudioCache:
+    """
+    Synthesized speech by content address so a repeated line is never synthesized
+    twice. Clips are kept as bytes in a memory lru bounded by memory_bytes, playback
+    only ever reads from there. With a path the clips are also written to one file
+    each, kept under max_bytes by deleting the least recently played, file
+    modification times carry the lru order across restarts
+    """
+
+    def __init__(self, path=None, max_bytes=64 * 1024 * 1024, memory_bytes=16 * 1024 * 1024):
+        """init with the optional cache directory and the most bytes on disk and in memory"""
+        self.path = path
+        self.max_bytes = max_bytes
+        self.memory_bytes = memory_bytes
+        self.clips = OrderedDict()
+        self.memory_size = 0
+        self.files = OrderedDict()
+        self.size = 0
+        self.lock = threading.Lock()
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self.evictions = 0
+        if path:
+            self.load()
+
+    def load(self):
+        """indexes the clips already in the directory, oldest first"""
+        try:
+            os.makedirs(self.path, exist_ok=True)
+            files = [entry for entry in os.scandir(self.path) if entry.is_file()]
+        except OSError as e:
+            print(f"Error while opening TTS cache: {e}")
+            self.path = None
+            return
+        for entry in sorted(files, key=lambda entry: entry.stat().st_mtime):
+            key, extension = os.path.splitext(entry.name)
+            if extension == ".tmp":
+                continue
+            size = entry.stat().st_size
+            self.files[key] = (entry.name, size)
+            self.size += size
+        with self.lock:
+            self.evict()
+
+    def lookup(self, key):
+        """audio bytes of the clip if it is in memory, never touches the disk"""
+        with self.lock:
+            data = self.clips.get(key)
+            if data is not None:
+                self.clips.move_to_end(key)
+                self.hits += 1
+            return data
+
+    def get(self, key):
+        """audio bytes of the clip from memory or disk, None if it was never cached"""
+        data = self.lookup(key)
+        if data is not None:
+            return data
+        with self.lock:
+            entry = self.files.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            self.files.move_to_end(key)
+        path = os.path.join(self.path, entry[0])
+        try:
+            with open(path, "rb") as clip:
+                data = clip.read()
+            os.utime(path)
+        except OSError:
+            with self.lock:
+                self.drop(key)
+                self.misses += 1
+            return None
+        with self.lock:
+            self.remember(key, data)
+            self.disk_hits += 1
+        return data
+
+    def put(self, key, data, extension):
+        """stores a clip in memory and on disk, old clips go once the cache is full"""
+        with self.lock:
+            self.remember(key, data)
+        if not self.path:
+            return
+        name = f"{key}.{extension}"
+        path = os.path.join(self.path, name)
+        temp_path = path + ".tmp"
+        try:
+            with open(temp_path, "wb") as temp_file:
+                temp_file.write(data)
+            os.replace(temp_path, path)
+        except OSError as e:
+            print(f"Error while saving TTS clip: {e}")
+            return
+        with self.lock:
+            self.drop(key)
+            self.files[key] = (name, len(data))
+            self.size += len(data)
+            self.evict(keep=key)
+
+    def remember(self, key, data):
+        """adds to the memory lru and forgets the least recently used clips"""
+        old = self.clips.pop(key, None)
+        if old is not None:
+            self.memory_size -= len(old)
+        self.clips[key] = data
+        self.memory_size += len(data)
+        while self.memory_size > self.memory_bytes and len(self.clips) > 1:
+            _, old = self.clips.popitem(last=False)
+            self.memory_size -= len(old)
+
+    def drop(self, key):
+        """forgets a clip on disk, the caller holds the lock"""
+        entry = self.files.pop(key, None)
+        if entry is not None:
+            self.size -= entry[1]
+
+    def evict(self, keep=None):
+        """deletes the least recently used clips on disk until the cache fits"""
+        for key in list(self.files):
+            if self.size <= self.max_bytes:
+                return
+            if key == keep:
+                continue
+            name, _ = self.files[key]
+            try:
+                os.remove(os.path.join(self.path, name))
+            except FileNotFoundError:
+                pass
+            except OSError:
+                # locked by another process on windows, try again next time
+                continue
+            self.drop(key)
+            self.evictions += 1
+
+    def stats(self):
+        """hits, hits read from disk, misses, evicted files, clips and bytes in memory and on disk"""
+        with self.lock:
+            return {
+                "hits": self.hits,
+                "disk_hits": self.disk_hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "entries": len(self.clips),
+                "bytes": self.memory_size,
+                "disk_entries": len(self.files),
+                "disk_bytes": self.size,
+            }
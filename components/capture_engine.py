@@ -0,0 +1,107 @@
+"""capture engine class"""
+import numpy as np
+from mss import mss
+from mss.exception import ScreenShotError
+from PIL import Image
+from components.frame_buffers import FrameBuffers
+
+
+def clip_region(monitor, monitor_geometry):
+    """clips the capture area to the monitor it is on and returns the bbox for mss"""
+    left = monitor["left"] + monitor_geometry["left"]
+    top = monitor["top"] + monitor_geometry["top"]
+    width = monitor["width"]
+    height = monitor["height"]
+
+    left = max(left, monitor_geometry["left"])
+    top = max(top, monitor_geometry["top"])
+    right = min(left + width, monitor_geometry["left"] + monitor_geometry["width"])
+    bottom = min(top + height, monitor_geometry["top"] + monitor_geometry["height"])
+
+    return (left, top, right, bottom)
+
+
+def mask_rect(frame, rect):
+    """
+    fills rect, (x, y, width, height) relative to the frame, with the median gray
+    of the frame in place so our own overlay is neither read nor seen as change
+    """
+    x, y, width, height = rect
+    left, top = max(x, 0), max(y, 0)
+    right = min(x + width, frame.shape[1])
+    bottom = min(y + height, frame.shape[0])
+    if left >= right or top >= bottom:
+        return frame
+    frame[top:bottom, left:right] = np.median(frame[::8, ::8])
+    return frame
+
+
+class CaptureEngine:
+    """
+    Long lived capture session for the capture thread, keeps one mss handle and
+    the clipped bbox around so every frame is just a grab. The handle is rebuilt
+    only when the monitor layout changes, capturing again makes a new engine
+    """
+
+    def __init__(self, monitor, monitor_index, buffers=3):
+        """
+        init with capture area and monitor index, mss is opened on first grab.
+        buffers is the size of the grayscale frame ring used by grab_gray
+        """
+        self.frame_buffers = FrameBuffers(buffers)
+        self.monitor = dict(monitor)
+        self.monitor_index = monitor_index
+        self.sct = None
+        self.bbox = None
+        self.stale = True
+        self.rebuilds = 0
+
+    def invalidate(self):
+        """called when the monitor layout changes, rebuilds on the next grab"""
+        self.stale = True
+
+    def rebuild(self):
+        """opens a fresh mss handle, enumerates monitors and recomputes the bbox"""
+        self.close()
+        self.sct = mss()
+        monitor_geometry = self.sct.monitors[self.monitor_index]
+        self.bbox = clip_region(self.monitor, monitor_geometry)
+        self.stale = False
+        self.rebuilds += 1
+
+    def grab_raw(self):
+        """grabs the bbox and returns the raw mss screenshot"""
+        if self.stale or self.sct is None:
+            self.rebuild()
+        try:
+            return self.sct.grab(self.bbox)
+        except ScreenShotError:
+            # layout most likely changed under us, rebuild once and retry
+            self.rebuild()
+            return self.sct.grab(self.bbox)
+
+    def grab(self):
+        """grabs the bbox and returns it as a PIL RGB image"""
+        screenshot = self.grab_raw()
+        return Image.frombytes(
+            "RGB", (screenshot.width, screenshot.height), screenshot.rgb
+        )
+
+    def grab_gray(self):
+        """
+        grabs the bbox and converts it straight from the mss buffer into the next
+        preallocated grayscale array, the array is reused a few frames later
+        """
+        return self.frame_buffers.convert_screenshot(self.grab_raw())
+
+    def close(self):
+        """closes the mss handle"""
+        if self.sct is not None:
+            self.sct.close()
+            self.sct = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
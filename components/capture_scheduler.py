@@ -0,0 +1,57 @@
+"""capture scheduler class"""
+import time
+
+
+class CaptureScheduler:
+    """
+    Paces the capture thread. Frames are taken at target_fps while the screen is
+    changing, every quiet frame stretches the interval by backoff up to 1 / idle_fps
+    and a change snaps it back. While ocr still has a frame waiting the interval
+    wont shrink below busy_interval. RegionManager.wait sleeps until the first
+    region is due going by remaining
+    """
+
+    def __init__(self, target_fps=4.0, idle_fps=0.5, backoff=1.5, busy_interval=0.5):
+        """init with the fastest and slowest capture rates and the backoff factor"""
+        self.min_interval = 1.0 / target_fps
+        self.max_interval = max(1.0 / idle_fps, self.min_interval)
+        self.backoff = backoff
+        self.busy_interval = busy_interval
+        self.reset()
+
+    def reset(self):
+        """back to full speed and clears the counters"""
+        self.interval = self.min_interval
+        self.next_time = time.monotonic()
+        self.ticks = 0
+        self.active_ticks = 0
+        self.busy_ticks = 0
+
+    def remaining(self):
+        """seconds until the next frame is due, zero if it already is"""
+        return max(self.next_time - time.monotonic(), 0.0)
+
+    def record(self, active, busy=False):
+        """
+        sets the next interval from the frame just taken, active means the screen
+        changed and busy that ocr hasnt picked up the last frame yet
+        """
+        self.ticks += 1
+        if active:
+            self.active_ticks += 1
+            self.interval = self.min_interval
+        else:
+            self.interval = min(self.interval * self.backoff, self.max_interval)
+        if busy:
+            self.busy_ticks += 1
+            self.interval = min(max(self.interval, self.busy_interval), self.max_interval)
+        self.next_time = time.monotonic() + self.interval
+        return self.interval
+
+    def stats(self):
+        """frames taken, frames with change and frames taken while ocr was busy"""
+        return {
+            "ticks": self.ticks,
+            "active": self.active_ticks,
+            "busy": self.busy_ticks,
+        }
@@ -0,0 +1,86 @@
+"""change detector class"""
+import numpy as np
+
+
+def downsample(frame, factor=4):
+    """converts frame to a grayscale array and block averages it by factor"""
+    array = np.asarray(frame)
+    if array.ndim == 3:
+        array = array.mean(axis=2)
+    height, width = array.shape[0] // factor, array.shape[1] // factor
+    if height == 0 or width == 0:
+        return array.astype(np.float32)
+    array = array[: height * factor, : width * factor].astype(np.float32)
+    return array.reshape(height, factor, width, factor).mean(axis=(1, 3))
+
+
+def changed_fraction(previous, current, pixel_threshold):
+    """fraction of downsampled pixels that moved more than pixel_threshold"""
+    if previous is None or previous.shape != current.shape:
+        return 1.0
+    diff = np.subtract(current, previous, dtype=np.float32)
+    np.abs(diff, out=diff)
+    return float(np.count_nonzero(diff > pixel_threshold)) / current.size
+
+
+class ChangeDetector:
+    """
+    Gate in front of the ocr queue, compares downsampled grayscale frames and only
+    lets a frame through when enough of it changed since the last forwarded frame.
+    After forwarding it waits for the screen to settle below release_threshold
+    before triggering again so caret blinks and small animations dont retrigger ocr
+    """
+
+    def __init__(
+        self,
+        threshold=0.02,
+        release_threshold=0.005,
+        pixel_threshold=24,
+        factor=4,
+        max_hold_frames=5,
+    ):
+        """init thresholds, threshold and release_threshold are fractions of the frame"""
+        self.threshold = threshold
+        self.release_threshold = release_threshold
+        self.pixel_threshold = pixel_threshold
+        self.factor = factor
+        self.max_hold_frames = max_hold_frames
+        self.reset()
+
+    def reset(self):
+        """forget the reference frame and counters"""
+        self.reference = None
+        self.previous = None
+        self.armed = True
+        self.moving = False
+        self.held_frames = 0
+        self.frames_forwarded = 0
+        self.frames_skipped = 0
+
+    def check(self, frame):
+        """returns true if the frame should be sent to ocr"""
+        current = downsample(frame, self.factor)
+        settle = changed_fraction(self.previous, current, self.pixel_threshold)
+        self.previous = current
+        self.moving = settle > self.release_threshold
+
+        if not self.armed:
+            self.held_frames += 1
+            if settle <= self.release_threshold or self.held_frames >= self.max_hold_frames:
+                self.armed = True
+
+        if self.armed:
+            change = changed_fraction(self.reference, current, self.pixel_threshold)
+            if change >= self.threshold:
+                self.reference = current
+                self.armed = False
+                self.held_frames = 0
+                self.frames_forwarded += 1
+                return True
+
+        self.frames_skipped += 1
+        return False
+
+    def stats(self):
+        """frames forwarded and skipped"""
+        return {"forwarded": self.frames_forwarded, "skipped": self.frames_skipped}
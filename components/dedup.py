@@ -0,0 +1,106 @@
+"""dedup history class"""
+import zlib
+import numpy as np
+
+
+def ngram_signature(text, n=3, dim=1024):
+    """
+    hashed character n-gram counts of the lower cased text as a unit length vector,
+    crc32 keeps the hashing the same across runs
+    """
+    text = " ".join(text.lower().split())
+    signature = np.zeros(dim, dtype=np.float32)
+    if not text:
+        return signature
+    padded = f" {text} "
+    count = max(len(padded) - n + 1, 1)
+    indices = [zlib.crc32(padded[i : i + n].encode("utf-8")) % dim for i in range(count)]
+    signature += np.bincount(indices, minlength=dim)
+    signature /= np.linalg.norm(signature)
+    return signature
+
+
+class DedupHistory:
+    """
+    Keeps the signatures of the last few texts in a matrix so a new text is compared
+    against all of them with one matrix vector product. A text counts as a duplicate
+    if its cosine similarity to any of them is above the threshold, match returns
+    the remembered text it is closest to. match leaves the counters alone, the
+    caller counts a text once it knows whether the text still had to be translated
+    """
+
+    def __init__(self, depth=5, threshold=0.6, n=3, dim=1024):
+        """init with how many texts to remember and the similarity threshold"""
+        self.depth = depth
+        self.threshold = threshold
+        self.n = n
+        self.dim = dim
+        self.checked = 0
+        self.duplicates = 0
+        self.clear()
+
+    def clear(self):
+        """forget every text and reset the counters"""
+        self.checked = 0
+        self.duplicates = 0
+        self.signatures = np.zeros((self.depth, self.dim), dtype=np.float32)
+        self.texts = [None] * self.depth
+        self.size = 0
+        self.index = 0
+
+    def signature(self, text):
+        """signature of the text with this history's settings"""
+        return ngram_signature(text, self.n, self.dim)
+
+    def similarity(self, text, signature=None):
+        """highest cosine similarity between the text and the remembered texts"""
+        if self.size == 0:
+            return 0.0
+        if signature is None:
+            signature = self.signature(text)
+        return float(np.max(self.signatures[: self.size] @ signature))
+
+    def add(self, text, signature=None):
+        """remembers the text, the oldest one drops out once depth is reached"""
+        if signature is None:
+            signature = self.signature(text)
+        self.signatures[self.index] = signature
+        self.texts[self.index] = text
+        self.index = (self.index + 1) % self.depth
+        self.size = min(self.size + 1, self.depth)
+
+    def similar(self, text, other):
+        """true if the two texts are close enough to count as the same"""
+        if other is None:
+            return False
+        return float(self.signature(text) @ self.signature(other)) > self.threshold
+
+    def match(self, text):
+        """the remembered text closest to text if it counts as the same, otherwise None"""
+        if self.size == 0:
+            return None
+        similarities = self.signatures[: self.size] @ self.signature(text)
+        best = int(np.argmax(similarities))
+        if similarities[best] <= self.threshold:
+            return None
+        return self.texts[best]
+
+    def count(self, duplicate):
+        """counts one checked text, duplicate if nothing had to be done for it"""
+        self.checked += 1
+        if duplicate:
+            self.duplicates += 1
+
+    def is_duplicate(self, text):
+        """true if the text is close to a remembered one, otherwise remembers it"""
+        self.checked += 1
+        signature = self.signature(text)
+        if self.similarity(text, signature) > self.threshold:
+            self.duplicates += 1
+            return True
+        self.add(text, signature)
+        return False
+
+    def stats(self):
+        """texts checked and how many of them were duplicates"""
+        return {"checked": self.checked, "duplicates": self.duplicates}
@@ -0,0 +1,43 @@
+"""frame buffers class"""
+import numpy as np
+from components.preprocessing import bgra_into_gray, bgra_view
+
+
+class FrameBuffers:
+    """
+    Ring of preallocated grayscale buffers the capture thread converts mss frames into,
+    so a frame costs no allocations. A buffer is reused once count newer frames have
+    been converted, count has to cover every frame that can still be in use: the one
+    being captured plus every frame handed on without a copy, like views waiting in the
+    ocr mailbox and the one ocr is reading. A caller that copies what it keeps needs one
+    """
+
+    def __init__(self, count=3):
+        """init with the number of buffers in the ring"""
+        self.count = count
+        self.shape = None
+        self.buffers = []
+        self.scratch = None
+        self.index = 0
+        self.allocations = 0
+
+    def allocate(self, shape):
+        """(re)allocates the ring for a new frame size"""
+        self.shape = shape
+        self.buffers = [np.empty(shape, dtype=np.uint8) for _ in range(self.count)]
+        self.scratch = (np.empty(shape, dtype=np.uint16), np.empty(shape, dtype=np.uint16))
+        self.index = 0
+        self.allocations += 1
+
+    def convert(self, bgra):
+        """converts a bgra array into the next buffer of the ring and returns it"""
+        shape = bgra.shape[:2]
+        if shape != self.shape:
+            self.allocate(shape)
+        out = self.buffers[self.index]
+        self.index = (self.index + 1) % self.count
+        return bgra_into_gray(bgra, out, self.scratch)
+
+    def convert_screenshot(self, screenshot):
+        """converts an mss screenshot by wrapping its raw buffer, no copy of the pixels"""
+        return self.convert(bgra_view(screenshot.raw, screenshot.width, screenshot.height))
@@ -0,0 +1,119 @@
+"""frame mailbox class"""
+import threading
+from collections import OrderedDict, deque
+
+KEEP_LATEST = "keep_latest"
+DROP_OLDEST = "drop_oldest"
+BLOCK = "block"
+POLICIES = (KEEP_LATEST, DROP_OLDEST, BLOCK)
+
+
+class RegionMailbox:
+    """
+    Bounded mailbox between the capture thread and ocr for several capture regions
+    sharing one ocr pipeline, so stale frames cant pile up when ocr is slower than
+    capture. Every region has its own slot of maxsize frames and when a slot is full
+    the policy decides what happens: keep_latest throws away everything pending in
+    the slot and keeps the new frame, drop_oldest evicts the oldest pending frame,
+    block waits for room. get hands out the slots in the order they were filled so
+    a region that changes all the time cant starve the others
+    """
+
+    def __init__(self, maxsize=1, policy=KEEP_LATEST):
+        """init with the size of every region's slot and the drop policy"""
+        if maxsize < 1:
+            raise ValueError("maxsize must be at least 1")
+        if policy not in POLICIES:
+            raise ValueError(f"Unknown drop policy: {policy}")
+        self.maxsize = maxsize
+        self.policy = policy
+        self.slots = OrderedDict()
+        self.depth = 0
+        self.lock = threading.Lock()
+        self.not_empty = threading.Condition(self.lock)
+        self.not_full = threading.Condition(self.lock)
+        self.puts = 0
+        self.drops = 0
+        self.max_depth = 0
+
+    def put(self, item, key=0, timeout=None):
+        """
+        adds the frame for the region key, a region whose frames were dropped keeps
+        its place in line. returns false if the frame itself was dropped
+        """
+        with self.lock:
+            if self.slot_size(key) >= self.maxsize:
+                if self.policy == KEEP_LATEST:
+                    slot = self.slots[key]
+                    self.drops += len(slot)
+                    self.depth -= len(slot)
+                    slot.clear()
+                elif self.policy == DROP_OLDEST:
+                    self.slots[key].popleft()
+                    self.drops += 1
+                    self.depth -= 1
+                elif not self.not_full.wait_for(
+                    lambda: self.slot_size(key) < self.maxsize, timeout
+                ):
+                    self.drops += 1
+                    return False
+            self.slots.setdefault(key, deque()).append(item)
+            self.depth += 1
+            self.puts += 1
+            self.max_depth = max(self.max_depth, self.depth)
+            self.not_empty.notify()
+            return True
+
+    def slot_size(self, key):
+        """frames the region has waiting, the caller holds the lock"""
+        slot = self.slots.get(key)
+        return len(slot) if slot is not None else 0
+
+    def get(self, timeout=None):
+        """
+        waits for a frame and returns the oldest one of the region waiting longest,
+        raises TimeoutError if none came in time
+        """
+        with self.lock:
+            if not self.not_empty.wait_for(lambda: self.depth, timeout):
+                raise TimeoutError("No frame available")
+            key, slot = next(iter(self.slots.items()))
+            item = slot.popleft()
+            if slot:
+                self.slots.move_to_end(key)
+            else:
+                del self.slots[key]
+            self.depth -= 1
+            self.not_full.notify_all()
+            return item
+
+    def pending(self, key=0):
+        """true if the region still has a frame waiting for ocr"""
+        with self.lock:
+            return self.slot_size(key) > 0
+
+    def qsize(self):
+        """frames currently waiting"""
+        with self.lock:
+            return self.depth
+
+    def empty(self):
+        """true if no frames are waiting"""
+        return self.qsize() == 0
+
+    def clear(self):
+        """drop everything pending without counting it"""
+        with self.lock:
+            self.slots.clear()
+            self.depth = 0
+            self.not_full.notify_all()
+
+    def stats(self):
+        """frames put, frames dropped, current and max depth"""
+        with self.lock:
+            return {
+                "puts": self.puts,
+                "drops": self.drops,
+                "depth": self.depth,
+                "max_depth": self.max_depth,
+            }
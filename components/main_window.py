@@ -1,11 +1,9 @@
-import time
 import threading
-from io import BytesIO
-from queue import Queue
+import time
 from mss import mss
-from PIL import Image, ImageChops
-from PyQt5.QtCore import Qt, QPoint
-from PyQt5.QtGui import QPixmap, QIcon
+from PIL import Image
+from PyQt5.QtCore import Qt, QPoint, QTimer
+from PyQt5.QtGui import QIcon
 from PyQt5.QtWidgets import (
     QMainWindow,
     QLabel,
@@ -17,39 +15,33 @@ from PyQt5.QtWidgets import (
     QToolButton,
     QCheckBox,
     QFileDialog,
+    QApplication,
 )
 from constants.languages_ocr import LANGUAGES_OCR
 from constants.languages_google import LANGUAGES_GOOGLE
+from components.capture_engine import CaptureEngine, clip_region, mask_rect
+from components.frame_mailbox import KEEP_LATEST, RegionMailbox
+from components.monitor_preview import MonitorPreview
+from components.ocr_pool import default_pool_size
 from components.ocr_worker import OCRWorker
+from components.region_manager import RegionManager
+from components.speech_scheduler import DROP_STALE, SPEECH_POLICIES
+from components.tts_backends import TTS_BACKEND_NAMES, available_tts_backends
 from components.text_processor import TextProcessor
+from components.translation_cache import TRANSLATION_CACHE_PATH
+from components.audio_cache import TTS_CACHE_PATH
+from components.translation_worker import TranslationWorker
+from components.transcript_writer import TranscriptWriter, format_for_path
 from components.transparent_window import TransparentWindow
 from components.translated_window import TranslatedTextWindow
 from components.text_to_speech import TextToSpeech
 
 
-# def has_changed(prev_screenshot, new_screenshot, threshold=5):
-#     """takes two screennshots and compares if there different"""
-#     diff = ImageChops.difference(prev_screenshot, new_screenshot)
-#     extrema = diff.getextrema()
-#     max_diff = extrema[1] if isinstance(extrema[0], int) else extrema[0][1]
-#     return diff.getbbox() is not None and max_diff > threshold
-
-
 def capture_screenshot(monitor, monitor_index):
     """gets geometry of montior area and takes a screenshot of the bbox"""
     with mss() as sct:
         monitor_geometry = sct.monitors[monitor_index]
-        left = monitor["left"] + monitor_geometry["left"]
-        top = monitor["top"] + monitor_geometry["top"]
-        width = monitor["width"]
-        height = monitor["height"]
-
-        left = max(left, monitor_geometry["left"])
-        top = max(top, monitor_geometry["top"])
-        right = min(left + width, monitor_geometry["left"] + monitor_geometry["width"])
-        bottom = min(top + height, monitor_geometry["top"] + monitor_geometry["height"])
-
-        bbox = (left, top, right, bottom)
+        bbox = clip_region(monitor, monitor_geometry)
         screenshot = sct.grab(bbox)
 
         img = Image.frombytes(
@@ -59,6 +51,18 @@ def capture_screenshot(monitor, monitor_index):
         return img
 
 
+# how many recent captures new text is compared to and how similar counts as the same
+DEDUP_HISTORY_DEPTH = 5
+DEDUP_THRESHOLD = 0.6
+# frames every region may have waiting for ocr and what happens to more, see RegionMailbox
+OCR_QUEUE_SIZE = 1
+OCR_QUEUE_POLICY = KEEP_LATEST
+# longest the capture thread waits for room with the block policy
+OCR_QUEUE_TIMEOUT = 1.0
+# how often the live monitor preview refreshes
+LIVE_PREVIEW_INTERVAL_MS = 1000
+
+
 class MainWindow(QMainWindow):
     """
     MainWindow class all other components get used here
@@ -75,19 +79,32 @@ class MainWindow(QMainWindow):
         self.capture_area = None
         self.correct_capture_area = None
         self.monitor_index = None
-        self.translated_text_window = None
         self.save_translated_text = False
         self.save_destination = ""
+        self.save_path = None
+        self.transcript_writer = None
         self.previous_translated_text = None
         self.update_translation_window = True
+        self.capture_engine = None
+        self.region_manager = RegionManager(
+            dedup_depth=DEDUP_HISTORY_DEPTH, dedup_threshold=DEDUP_THRESHOLD
+        )
+        self.adding_region = False
+        self.monitor_preview = MonitorPreview()
         self.initUI()
 
-        self.screenshot_queue = Queue()
-        self.ocr_worker = OCRWorker(self.screenshot_queue, self.language_from_combo)
+        self.screenshot_queue = RegionMailbox(OCR_QUEUE_SIZE, OCR_QUEUE_POLICY)
+        self.ocr_worker = OCRWorker(
+            self.screenshot_queue, self.language_from_combo, workers=default_pool_size()
+        )
         self.ocr_worker.ocr_result.connect(self.update_ocr_result)
         self.ocr_worker.start()
-        self.text_processor = TextProcessor()
-        self.text_to_speech = TextToSpeech(self)
+        self.text_processor = TextProcessor(cache_path=TRANSLATION_CACHE_PATH)
+        self.translation_worker = TranslationWorker(self.text_processor)
+        self.translation_worker.translated.connect(self.update_translation)
+        self.text_to_speech = TextToSpeech(
+            self, cache_path=TTS_CACHE_PATH, policy=DROP_STALE
+        )
 
         self.setWindowFlags(Qt.FramelessWindowHint)
         self.mousePressed = False
@@ -96,6 +113,10 @@ class MainWindow(QMainWindow):
             stylesheet = f.read()
         self.setStyleSheet(stylesheet)
 
+        app = QApplication.instance()
+        app.screenAdded.connect(self.handle_screen_change)
+        app.screenRemoved.connect(self.handle_screen_change)
+
     def mousePressEvent(self, event):
         """for the custon title bar dragging across screen"""
         if event.button() == Qt.LeftButton:
@@ -111,6 +132,17 @@ class MainWindow(QMainWindow):
             event.accept()
 
 
+    def closeEvent(self, event):
+        """stop capturing and shut down the ocr workers before closing"""
+        self.capturing = False
+        self.region_manager.stop()
+        self.close_transcript()
+        self.ocr_worker.stop()
+        self.translation_worker.stop()
+        self.text_to_speech.close()
+        self.text_processor.translation_cache.close()
+        super().closeEvent(event)
+
     def mouseReleaseEvent(self, event):
         """for the custon title bar dragging across screen"""
         if event.button() == Qt.LeftButton:
@@ -176,6 +208,7 @@ class MainWindow(QMainWindow):
 
         self.populate_language_from_combo()
         self.populate_language_to_combo()
+        self.language_from_combo.currentIndexChanged.connect(self.update_region_language)
 
         monitor_selection_layout = QHBoxLayout()
         self.monitor_label = QLabel("Select monitor:")
@@ -184,8 +217,18 @@ class MainWindow(QMainWindow):
         self.monitor_combo.setObjectName("monitor_combo")
         monitor_selection_layout.addWidget(self.monitor_label)
         monitor_selection_layout.addWidget(self.monitor_combo)
+        self.live_preview_checkbox = QCheckBox("Live Preview")
+        self.live_preview_checkbox.setObjectName("live_preview_checkbox")
+        self.live_preview_checkbox.stateChanged.connect(self.toggle_live_preview)
+        monitor_selection_layout.addWidget(self.live_preview_checkbox)
         layout.addLayout(monitor_selection_layout)
 
+        self.live_preview_timer = QTimer(self)
+        self.live_preview_timer.setInterval(LIVE_PREVIEW_INTERVAL_MS)
+        self.live_preview_timer.timeout.connect(
+            lambda: self.update_monitor_preview(self.monitor_combo.currentIndex())
+        )
+
         monitor_info_layout = QHBoxLayout()
         self.monitor_info_label = QLabel("Monitor info:")
         self.monitor_info_label.setObjectName("monitor_info_label")
@@ -201,6 +244,21 @@ class MainWindow(QMainWindow):
         self.voice_checkbox.stateChanged.connect(self.toggle_voice_output)
         voice_layout.addWidget(self.voice_checkbox)
 
+        self.voice_policy_combo = QComboBox()
+        self.voice_policy_combo.setObjectName("voice_policy_combo")
+        for policy, (name, _) in SPEECH_POLICIES.items():
+            self.voice_policy_combo.addItem(name, policy)
+        self.voice_policy_combo.setCurrentIndex(self.voice_policy_combo.findData(DROP_STALE))
+        self.voice_policy_combo.currentIndexChanged.connect(self.set_speech_policy)
+        voice_layout.addWidget(self.voice_policy_combo)
+
+        self.voice_backend_combo = QComboBox()
+        self.voice_backend_combo.setObjectName("voice_backend_combo")
+        for backend in available_tts_backends():
+            self.voice_backend_combo.addItem(TTS_BACKEND_NAMES[backend], backend)
+        self.voice_backend_combo.currentIndexChanged.connect(self.set_speech_backend)
+        voice_layout.addWidget(self.voice_backend_combo)
+
         monitor_info_layout.addLayout(voice_layout)
 
         save_text_layout = QHBoxLayout()
@@ -231,6 +289,12 @@ class MainWindow(QMainWindow):
         self.select_area_button.clicked.connect(self.show_transparent_window)
         buttons_layout.addWidget(self.select_area_button)
 
+        self.add_area_button = QPushButton("Add Area")
+        self.add_area_button.setObjectName("add_area_button")
+        self.add_area_button.setDisabled(True)
+        self.add_area_button.clicked.connect(self.show_add_area_window)
+        buttons_layout.addWidget(self.add_area_button)
+
         self.capture_button = QPushButton("Start Capturing")
         self.capture_button.setObjectName("capture_button")
         self.capture_button.setDisabled(True)
@@ -266,7 +330,11 @@ class MainWindow(QMainWindow):
             self.save_translated_text = False
 
     def select_save_destination(self, state):
-        """let user pick where they want the saved file to go"""
+        """
+        let user pick where they want the saved file to go, a .jsonl file gets a
+        json record per translation instead of plain lines
+        """
+        self.close_transcript()
         if state == Qt.Checked:
             options = QFileDialog.Options()
             options |= QFileDialog.DontUseNativeDialog
@@ -274,21 +342,29 @@ class MainWindow(QMainWindow):
                 self,
                 "Save Translated Text",
                 "",
-                "Text Files (*.txt);;All Files (*)",
+                "Text Files (*.txt);;JSON Lines (*.jsonl);;All Files (*)",
                 options=options,
             )
             if file_name:
-                if not file_name.endswith(".txt"):
+                if not file_name.endswith((".txt", ".jsonl")):
                     file_name += ".txt"
                 self.save_path = file_name
+                self.transcript_writer = TranscriptWriter(
+                    file_name, format_for_path(file_name)
+                )
         else:
             self.save_path = None
 
+    def close_transcript(self):
+        """writes out what is left of the transcript and closes the file"""
+        if self.transcript_writer is not None:
+            self.transcript_writer.close()
+            self.transcript_writer = None
+
     def save_translated_text_to_file(self):
-        """open file and save the translated text"""
-        if self.save_path and self.translated_text_window:
-            with open(self.save_path, "a", encoding="utf-8") as f:
-                f.write(self.translated_text_window.translated_text + "\n")
+        """queue the last translated text for the transcript"""
+        if self.transcript_writer and self.previous_translated_text:
+            self.transcript_writer.write(self.previous_translated_text)
 
     def enable_capture_button(self):
         """disable the button from being pressed"""
@@ -302,8 +378,19 @@ class MainWindow(QMainWindow):
             self.voice_output_enabled = False
             self.text_to_speech.stop_voice()
 
+    def set_speech_policy(self, index):
+        """switches what the tts does when text comes in faster than it is spoken"""
+        self.text_to_speech.set_policy(self.voice_policy_combo.itemData(index))
+
+    def set_speech_backend(self, index):
+        """switches the tts voice between google and the offline espeak"""
+        self.text_to_speech.set_backend(self.voice_backend_combo.itemData(index))
+
     def update_capture_area(self, start, end, geometry):
-        """updates the capture area from user dragging mouse"""
+        """
+        updates the capture area from user dragging mouse, the area replaces every
+        region or is added as another one when it came from the add area button
+        """
         monitor_geometry = self.monitor_combo.currentData()
         with mss() as sct:
             monitor = sct.monitors[monitor_geometry]
@@ -326,10 +413,46 @@ class MainWindow(QMainWindow):
             monitor["width"],
             monitor["height"],
         )
+        bbox = clip_region(
+            {
+                "left": start.x(),
+                "top": start.y(),
+                "width": end.x() - start.x(),
+                "height": end.y() - start.y(),
+            },
+            monitor,
+        )
+        if not self.adding_region:
+            self.clear_regions()
+        self.adding_region = False
+        self.region_manager.add(
+            bbox,
+            self.correct_capture_area,
+            monitor_geometry,
+            self.language_from_combo.currentData(),
+        )
+        self.add_area_button.setDisabled(False)
         self.enable_capture_button()
 
-    def show_transparent_window(self):
+    def clear_regions(self):
+        """removes every capture region and closes their translated text windows"""
+        for region in self.region_manager.clear():
+            if region.overlay is not None:
+                region.overlay.close()
+                region.overlay.deleteLater()
+
+    def handle_screen_change(self, screen):
+        """monitor layout changed, make the capture session re-enumerate monitors"""
+        if self.capture_engine is not None:
+            self.capture_engine.invalidate()
+
+    def show_add_area_window(self):
+        """shows the transparent window to select one more area"""
+        self.show_transparent_window(adding=True)
+
+    def show_transparent_window(self, adding=False):
         """shows the transparent window when user is selecting area"""
+        self.adding_region = adding
         monitor_index = self.monitor_combo.currentData()
         self.transparent_window = TransparentWindow(self, monitor_index)
         self.transparent_window.show()
@@ -348,14 +471,33 @@ class MainWindow(QMainWindow):
         for language, code in LANGUAGES_OCR:
             self.language_from_combo.addItem(language, code)
 
+    def update_region_language(self, index):
+        """
+        the translate from language applies to the capture region when there is only
+        one, with several regions each keeps the language it was added with
+        """
+        regions = self.region_manager.snapshot()
+        if len(regions) == 1:
+            regions[0].language_code = self.language_from_combo.itemData(index)
+
     def populate_language_to_combo(self):
         """populate the language to combo with list of languages available"""
         self.language_to_combo.clear()
         for language, code in LANGUAGES_GOOGLE:
             self.language_to_combo.addItem(language, code)
 
+    def toggle_live_preview(self, state):
+        """refreshes the monitor preview every LIVE_PREVIEW_INTERVAL_MS while checked"""
+        if state == Qt.Checked and not self.capturing:
+            self.live_preview_timer.start()
+        else:
+            self.live_preview_timer.stop()
+
     def update_monitor_preview(self, index):
-        """creats a preview of the users monitors"""
+        """
+        creats a preview of the users monitors, the mss buffer is turned into the
+        pixmap directly by MonitorPreview
+        """
         monitor_index = self.monitor_combo.currentData()
         with mss() as sct:
             monitor = sct.monitors[monitor_index]
@@ -365,13 +507,7 @@ class MainWindow(QMainWindow):
             self.monitor_info_label.setText(monitor_info)
 
             screenshot = sct.grab(monitor)
-            image = Image.frombytes("RGB", screenshot.size, screenshot.rgb)
-            image = image.resize((640, 400), Image.Resampling.LANCZOS)
-            buffer = BytesIO()
-            image.save(buffer, format="PNG")
-            pixmap = QPixmap()
-            pixmap.loadFromData(buffer.getvalue())
-            self.preview_label.setPixmap(pixmap)
+        self.preview_label.setPixmap(self.monitor_preview.render(screenshot))
 
     def toggle_capturing(self):
         """toggle what shows up ui is shown when capturing and not capturing"""
@@ -382,6 +518,8 @@ class MainWindow(QMainWindow):
             self.preview_label.show()
             self.monitor_label.show()
             self.monitor_combo.show()
+            self.live_preview_checkbox.show()
+            self.toggle_live_preview(self.live_preview_checkbox.checkState())
             self.monitor_info_label.show()
             self.language_from_label.show()
             self.language_from_combo.show()
@@ -390,23 +528,30 @@ class MainWindow(QMainWindow):
             self.save_text_label.show()
             self.save_checkbox.show()
             self.select_area_button.show()
+            self.add_area_button.show()
             self.voice_checkbox.show()
+            self.voice_policy_combo.show()
+            self.voice_backend_combo.show()
             self.voice_label.show()
             self.monitor_label.setText("Select monitor:")
             self.update_translation_window = False
-            if self.translated_text_window:
-                self.translated_text_window.close()
-                self.translated_text_window = None
+            self.region_manager.stop()
+            for region in self.region_manager.snapshot():
+                if region.overlay is not None:
+                    region.overlay.hide()
 
         else:
             self.capture_button.setText("Stop Capturing")
             self.capturing = True
+            self.region_manager.reset()
             self.capture_thread = threading.Thread(target=self.capture_loop)
             self.capture_thread.daemon = True
             self.capture_thread.start()
             self.preview_label.hide()
             self.monitor_label.clear()
             self.monitor_combo.hide()
+            self.live_preview_checkbox.hide()
+            self.live_preview_timer.stop()
             self.monitor_info_label.hide()
             self.language_from_label.hide()
             self.language_from_combo.hide()
@@ -415,88 +560,194 @@ class MainWindow(QMainWindow):
             self.save_text_label.hide()
             self.save_checkbox.hide()
             self.voice_checkbox.hide()
+            self.voice_policy_combo.hide()
+            self.voice_backend_combo.hide()
             self.voice_label.hide()
             self.select_area_button.hide()
+            self.add_area_button.hide()
             self.update_translation_window = True
             self.text_to_speech.stop_voice()
 
     def capture_loop(self):
         """
-        main loop of capturing gets geometry takes caputures screenshot
-        hides the translated text window to prevent it from being captured in the screenshot
+        main loop of capturing, grabs the bbox around every capture region once
+        per tick and hands each region its part of the frame. the translated text
+        windows are kept out of the frames sent to ocr
         """
-        if not self.capture_area:
+        regions = self.region_manager.snapshot()
+        if not regions:
             print("Please select an area first.")
             return
 
-        left, top, width, height = self.capture_area
-        monitor_index = self.monitor_combo.currentData()
         with mss() as sct:
-            monitor_geometry = sct.monitors[monitor_index]
-            left_offset, top_offset = monitor_geometry["left"], monitor_geometry["top"]
+            virtual_screen = sct.monitors[0]
+        left, top, right, bottom = self.region_manager.union_bbox()
         monitor = {
-            "left": left + left_offset,
-            "top": top + top_offset,
-            "width": width,
-            "height": height,
+            "left": left - virtual_screen["left"],
+            "top": top - virtual_screen["top"],
+            "width": right - left,
+            "height": bottom - top,
         }
 
-        prev_screenshot = capture_screenshot(monitor, monitor_index).convert("L")
+        # region crops are copied before they are queued, so the frame is free
+        # again by the next grab and one buffer is enough
+        self.capture_engine = CaptureEngine(monitor, 0, buffers=1)
+        with self.capture_engine as engine:
+            self.capture_frames(engine, (left, top))
+        self.capture_engine = None
+        stats = self.region_manager.stats()
+        print(
+            f"Regions: {len(regions)}, frames captured: {stats['ticks']}, "
+            f"with change: {stats['active']}, while OCR was busy: {stats['busy']}"
+        )
+        print(f"Frames sent to OCR: {stats['forwarded']}, skipped: {stats['skipped']}")
+        print(
+            f"Translations avoided: {stats['duplicates']} "
+            f"of {stats['checked']} new texts"
+        )
+        stats = self.screenshot_queue.stats()
+        print(
+            f"OCR queue drops: {stats['drops']}, max depth: {stats['max_depth']}"
+        )
+        stats = self.text_to_speech.scheduler.stats()
+        if stats["spoken"]:
+            print(
+                f"Lines spoken: {stats['spoken']}, dropped: {stats['dropped']}, "
+                f"stale: {stats['stale']}, merged: {stats['merged']}, "
+                f"cut off: {stats['interruptions']}"
+            )
+            print(
+                f"Speech lag behind capture: {stats['average_lag_ms']:.0f} ms average, "
+                f"{stats['max_lag_ms']:.0f} ms max"
+            )
 
+    def capture_frames(self, engine, origin):
+        """
+        grabs frames until capturing is stopped whenever a region is due, only the
+        region frames their change detector lets through are sent to ocr
+        """
         while self.capturing:
-            time.sleep(2)
-            if self.translated_text_window:
-                self.translated_text_window.setWindowOpacity(0) 
-                time.sleep(0.3)
-            new_screenshot = capture_screenshot(monitor, monitor_index).convert("L")
-            if self.translated_text_window:
-                self.translated_text_window.setWindowOpacity(1)  
-                time.sleep(0.3)
-            # if has_changed(prev_screenshot, new_screenshot):
-            prev_screenshot = new_screenshot
-            # new_screenshot.save("sample_screenshot.png")
-            language_code = self.language_from_combo.currentData()
-            self.screenshot_queue.put((new_screenshot, language_code))
-
-
-
-    def update_ocr_result(self, text):
+            regions = self.region_manager.wait()
+            if regions is None:
+                break
+            new_screenshot = engine.grab_gray()
+            captured_at = time.monotonic()
+            self.mask_translated_text_windows(new_screenshot, origin)
+            for region in regions:
+                region_frame = region.crop(new_screenshot, origin)
+                forward = region.change_detector.check(region_frame)
+                region.scheduler.record(
+                    forward or region.change_detector.moving,
+                    busy=self.screenshot_queue.pending(region.region_id),
+                )
+                if not forward:
+                    continue
+                # copied since the frame buffer is reused before ocr may get to it,
+                # the crop is the only copy, ocr cuts its bands straight out of it
+                self.screenshot_queue.put(
+                    (
+                        region_frame.copy(),
+                        region.language_code,
+                        region.region_id,
+                        captured_at,
+                    ),
+                    key=region.region_id,
+                    timeout=OCR_QUEUE_TIMEOUT,
+                )
+
+    def mask_translated_text_windows(self, frame, origin):
+        """
+        masks the translated text windows in the frame when they cant be left out
+        of the capture, only reads plain attributes so it is safe off the gui thread
         """
-        sends text to text processor, cleans, translates, preforms cosine similarity
-        saves the text to file if true and displays the translated text window
+        for region in self.region_manager.snapshot():
+            rect = region.overlay_rect(origin)
+            if rect is not None:
+                mask_rect(frame, rect)
+        return frame
+
+    def update_ocr_result(self, text, region_id=0):
+        """
+        sends text to text processor to be cleaned and skips it if the region already
+        shows it or is already translating it. Text close to one translated recently
+        in the same region is served from the translation cache, anything else goes
+        to the translation worker and comes back in update_translation
         """
+        region = self.region_manager.get(region_id)
+        if region is None:
+            return
         cleaned_text = self.text_processor.process_text(text)
         language_to = self.language_to_combo.currentData()
-        monitor_index = self.monitor_combo.currentData()
-        translated_text = self.text_processor.translate_text(
-            cleaned_text, target_language=language_to
-        )
-
-        if self.previous_translated_text is not None:
-            similarity = self.text_processor.calculate_similarity(
-                self.previous_translated_text, translated_text, language_to
-            )
-            if similarity > 0.6:
+        history = region.source_history
+        if region.shown_language == language_to and history.similar(
+            cleaned_text, region.shown_source
+        ):
+            history.count(True)
+            return
+        if history.similar(cleaned_text, self.translation_worker.in_flight_text(region_id)):
+            history.count(True)
+            return
+        region.text_captured_at = self.ocr_worker.captured_at.get(region_id)
+        known_text = history.match(cleaned_text)
+        if known_text is not None:
+            translated_text = self.text_processor.translation_cache.get(known_text, language_to)
+            if translated_text is not None:
+                history.count(True)
+                self.show_translation(region, known_text, translated_text, language_to)
                 return
+        history.count(False)
+        self.translation_worker.request(cleaned_text, language_to, key=region_id)
+
+    def update_translation(self, source_text, translated_text, language_to, region_id=0):
+        """
+        the translation worker delivered, the source text is remembered so it can
+        come from the cache when it shows up again, then the translation is shown
+        """
+        region = self.region_manager.get(region_id)
+        if region is None:
+            return
+        history = region.source_history
+        if history.similarity(source_text) <= history.threshold:
+            history.add(source_text)
+        self.show_translation(region, source_text, translated_text, language_to)
 
+    def show_translation(self, region, source_text, translated_text, language_to):
+        """
+        saves the text to file if true and displays the translated text window of
+        the region the text came from
+        """
         self.previous_translated_text = translated_text
 
-        if self.save_checkbox.isChecked() and self.save_path:
+        if self.save_checkbox.isChecked() and self.transcript_writer:
             if translated_text.strip():
-                with open(self.save_path, "a", encoding="utf-8") as output_file:
-                    output_file.write(translated_text + "\n")
+                self.transcript_writer.write(
+                    translated_text,
+                    source_text,
+                    region.language_code,
+                    language_to,
+                    region.region_id,
+                )
 
         if self.update_translation_window:
-            if (
-                hasattr(self, "translated_text_window")
-                and self.translated_text_window is not None
-            ):
-                self.translated_text_window.close()
-
             if self.voice_checkbox.isChecked() and translated_text.strip():
-                self.text_to_speech.play_text_voice(translated_text, language_to)
+                self.text_to_speech.play_text_voice(
+                    translated_text, language_to, region.text_captured_at
+                )
 
-            self.translated_text_window = TranslatedTextWindow(
-                self, monitor_index, self.correct_capture_area, translated_text
+            region.shown_source = source_text
+            region.shown_language = language_to
+            self.show_translated_text(region, translated_text)
+
+    def show_translated_text(self, region, translated_text):
+        """
+        shows the text in the translated text window of the region, the window is
+        made once and updated in place after that
+        """
+        if region.overlay is None:
+            region.overlay = TranslatedTextWindow(
+                self, region.monitor_index, region.overlay_area, translated_text
             )
-            self.translated_text_window.show()
+        else:
+            region.overlay.update_text(translated_text)
+        if not region.overlay.isVisible():
+            region.overlay.show()
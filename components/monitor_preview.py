@@ -0,0 +1,46 @@
+"""monitor preview class"""
+import numpy as np
+from PyQt5.QtCore import Qt
+from PyQt5.QtGui import QImage, QPixmap
+from components.preprocessing import bgra_view
+
+
+class MonitorPreview:
+    """
+    Turns an mss screenshot into the small preview pixmap of the main window.
+    The bgra buffer is strided down to roughly the preview size into a reused
+    array and wrapped as a QImage, so there is no PIL resize and no png round trip
+    """
+
+    def __init__(self, width=640, height=400):
+        """init with the preview size"""
+        self.width = width
+        self.height = height
+        self.buffer = None
+        self.allocations = 0
+
+    def downsample(self, screenshot):
+        """
+        every nth pixel of the screenshot copied into the reused buffer, n is picked
+        so the result is still at least the preview size
+        """
+        bgra = bgra_view(screenshot.raw, screenshot.width, screenshot.height)
+        step = max(min(screenshot.width // self.width, screenshot.height // self.height), 1)
+        view = bgra[::step, ::step]
+        if self.buffer is None or self.buffer.shape != view.shape:
+            self.buffer = np.empty(view.shape, dtype=np.uint8)
+            self.allocations += 1
+        np.copyto(self.buffer, view)
+        return self.buffer
+
+    def render(self, screenshot):
+        """the preview pixmap for an mss screenshot"""
+        buffer = self.downsample(screenshot)
+        height, width = buffer.shape[:2]
+        # bgra bytes are what qt calls rgb32 on little endian machines
+        image = QImage(buffer.data, width, height, width * 4, QImage.Format_RGB32)
+        return QPixmap.fromImage(
+            image.scaled(
+                self.width, self.height, Qt.IgnoreAspectRatio, Qt.FastTransformation
+            )
+        )
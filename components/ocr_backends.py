@@ -0,0 +1,144 @@
+"""ocr backend classes"""
+import os
+import threading
+import numpy as np
+import pytesseract
+
+try:
+    import tesserocr
+except ImportError:
+    tesserocr = None
+
+TESSERACT_CMD = r"C:\Program Files\Tesseract-OCR\tesseract.exe"
+TESSDATA_PATH = r"C:\Program Files\Tesseract-OCR\tessdata"
+
+AUTO = "auto"
+PYTESSERACT = "pytesseract"
+TESSEROCR = "tesserocr"
+
+
+class OCRBackend:
+    """Interface every ocr backend implements"""
+
+    name = None
+
+    def recognize(self, image, language_code):
+        """returns the text in the PIL image or grayscale array for the language code"""
+        raise NotImplementedError
+
+    def close(self):
+        """frees whatever the backend keeps loaded"""
+
+
+class PytesseractBackend(OCRBackend):
+    """
+    Runs the tesseract binary through pytesseract, starts a new process and
+    loads the traineddata on every call. Always available so it is the fallback
+    """
+
+    name = PYTESSERACT
+
+    def __init__(self):
+        """point pytesseract at the tesseract install"""
+        pytesseract.pytesseract.tesseract_cmd = TESSERACT_CMD
+
+    def recognize(self, image, language_code):
+        """run pytesseract given language code"""
+        config = f"-l {language_code} --psm 6 --oem 1"
+        return pytesseract.image_to_string(image, config=config)
+
+
+class TesserocrBackend(OCRBackend):
+    """
+    Keeps a loaded libtesseract api per language alive through tesserocr so the
+    process startup and model loading is paid once instead of every frame.
+    The api is not thread safe, use one backend per thread
+    """
+
+    name = TESSEROCR
+
+    def __init__(self, tessdata_path=TESSDATA_PATH):
+        """init with tessdata folder, apis are created on first use of a language"""
+        if tesserocr is None:
+            raise RuntimeError("tesserocr is not installed")
+        self.tessdata_path = tessdata_path if os.path.isdir(tessdata_path) else None
+        self.apis = {}
+
+    def get_api(self, language_code):
+        """returns the loaded api for the language, loads it the first time"""
+        api = self.apis.get(language_code)
+        if api is None:
+            kwargs = {
+                "lang": language_code,
+                "psm": tesserocr.PSM.SINGLE_BLOCK,
+                "oem": tesserocr.OEM.LSTM_ONLY,
+            }
+            if self.tessdata_path:
+                kwargs["path"] = self.tessdata_path
+            api = tesserocr.PyTessBaseAPI(**kwargs)
+            self.apis[language_code] = api
+        return api
+
+    def recognize(self, image, language_code):
+        """run the loaded api on the image, arrays are handed over without PIL"""
+        api = self.get_api(language_code)
+        if isinstance(image, np.ndarray):
+            image = np.ascontiguousarray(image, dtype=np.uint8)
+            height, width = image.shape
+            api.SetImageBytes(image.tobytes(), width, height, 1, width)
+        else:
+            if image.mode == "1":
+                image = image.convert("L")
+            api.SetImage(image)
+        return api.GetUTF8Text()
+
+    def close(self):
+        """ends every loaded api"""
+        for api in self.apis.values():
+            api.End()
+        self.apis = {}
+
+
+BACKENDS = {
+    PYTESSERACT: PytesseractBackend,
+    TESSEROCR: TesserocrBackend,
+}
+
+
+def available_backends():
+    """names of the backends that can run here, fastest first"""
+    names = [PYTESSERACT]
+    if tesserocr is not None:
+        names.insert(0, TESSEROCR)
+    return names
+
+
+def create_backend(name=AUTO):
+    """creates the named backend, auto picks the fastest one that can be loaded"""
+    if name != AUTO:
+        return BACKENDS[name]()
+    for candidate in available_backends():
+        try:
+            return BACKENDS[candidate]()
+        except RuntimeError as e:
+            print(f"Error while loading OCR backend {candidate}: {e}")
+    return PytesseractBackend()
+
+
+local = threading.local()
+backend_name = AUTO
+
+
+def use_backend(name):
+    """sets which backend get_backend creates, called once per ocr process"""
+    global backend_name
+    backend_name = name
+
+
+def get_backend():
+    """the backend for the current thread, created and kept alive on first use"""
+    backend = getattr(local, "backend", None)
+    if backend is None:
+        backend = create_backend(backend_name)
+        local.backend = backend
+    return backend
@@ -0,0 +1,68 @@
+"""ocr pool class"""
+import os
+from concurrent.futures import Future, ProcessPoolExecutor, ThreadPoolExecutor
+from components.ocr_backends import AUTO, use_backend
+
+
+def default_pool_size():
+    """half the cores, tesseract is a heavy process and capture and gui need some room"""
+    return max(1, (os.cpu_count() or 2) // 2)
+
+
+def completed(result):
+    """wraps a result that is already known in a finished future"""
+    future = Future()
+    future.set_result(result)
+    return future
+
+
+def init_worker_process(backend):
+    """
+    runs in every pool process, picks the ocr backend and limits openmp threads,
+    with several tesseracts running side by side each one using all the cores
+    only slows things down
+    """
+    os.environ["OMP_THREAD_LIMIT"] = "1"
+    use_backend(backend)
+
+
+class OCRPool:
+    """
+    Pool of ocr workers, with more than one worker each job runs in its own process
+    so several tesseract calls and the image processing around them run in parallel.
+    A single worker runs in a thread of this process. If a worker process dies the
+    pool is broken for good, restart replaces it with a fresh one
+    """
+
+    def __init__(self, workers=1, backend=AUTO):
+        """init the executor for the number of workers and the ocr backend they use"""
+        self.workers = max(1, workers)
+        self.backend = backend
+        self.restarts = 0
+        self.executor = self.create_executor()
+
+    def create_executor(self):
+        """a thread for a single worker, otherwise a process per worker"""
+        if self.workers == 1:
+            return ThreadPoolExecutor(
+                max_workers=1, initializer=use_backend, initargs=(self.backend,)
+            )
+        return ProcessPoolExecutor(
+            max_workers=self.workers,
+            initializer=init_worker_process,
+            initargs=(self.backend,),
+        )
+
+    def restart(self):
+        """replaces a broken executor, jobs still in the old one are dropped"""
+        self.executor.shutdown(wait=False, cancel_futures=True)
+        self.executor = self.create_executor()
+        self.restarts += 1
+
+    def submit(self, fn, *args):
+        """runs fn(*args) in the pool and returns its future"""
+        return self.executor.submit(fn, *args)
+
+    def shutdown(self, wait=True):
+        """cancels jobs that havent started and stops the workers"""
+        self.executor.shutdown(wait=wait, cancel_futures=True)
@@ -1,6 +1,12 @@
+import queue
+import threading
+from concurrent.futures.process import BrokenProcessPool
 from PIL import Image
-import pytesseract
 from PyQt5.QtCore import QThread, pyqtSignal
+from components.ocr_backends import AUTO, get_backend
+from components.ocr_pool import OCRPool
+from components.preprocessing import preprocess
+from components.text_bands import BandCache, stitch_bands
 
 
 def upscale_image(image, scale_factor=2.0):
@@ -17,33 +23,119 @@ def adaptive_thresholding(image):
 
 
 def ocr_screenshot(image, language_code):
-    """run pytesseract given language code"""
-    pytesseract.pytesseract.tesseract_cmd = (
-        r"C:\Program Files\Tesseract-OCR\tesseract.exe"
-    )
-    config = f"-l {language_code} --psm 6 --oem 1"
-    return pytesseract.image_to_string(image, config=config)
+    """run ocr given language code with the backend loaded for this thread"""
+    return get_backend().recognize(image, language_code)
+
+
+def recognize_band(band, language_code):
+    """image processing and ocr for a single band of the screenshot, runs in the pool"""
+    return ocr_screenshot(preprocess(band), language_code)
 
 
 class OCRWorker(QThread):
     """
     contantly runs ocr on the screenshots given applying image processing
-    and returns text result
+    and returns text result, only the text bands that changed get ocr'd.
+    Bands are spread over a pool of workers, every frame gets a sequence number
+    and results older than the last emitted frame are dropped. Frames can carry a
+    capture region id, band caches and stale checks are kept per region and the
+    id comes back with the text. Frames can also carry the time they were captured,
+    the capture time of the last frame emitted per region is kept in captured_at
     """
 
-    ocr_result = pyqtSignal(str)
+    ocr_result = pyqtSignal(str, int)
 
-    def __init__(self, screenshot_queue, language_combo):
-        """Init with screenshot queue and language code"""
+    def __init__(self, screenshot_queue, language_combo, workers=1, backend=AUTO):
+        """Init with screenshot queue, language code, number of ocr workers and backend"""
         super(OCRWorker, self).__init__()
         self.screenshot_queue = screenshot_queue
         self.language_combo = language_combo
+        self.band_caches = {}
+        self.pool = OCRPool(workers, backend)
+        self.in_flight = threading.BoundedSemaphore(self.pool.workers)
+        self.lock = threading.Lock()
+        self.sequence = 0
+        self.last_emitted = {}
+        self.captured_at = {}
+        self.frames_emitted = 0
+        self.frames_stale = 0
+        self.stopping = False
 
     def run(self):
         """continuous proccess images from queue, get ocr, and return the text"""
-        while True:
-            screenshot, language_code = self.screenshot_queue.get()
-            screenshot = upscale_image(screenshot)
-            screenshot = adaptive_thresholding(screenshot)
-            text = ocr_screenshot(screenshot, language_code)
-            self.ocr_result.emit(text)
+        while not self.stopping:
+            if not self.in_flight.acquire(timeout=0.5):
+                continue
+            try:
+                item = self.screenshot_queue.get(timeout=0.5)
+            except (queue.Empty, TimeoutError):
+                self.in_flight.release()
+                continue
+            screenshot, language_code = item[:2]
+            region_id = item[2] if len(item) > 2 else 0
+            captured_at = item[3] if len(item) > 3 else None
+            self.sequence += 1
+            band_cache = self.band_caches.setdefault(region_id, BandCache())
+            try:
+                futures = band_cache.plan(screenshot, language_code, self.submit_band)
+            except BrokenProcessPool as e:
+                # a tesseract process died, the frame is lost but ocr goes on
+                self.in_flight.release()
+                print(f"Error while running OCR: {e}, restarting the OCR workers")
+                self.pool.restart()
+                continue
+            except RuntimeError as e:
+                self.in_flight.release()
+                if self.stopping:
+                    # pool was shut down while we were waiting for a frame
+                    break
+                print(f"Error while running OCR: {e}")
+                continue
+            self.track_frame(self.sequence, futures, region_id, captured_at)
+
+    def submit_band(self, band, language_code):
+        """sends a band to the ocr pool"""
+        return self.pool.submit(recognize_band, band, language_code)
+
+    def track_frame(self, sequence, futures, region_id=0, captured_at=None):
+        """emits the frame once every band is done"""
+        remaining = [len(futures)]
+
+        def band_done(_):
+            with self.lock:
+                remaining[0] -= 1
+                if remaining[0]:
+                    return
+            self.finish_frame(sequence, futures, region_id, captured_at)
+
+        if not futures:
+            self.finish_frame(sequence, futures, region_id, captured_at)
+        for future in futures:
+            future.add_done_callback(band_done)
+
+    def finish_frame(self, sequence, futures, region_id=0, captured_at=None):
+        """
+        emits the stitched text unless a newer frame of the same region was already
+        emitted
+        """
+        self.in_flight.release()
+        try:
+            texts = [future.result() for future in futures]
+        except Exception as e:
+            if not self.stopping:
+                print(f"Error while running OCR: {e}")
+            return
+        with self.lock:
+            if sequence <= self.last_emitted.get(region_id, 0):
+                self.frames_stale += 1
+                return
+            self.last_emitted[region_id] = sequence
+            self.captured_at[region_id] = captured_at
+            self.frames_emitted += 1
+        self.ocr_result.emit(stitch_bands(texts), region_id)
+
+    def stop(self):
+        """stops taking frames, shuts down the pool and waits for the thread"""
+        self.stopping = True
+        self.pool.shutdown(wait=False)
+        self.wait()
@@ -0,0 +1,139 @@
+"""image preprocessing for ocr on numpy arrays"""
+import numpy as np
+from PIL import Image
+
+OTSU = "otsu"
+SAUVOLA = "sauvola"
+THRESHOLD_FIRST = "threshold_first"
+UPSCALE_FIRST = "upscale_first"
+
+
+def bgra_view(raw, width, height):
+    """wraps a raw bgra buffer like mss ScreenShot.raw as an array without copying"""
+    return np.frombuffer(raw, dtype=np.uint8).reshape(height, width, 4)
+
+
+def bgra_into_gray(bgra, out, scratch):
+    """
+    converts a bgra array to grayscale into out without allocating, scratch is a pair
+    of uint16 arrays the same shape as out. integer weights of the rec 601 luma
+    """
+    total, term = scratch
+    np.multiply(bgra[:, :, 0], 29, out=total, dtype=np.uint16)
+    np.multiply(bgra[:, :, 1], 150, out=term, dtype=np.uint16)
+    np.add(total, term, out=total)
+    np.multiply(bgra[:, :, 2], 77, out=term, dtype=np.uint16)
+    np.add(total, term, out=total)
+    np.right_shift(total, 8, out=total)
+    np.copyto(out, total, casting="unsafe")
+    return out
+
+
+def bgra_to_gray(raw, width, height):
+    """converts a raw mss bgra buffer to a new grayscale array"""
+    scratch = (
+        np.empty((height, width), dtype=np.uint16),
+        np.empty((height, width), dtype=np.uint16),
+    )
+    out = np.empty((height, width), dtype=np.uint8)
+    return bgra_into_gray(bgra_view(raw, width, height), out, scratch)
+
+
+def to_gray(image):
+    """returns a grayscale uint8 array for a PIL image or an array"""
+    if isinstance(image, Image.Image):
+        return np.asarray(image.convert("L"))
+    array = np.asarray(image)
+    if array.ndim == 3:
+        return (array[:, :, :3] @ np.array([0.299, 0.587, 0.114])).astype(np.uint8)
+    return array
+
+
+def otsu_threshold(gray):
+    """global threshold that best separates the two classes of the histogram"""
+    histogram = np.bincount(gray.ravel(), minlength=256).astype(np.float64)
+    levels = np.arange(256)
+    weight_background = np.cumsum(histogram)
+    weight_foreground = weight_background[-1] - weight_background
+    sum_background = np.cumsum(histogram * levels)
+    mean_background = sum_background / np.maximum(weight_background, 1)
+    mean_foreground = (sum_background[-1] - sum_background) / np.maximum(
+        weight_foreground, 1
+    )
+    variance = weight_background * weight_foreground * (
+        mean_background - mean_foreground
+    ) ** 2
+    return int(np.argmax(variance))
+
+
+def integral_image(array):
+    """summed area table with a row and column of zeros in front"""
+    integral = np.zeros((array.shape[0] + 1, array.shape[1] + 1), dtype=np.float64)
+    np.cumsum(array, axis=0, out=integral[1:, 1:])
+    np.cumsum(integral[1:, 1:], axis=1, out=integral[1:, 1:])
+    return integral
+
+
+def box_mean(array, window):
+    """mean of the window x window box around every pixel, edges are reflected"""
+    half = window // 2
+    window = 2 * half + 1
+    integral = integral_image(np.pad(array, half, mode="reflect"))
+    total = (
+        integral[window:, window:]
+        - integral[:-window, window:]
+        - integral[window:, :-window]
+        + integral[:-window, :-window]
+    )
+    return total / (window * window)
+
+
+def sauvola_threshold(gray, window=25, k=0.2, r=128):
+    """per pixel sauvola threshold using integral images of the image and its square"""
+    values = gray.astype(np.float64)
+    mean = box_mean(values, window)
+    mean_square = box_mean(values * values, window)
+    std = np.sqrt(np.maximum(mean_square - mean * mean, 0))
+    return mean * (1 + k * (std / r - 1))
+
+
+def normalize_polarity(gray):
+    """inverts light text on a dark background so text is always dark for tesseract"""
+    if gray.mean() < 128:
+        return 255 - gray
+    return gray
+
+
+def binarize(gray, method=OTSU):
+    """thresholds the grayscale array to 0 and 255, text is dark"""
+    gray = normalize_polarity(gray)
+    if method == OTSU:
+        threshold = otsu_threshold(gray)
+    elif method == SAUVOLA:
+        threshold = sauvola_threshold(gray)
+    else:
+        raise ValueError(f"Unknown threshold method: {method}")
+    return np.where(gray > threshold, 255, 0).astype(np.uint8)
+
+
+def upscale(array, scale_factor=2):
+    """integer nearest neighbour upscale, enough for an already binary image"""
+    return np.repeat(np.repeat(array, scale_factor, axis=0), scale_factor, axis=1)
+
+
+def preprocess(image, method=OTSU, scale_factor=2, order=THRESHOLD_FIRST):
+    """
+    grayscale, threshold and upscale for ocr. threshold_first thresholds the small
+    image and upscales the binary result, upscale_first does a lanczos upscale before
+    thresholding like the old pipeline. returns a uint8 array
+    """
+    gray = to_gray(image)
+    if order == THRESHOLD_FIRST:
+        return upscale(binarize(gray, method), scale_factor)
+    if order == UPSCALE_FIRST:
+        height, width = gray.shape
+        resized = Image.fromarray(gray).resize(
+            (width * scale_factor, height * scale_factor), Image.LANCZOS
+        )
+        return binarize(np.asarray(resized), method)
+    raise ValueError(f"Unknown preprocessing order: {order}")
@@ -0,0 +1,189 @@
+"""region manager class"""
+import threading
+from components.capture_scheduler import CaptureScheduler
+from components.change_detector import ChangeDetector
+from components.dedup import DedupHistory
+
+
+def union_bbox(bboxes):
+    """smallest (left, top, right, bottom) box covering every bbox"""
+    lefts, tops, rights, bottoms = zip(*bboxes)
+    return (min(lefts), min(tops), max(rights), max(bottoms))
+
+
+class CaptureRegion:
+    """
+    One watched area of the screen with its own source language, capture schedule,
+    change detector, dedup history and translated text window
+    """
+
+    def __init__(
+        self,
+        region_id,
+        bbox,
+        overlay_area,
+        monitor_index,
+        language_code,
+        scheduler,
+        source_history,
+    ):
+        """
+        init with the global (left, top, right, bottom) bbox to capture, the
+        (x, y, width, height) area the translated text window is centered in, the
+        scheduler that paces this region and its dedup history
+        """
+        self.region_id = region_id
+        self.bbox = bbox
+        self.overlay_area = overlay_area
+        self.monitor_index = monitor_index
+        self.language_code = language_code
+        self.scheduler = scheduler
+        self.change_detector = ChangeDetector()
+        self.source_history = source_history
+        self.overlay = None
+        # capture time of the frame the text last sent for translation came from
+        self.text_captured_at = None
+        # source text and language of the translation the window shows right now
+        self.shown_source = None
+        self.shown_language = None
+
+    def crop(self, frame, origin):
+        """this region's part of a frame whose top left corner is at origin"""
+        left, top, right, bottom = self.bbox
+        x, y = origin
+        return frame[top - y : bottom - y, left - x : right - x]
+
+    def overlay_rect(self, origin):
+        """
+        rect of the translated text window in a frame whose top left corner is at
+        origin, None while the window is hidden or left out of captures
+        """
+        overlay = self.overlay
+        frame_rect = overlay.frame_rect if overlay is not None else None
+        if frame_rect is None:
+            return None
+        x, y, width, height = frame_rect
+        return (
+            self.overlay_area[0] + x - origin[0],
+            self.overlay_area[1] + y - origin[1],
+            width,
+            height,
+        )
+
+    def reset(self):
+        """forget what was captured, used when capturing starts"""
+        self.scheduler.reset()
+        self.change_detector.reset()
+        self.source_history.clear()
+        self.text_captured_at = None
+        self.shown_source = None
+        self.shown_language = None
+
+
+class RegionManager:
+    """
+    Holds the capture regions and paces them for the one capture thread. wait
+    sleeps until the first region is due and returns every region due by then so
+    they all come out of one grab of the union bbox
+    """
+
+    def __init__(self, target_fps=4.0, idle_fps=0.5, dedup_depth=5, dedup_threshold=0.6):
+        """init with the schedule and dedup settings every new region gets"""
+        self.target_fps = target_fps
+        self.idle_fps = idle_fps
+        self.dedup_depth = dedup_depth
+        self.dedup_threshold = dedup_threshold
+        self.regions = []
+        self.next_id = 1
+        self.lock = threading.Lock()
+        self.stopped = threading.Event()
+
+    def add(self, bbox, overlay_area, monitor_index, language_code):
+        """adds a region and returns it"""
+        region = CaptureRegion(
+            self.next_id,
+            bbox,
+            overlay_area,
+            monitor_index,
+            language_code,
+            CaptureScheduler(target_fps=self.target_fps, idle_fps=self.idle_fps),
+            DedupHistory(depth=self.dedup_depth, threshold=self.dedup_threshold),
+        )
+        with self.lock:
+            self.regions.append(region)
+            self.next_id += 1
+        return region
+
+    def remove(self, region_id):
+        """removes a region and returns it, None if there is no such region"""
+        with self.lock:
+            for region in self.regions:
+                if region.region_id == region_id:
+                    self.regions.remove(region)
+                    return region
+        return None
+
+    def clear(self):
+        """removes every region and returns them"""
+        with self.lock:
+            regions, self.regions = self.regions, []
+        return regions
+
+    def get(self, region_id):
+        """the region with that id, None if it was removed"""
+        with self.lock:
+            for region in self.regions:
+                if region.region_id == region_id:
+                    return region
+        return None
+
+    def snapshot(self):
+        """the current regions as a list the caller can keep"""
+        with self.lock:
+            return list(self.regions)
+
+    def union_bbox(self):
+        """bbox covering every region, None without regions"""
+        regions = self.snapshot()
+        if not regions:
+            return None
+        return union_bbox([region.bbox for region in regions])
+
+    def reset(self):
+        """clears a previous stop and puts every region back to full speed"""
+        self.stopped.clear()
+        for region in self.snapshot():
+            region.reset()
+
+    def wait(self):
+        """
+        sleeps until at least one region is due and returns the due regions,
+        None once stop is called or if there are no regions
+        """
+        regions = self.snapshot()
+        if not regions:
+            return None
+        delay = min(region.scheduler.remaining() for region in regions)
+        if delay > 0 and self.stopped.wait(delay):
+            return None
+        if self.stopped.is_set():
+            return None
+        # a millisecond of slack so a region due right after the wait isnt skipped
+        return [region for region in regions if region.scheduler.remaining() <= 0.001]
+
+    def stop(self):
+        """wakes the capture thread and makes wait return None"""
+        self.stopped.set()
+
+    def stats(self):
+        """scheduler, change detector and dedup stats added up over the regions"""
+        totals = {}
+        for region in self.snapshot():
+            for stats in (
+                region.scheduler.stats(),
+                region.change_detector.stats(),
+                region.source_history.stats(),
+            ):
+                for name, value in stats.items():
+                    totals[name] = totals.get(name, 0) + value
+        return totals
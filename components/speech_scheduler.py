@@ -0,0 +1,153 @@
+"""speech scheduler class"""
+import threading
+import time
+from collections import deque
+
+QUEUE_ALL = "queue"
+LATEST_ONLY = "latest"
+DROP_STALE = "drop_stale"
+MERGE_SHORT = "merge"
+INTERRUPT = "interrupt"
+
+# seconds after capture a line is still worth speaking with the drop stale policy
+STALE_SECONDS = 5.0
+# queued lines shorter than this together are spoken as one clip with the merge policy
+MERGE_CHARS = 80
+
+SPEECH_POLICIES = {
+    QUEUE_ALL: ("Queue all", {}),
+    LATEST_ONLY: ("Latest only", {"latest_only": True}),
+    DROP_STALE: ("Drop stale", {"max_age": STALE_SECONDS}),
+    MERGE_SHORT: ("Merge short lines", {"merge_chars": MERGE_CHARS, "max_age": STALE_SECONDS}),
+    INTERRUPT: ("Interrupt", {"latest_only": True, "interrupt": True}),
+}
+
+
+class SpeechScheduler:
+    """
+    Decides what gets spoken and when so speech keeps up with the screen. Every
+    line is queued with the time its frame was captured and starts synthesizing
+    right away through prepare. latest_only drops everything still queued when a
+    new line comes in, max_age drops lines captured more than that many seconds
+    ago, merge_chars joins a short line with the short line queued before it into
+    one synthesis call as long as that one hasnt started, and interrupt tells the
+    player to cut the current clip for the new line. The lag between capture and
+    playback of every spoken line is tracked
+    """
+
+    def __init__(
+        self,
+        prepare,
+        latest_only=False,
+        max_age=None,
+        merge_chars=0,
+        interrupt=False,
+        clock=time.monotonic,
+    ):
+        """init with the function that starts synthesis and returns a future and the policy"""
+        self.prepare = prepare
+        self.clock = clock
+        self.items = deque()
+        self.lock = threading.Lock()
+        self.spoken = 0
+        self.dropped = 0
+        self.stale = 0
+        self.merged = 0
+        self.interruptions = 0
+        self.last_lag = 0.0
+        self.total_lag = 0.0
+        self.max_lag = 0.0
+        self.set_policy(latest_only, max_age, merge_chars, interrupt)
+
+    def set_policy(self, latest_only=False, max_age=None, merge_chars=0, interrupt=False):
+        """changes the policy, lines already queued stay"""
+        self.latest_only = latest_only
+        self.max_age = max_age
+        self.merge_chars = merge_chars
+        self.interrupt = interrupt
+
+    def add(self, text, language_code, captured_at=None):
+        """
+        queues a line captured at captured_at, now if None, returns true if the
+        current clip should be cut off for it
+        """
+        if captured_at is None:
+            captured_at = self.clock()
+        with self.lock:
+            if self.latest_only:
+                self.dropped += self.discard(len(self.items))
+            elif self.merge_chars and self.items:
+                last_text, last_language, last_captured_at, last_future = self.items[-1]
+                if (
+                    last_language == language_code
+                    and len(last_text) + len(text) < self.merge_chars
+                    and last_future.cancel()
+                ):
+                    self.items.pop()
+                    text = f"{last_text} {text}"
+                    captured_at = min(captured_at, last_captured_at)
+                    self.merged += 1
+        future = self.prepare(text, language_code)
+        with self.lock:
+            self.items.append((text, language_code, captured_at, future))
+        return self.interrupt
+
+    def next_ready(self):
+        """
+        the next line to speak once its audio is ready, None if the queue is empty
+        or the next line is still being synthesized, stale lines are dropped first
+        """
+        with self.lock:
+            if self.max_age is not None:
+                now = self.clock()
+                while self.items and now - self.items[0][2] > self.max_age:
+                    self.stale += self.discard(1)
+            if not self.items or not self.items[0][3].done():
+                return None
+            return self.items.popleft()
+
+    def pending(self):
+        """true if lines are queued"""
+        with self.lock:
+            return bool(self.items)
+
+    def record_playback(self, captured_at):
+        """called when a line starts playing, tracks its lag behind the capture"""
+        lag = max(self.clock() - captured_at, 0.0)
+        with self.lock:
+            self.spoken += 1
+            self.last_lag = lag
+            self.total_lag += lag
+            self.max_lag = max(self.max_lag, lag)
+
+    def record_interruption(self):
+        """called when a clip was cut off for a newer line"""
+        with self.lock:
+            self.interruptions += 1
+
+    def discard(self, count):
+        """drops the oldest queued lines, synthesis not started yet is cancelled, caller holds the lock"""
+        for _ in range(count):
+            _, _, _, future = self.items.popleft()
+            future.cancel()
+        return count
+
+    def clear(self):
+        """drops every queued line"""
+        with self.lock:
+            self.discard(len(self.items))
+
+    def stats(self):
+        """lines spoken, dropped, merged, clips cut off and the lag between capture and playback"""
+        with self.lock:
+            return {
+                "queued": len(self.items),
+                "spoken": self.spoken,
+                "dropped": self.dropped,
+                "stale": self.stale,
+                "merged": self.merged,
+                "interruptions": self.interruptions,
+                "lag_ms": self.last_lag * 1000,
+                "average_lag_ms": self.total_lag / self.spoken * 1000 if self.spoken else 0.0,
+                "max_lag_ms": self.max_lag * 1000,
+            }
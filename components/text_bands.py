@@ -0,0 +1,114 @@
+"""text band cache class"""
+import numpy as np
+from components.change_detector import changed_fraction
+from components.ocr_pool import completed
+from components.preprocessing import to_gray
+
+
+def find_text_bands(array, contrast=40, min_gap=3, padding=2):
+    """
+    splits a grayscale array into horizontal text line bands using the row
+    contrast profile, rows with no ink are the gaps between lines.
+    returns a list of (top, bottom), the whole frame if no gaps are found
+    """
+    height = array.shape[0]
+    if height == 0:
+        return []
+    ink = (array.max(axis=1).astype(np.int16) - array.min(axis=1)) > contrast
+    rows = np.flatnonzero(ink)
+    if rows.size == 0 or rows.size == height:
+        return [(0, height)]
+
+    # split where the gap between two ink rows is at least min_gap
+    breaks = np.flatnonzero(np.diff(rows) > min_gap)
+    starts = np.concatenate(([rows[0]], rows[breaks + 1]))
+    ends = np.concatenate((rows[breaks], [rows[-1]]))
+
+    return [
+        (max(int(start) - padding, 0), min(int(end) + 1 + padding, height))
+        for start, end in zip(starts, ends)
+    ]
+
+
+def stitch_bands(texts):
+    """joins the text of every band top to bottom skipping empty bands"""
+    return "\n".join(text.strip() for text in texts if text.strip())
+
+
+class BandCache:
+    """
+    Dirty region ocr, keeps the text of every band from the previous frame and
+    only runs ocr on the bands whose pixels changed. Text of unchanged bands is
+    reused and everything is stitched back together top to bottom
+    """
+
+    def __init__(self, pixel_threshold=24, tolerance=0.002):
+        """init thresholds, tolerance is the fraction of band pixels allowed to change"""
+        self.pixel_threshold = pixel_threshold
+        self.tolerance = tolerance
+        self.reset()
+
+    def reset(self):
+        """drop all cached bands"""
+        self.bands = {}
+        self.frame_key = None
+        self.bands_recognized = 0
+        self.bands_reused = 0
+
+    def plan(self, image, language_code, submit_band):
+        """
+        returns one future per band of the image, submit_band(band, language_code)
+        is only called for bands that changed, unchanged bands reuse the cached future.
+        bands of a frame that is a view into someone elses buffer are copied out so the
+        buffer can be reused right away, a frame that owns its pixels is not copied again
+        """
+        array = to_gray(image)
+        owned = array.flags.owndata
+        frame_key = (array.shape[1], language_code)
+        if frame_key != self.frame_key:
+            self.bands = {}
+            self.frame_key = frame_key
+
+        bands = {}
+        futures = []
+        for top, bottom in find_text_bands(array):
+            pixels = array[top:bottom]
+            cached = self.bands.get((top, bottom))
+            if self.is_reusable(cached, pixels):
+                pixels, future = cached
+                self.bands_reused += 1
+            else:
+                if not owned:
+                    pixels = pixels.copy()
+                future = submit_band(pixels, language_code)
+                self.bands_recognized += 1
+            bands[(top, bottom)] = (pixels, future)
+            futures.append(future)
+
+        self.bands = bands
+        return futures
+
+    def is_reusable(self, cached, pixels):
+        """true if a cached band has the same pixels and didnt fail"""
+        if cached is None:
+            return False
+        future = cached[1]
+        if future.cancelled() or (future.done() and future.exception() is not None):
+            return False
+        return changed_fraction(cached[0], pixels, self.pixel_threshold) <= self.tolerance
+
+    def recognize(self, image, language_code, ocr_band):
+        """
+        returns the text of the image, ocr_band(band_image, language_code) is only
+        called for bands that changed since the last frame
+        """
+        futures = self.plan(
+            image,
+            language_code,
+            lambda band, code: completed(ocr_band(band, code)),
+        )
+        return stitch_bands([future.result() for future in futures])
+
+    def stats(self):
+        """bands that went through ocr and bands reused from the cache"""
+        return {"recognized": self.bands_recognized, "reused": self.bands_reused}
@@ -1,14 +1,74 @@
-from googletrans import LANGUAGES
-from googletrans import Translator
-from nltk.corpus import stopwords
-from nltk.tokenize import word_tokenize
+"""text processor class, nltk googletrans and sklearn are imported on first use"""
+import functools
 import re
-from sklearn.feature_extraction.text import TfidfVectorizer
-from sklearn.metrics.pairwise import cosine_similarity
-import nltk
+from components.translation_cache import TranslationCache
 
-nltk.download("stopwords", quiet=True)
-nltk.download("punkt", quiet=True)
+# nltk resource path and download name of every corpus this module uses
+NLTK_CORPORA = (("corpora/stopwords", "stopwords"), ("tokenizers/punkt", "punkt"))
+
+
+def missing_corpora():
+    """download names of the nltk corpora not found locally"""
+    import nltk
+
+    missing = []
+    for resource, name in NLTK_CORPORA:
+        try:
+            nltk.data.find(resource)
+        except LookupError:
+            missing.append(name)
+    return missing
+
+
+def download_corpora():
+    """downloads the missing nltk corpora, only run by the explicit setup command"""
+    import nltk
+
+    missing = missing_corpora()
+    for name in missing:
+        print(f"Downloading nltk corpus {name}")
+        nltk.download(name, quiet=True)
+    if missing:
+        stopword_languages.cache_clear()
+    return missing
+
+
+@functools.lru_cache(maxsize=None)
+def stopword_languages():
+    """
+    languages nltk has stopword lists for, read from the corpus once. None if the
+    corpus is missing, that is cached too so it is only looked for once,
+    download_corpora clears it
+    """
+    if "stopwords" in missing_corpora():
+        print(
+            "Error while loading stopwords: corpus not found, "
+            "run python main.py --setup to download it"
+        )
+        return None
+    from nltk.corpus import stopwords
+
+    return frozenset(stopwords.fileids())
+
+
+@functools.lru_cache(maxsize=None)
+def stopword_set(lang):
+    """stopwords of one language, read from the corpus once"""
+    from nltk.corpus import stopwords
+
+    return frozenset(stopwords.words(lang))
+
+
+def tokenize(text, cleaned=True):
+    """
+    splits text into words, text with the punctuation already stripped only needs
+    a whitespace split, anything else goes through the punkt tokenizer
+    """
+    if cleaned:
+        return text.split()
+    from nltk.tokenize import word_tokenize
+
+    return word_tokenize(text)
 
 
 class TextProcessor:
@@ -17,9 +77,21 @@ class TextProcessor:
     also added cosine similarity so the same text doesnt get outputed
     """
 
-    def __init__(self):
-        """Init googletrans"""
-        self.translator = Translator()
+    def __init__(self, cache_path=None):
+        """
+        Init the translation cache, cache_path adds an on disk store. googletrans is
+        set up on the first translation
+        """
+        self.translator = None
+        self.translation_cache = TranslationCache(path=cache_path)
+
+    def get_translator(self):
+        """googletrans translator, imported and created on first use"""
+        if self.translator is None:
+            from googletrans import Translator
+
+            self.translator = Translator()
+        return self.translator
 
     def process_text(self, text):
         """uses regex to remove special chars and whitespace"""
@@ -28,34 +100,87 @@ class TextProcessor:
         return cleaned_text
 
     def translate_text(self, text, target_language):
-        """using googletrans api to translate giving text with language code"""
+        """
+        using googletrans api to translate giving text with language code,
+        cached translations skip the network
+        """
         if not text.strip():
             return text
+        cached = self.translation_cache.get(text, target_language)
+        if cached is not None:
+            return cached
         try:
-            translation = self.translator.translate(text, dest=target_language)
+            translation = self.get_translator().translate(text, dest=target_language)
+            self.translation_cache.put(text, target_language, translation.text)
             return translation.text
         except Exception as e:
             print(f"Error while translating: {e}")
             return text
 
+    def translate_batch(self, texts, target_language):
+        """
+        translates several texts with one googletrans request joined by newlines,
+        cached texts skip the network. if the newlines dont survive the translation
+        every text is sent on its own
+        """
+        results = [None] * len(texts)
+        missing = []
+        for index, text in enumerate(texts):
+            if not text.strip():
+                results[index] = text
+                continue
+            cached = self.translation_cache.get(text, target_language)
+            if cached is not None:
+                results[index] = cached
+            else:
+                missing.append(index)
+        if not missing:
+            return results
+
+        # newlines are the delimiter so they cant appear inside a segment
+        segments = [" ".join(texts[index].split()) for index in missing]
+        parts = None
+        if len(segments) > 1:
+            try:
+                translation = self.get_translator().translate(
+                    "\n".join(segments), dest=target_language
+                )
+                parts = translation.text.split("\n")
+            except Exception as e:
+                print(f"Error while translating: {e}")
+                for index in missing:
+                    results[index] = texts[index]
+                return results
+
+        if parts is not None and len(parts) == len(segments):
+            for index, part in zip(missing, parts):
+                results[index] = part.strip()
+                self.translation_cache.put(texts[index], target_language, results[index])
+        else:
+            for index in missing:
+                results[index] = self.translate_text(texts[index], target_language)
+        return results
+
     def remove_stopwords(self, text, language_code):
-        """removes stopwords for cosine similarity based on their language"""
+        """
+        removes stopwords for cosine similarity based on their language, only used by
+        calculate_similarity now that the capture pipeline dedups with DedupHistory
+        """
+        from googletrans import LANGUAGES
+
         if language_code not in LANGUAGES:
             return text
 
         lang = LANGUAGES[language_code]
-        if lang not in stopwords.fileids():
+        languages = stopword_languages()
+        if languages is None or lang not in languages:
             return text
 
         text = text.lower()
         text = re.sub(r"[^\w\s]", "", text, flags=re.UNICODE)
 
-        stop_words = set(stopwords.words(lang))
-        word_tokens = word_tokenize(text)
-        return " ".join(
-            [word for word in word_tokens if word.lower() not in stop_words]
-        )
-
+        stop_words = stopword_set(lang)
+        return " ".join([word for word in tokenize(text) if word not in stop_words])
 
     def calculate_similarity(self, text1, text2, language_code):
         """calculates the cosine similarity between the current and previous text sent"""
@@ -65,6 +190,9 @@ class TextProcessor:
         if not filtered_text1 or not filtered_text2:
             return 0
 
+        from sklearn.feature_extraction.text import TfidfVectorizer
+        from sklearn.metrics.pairwise import cosine_similarity
+
         vectorizer = TfidfVectorizer().fit([filtered_text1, filtered_text2])
         tfidf_matrix = vectorizer.transform([filtered_text1, filtered_text2])
 
@@ -1,58 +1,102 @@
-import tempfile
-import queue
-from gtts import gTTS
+"""text to speech class"""
 from PyQt5.QtMultimedia import QMediaPlayer, QMediaContent
-from PyQt5.QtCore import QUrl, QFile, QTimer
+from PyQt5.QtCore import QBuffer, QByteArray, QIODevice, QTimer
+from components.speech_scheduler import QUEUE_ALL, SPEECH_POLICIES, SpeechScheduler
+from components.tts_backends import GTTS
+from components.tts_engine import TTSEngine
+
+# how often to look again when the next clip is still being synthesized
+SYNTHESIS_POLL_MS = 50
 
 
 class TextToSpeech:
     """
-    TextToSpeech Component for MainWindow, gets the translated text and puts them in a queue
-    saves text as a temp mp3 file once finished file is deleted and made again with new mp3
+    TextToSpeech Component for MainWindow, gets the translated text and hands it to the
+    speech scheduler, whose policy decides what is dropped, merged or cut off. Every text
+    starts synthesizing in the background as soon as it is queued so the next clip is
+    usually ready when the current one ends. Clips stay in memory and are played from a
+    QBuffer, nothing in the speech path touches the filesystem
     """
 
-    def __init__(self, parent):
-        """init with parent widget set queue, timer, and media player"""
+    def __init__(self, parent, backend=GTTS, cache_path=None, policy=QUEUE_ALL):
+        """
+        init with parent widget set scheduler, timer, media player and the tts engine,
+        cache_path None keeps the audio cache in memory only
+        """
         self.parent = parent
         self.media_player = QMediaPlayer(self.parent)
-        self.text_queue = queue.Queue()
         self.queue_timer = QTimer(self.parent)
         self.queue_timer.setSingleShot(True)
         self.playback_enabled = True
         self.queue_timer.timeout.connect(self.check_queue)
         self.media_player.mediaStatusChanged.connect(self.handle_media_status_change)
+        self.audio_buffer = None
+        self.engine = TTSEngine(cache_path, backend=backend)
+        self.scheduler = SpeechScheduler(self.engine.prepare)
+        self.set_policy(policy)
+
+    def set_backend(self, backend):
+        """switches the voice to another tts backend, returns the one actually in use"""
+        return self.engine.set_backend(backend)
+
+    def set_policy(self, policy):
+        """switches to one of the named speech policies"""
+        _, options = SPEECH_POLICIES[policy]
+        self.scheduler.set_policy(**options)
 
-    def play_text_voice(self, text, lang):
-        """Adds text and language code to queue and plays"""
+    def play_text_voice(self, text, lang, captured_at=None):
+        """
+        Starts synthesizing the text captured at captured_at, adds it to the scheduler
+        and plays, the current clip is cut off if the policy says so
+        """
         self.playback_enabled = True
-        self.text_queue.put((text, lang))
+        interrupt = self.scheduler.add(text, lang, captured_at)
+        if interrupt and self.media_player.state() != QMediaPlayer.StoppedState:
+            self.media_player.stop()
+            self.scheduler.record_interruption()
         if self.media_player.state() == QMediaPlayer.StoppedState:
             self.play_next_audio()
 
     def play_next_audio(self):
-        """Playes next audio in queue and creats temp mp3 file"""
-        if self.text_queue.empty():
+        """
+        Playes next audio in queue, if it is still being synthesized looks again
+        shortly, a clip that failed to synthesize is skipped
+        """
+        while True:
+            item = self.scheduler.next_ready()
+            if item is None:
+                if self.scheduler.pending():
+                    self.queue_timer.start(SYNTHESIS_POLL_MS)
+                return
+            _, _, captured_at, future = item
+            try:
+                data = future.result()
+            except Exception as e:
+                print(f"Error while synthesizing speech: {e}")
+                continue
+            self.scheduler.record_playback(captured_at)
+            self.play_audio(data)
             return
 
-        text, lang = self.text_queue.get()
-        tts = gTTS(text=text, lang=lang)
-        temp_file = tempfile.NamedTemporaryFile(delete=False, suffix=".mp3")
-        tts.save(temp_file.name)
-        temp_file.close()
-        self.media_player.setMedia(QMediaContent(QUrl.fromLocalFile(temp_file.name)))
+    def play_audio(self, data):
+        """plays the audio bytes from a QBuffer, the previous clip's buffer is released"""
+        audio_buffer = QBuffer()
+        audio_buffer.setData(QByteArray(data))
+        audio_buffer.open(QIODevice.ReadOnly)
+        self.media_player.setMedia(QMediaContent(), audio_buffer)
+        self.release_audio_buffer()
+        self.audio_buffer = audio_buffer
         self.media_player.play()
 
-    def remove_temp_voice_file(self, file_name):
-        """Removes tempo file"""
-        if QFile.exists(file_name):
-            QFile.remove(file_name)
+    def release_audio_buffer(self):
+        """closes the buffer of the last clip"""
+        if self.audio_buffer is not None:
+            self.audio_buffer.close()
+            self.audio_buffer = None
 
     def handle_media_status_change(self, status):
-        """When mp3 is done playing delete and go to next audio in the queue"""
+        """When a clip is done playing go to next audio in the queue"""
         if status == QMediaPlayer.EndOfMedia:
-            self.remove_temp_voice_file(
-                self.media_player.currentMedia().canonicalUrl().toLocalFile()
-            )
             self.play_next_audio()
         elif status == QMediaPlayer.StoppedState:
             self.queue_timer.start(1000)
@@ -63,8 +107,14 @@ class TextToSpeech:
             self.play_next_audio()
 
     def stop_voice(self):
-        """Stops tts and clears the queue"""
+        """Stops tts and clears the queue, clips not started yet are not synthesized"""
         self.playback_enabled = False
         self.media_player.stop()
-        self.text_queue.queue.clear()
+        self.media_player.setMedia(QMediaContent())
+        self.release_audio_buffer()
+        self.scheduler.clear()
 
+    def close(self):
+        """stops playback and the tts engine"""
+        self.stop_voice()
+        self.engine.stop()
@@ -0,0 +1,117 @@
+"""transcript writer class"""
+import json
+import queue
+import threading
+import time
+from datetime import datetime
+
+TEXT = "text"
+JSONL = "jsonl"
+FORMATS = (TEXT, JSONL)
+
+
+def format_for_path(path):
+    """jsonl for .jsonl files, plain text lines for everything else"""
+    return JSONL if path.lower().endswith(".jsonl") else TEXT
+
+
+class TranscriptWriter:
+    """
+    Saves translated text on a background thread. The file is opened once on the
+    first write and kept open, lines are collected and written together every
+    flush_interval seconds or once max_batch lines are waiting, and whatever is
+    left is written on close. text format writes the translated text per line,
+    jsonl writes a record with time, source, translation, languages and region
+    """
+
+    def __init__(self, path, output_format=TEXT, flush_interval=1.0, max_batch=64):
+        """init with the file to append to, the format and how often to write"""
+        if output_format not in FORMATS:
+            raise ValueError(f"Unknown transcript format: {output_format}")
+        self.path = path
+        self.output_format = output_format
+        self.flush_interval = flush_interval
+        self.max_batch = max_batch
+        self.records = queue.Queue()
+        self.file = None
+        self.lines = 0
+        self.batches = 0
+        self.closed = False
+        self.thread = threading.Thread(target=self.run, daemon=True)
+        self.thread.start()
+
+    def write(
+        self,
+        translated_text,
+        source_text="",
+        language_from="",
+        language_to="",
+        region=None,
+    ):
+        """queues one translation, never blocks on the file"""
+        if self.closed:
+            return
+        self.records.put(
+            {
+                "time": datetime.now().isoformat(timespec="milliseconds"),
+                "source": source_text,
+                "translated": translated_text,
+                "from": language_from,
+                "to": language_to,
+                "region": region,
+            }
+        )
+
+    def format_record(self, record):
+        """the line written for a record"""
+        if self.output_format == JSONL:
+            return json.dumps(record, ensure_ascii=False) + "\n"
+        return record["translated"] + "\n"
+
+    def run(self):
+        """collects records and writes them in batches until close"""
+        batch = []
+        deadline = time.monotonic() + self.flush_interval
+        while True:
+            try:
+                record = self.records.get(timeout=max(deadline - time.monotonic(), 0))
+            except queue.Empty:
+                record = False
+            if record is None:
+                break
+            if record:
+                batch.append(self.format_record(record))
+            if len(batch) >= self.max_batch or time.monotonic() >= deadline:
+                self.flush(batch)
+                batch = []
+                deadline = time.monotonic() + self.flush_interval
+        self.flush(batch)
+        if self.file is not None:
+            self.file.close()
+            self.file = None
+
+    def flush(self, batch):
+        """writes the batch with one call and flushes the file"""
+        if not batch:
+            return
+        try:
+            if self.file is None:
+                self.file = open(self.path, "a", encoding="utf-8")
+            self.file.writelines(batch)
+            self.file.flush()
+            self.lines += len(batch)
+            self.batches += 1
+        except OSError as e:
+            print(f"Error while writing transcript: {e}")
+
+    def stats(self):
+        """lines written and how many writes it took"""
+        return {"lines": self.lines, "batches": self.batches}
+
+    def close(self):
+        """writes everything still queued, closes the file and stops the thread"""
+        if self.closed:
+            return
+        self.closed = True
+        self.records.put(None)
+        self.thread.join()
@@ -1,15 +1,27 @@
-from PyQt5.QtCore import Qt, QRect
+from PyQt5.QtCore import Qt
 from PyQt5.QtGui import QPainter, QColor, QFontMetrics, QPen, QPainterPath
-from PyQt5.QtWidgets import QWidget, QDesktopWidget
+from PyQt5.QtWidgets import QWidget, QApplication
 import random
+import sys
+
+# SetWindowDisplayAffinity flag, the window stays visible but screen grabs skip it
+WDA_EXCLUDEFROMCAPTURE = 0x11
 
 
 class TranslatedTextWindow(QWidget):
     """
     Translated Text Window Component for MainWindow, creates a window relative to size
-    of text recieved, that is drawn in the middle of the users captured area
+    of text recieved, that is drawn in the middle of the users captured area. The
+    window is kept for the whole session, new text and areas update it in place.
+    Where the os allows it the window is left out of screen captures, otherwise it
+    is placed next to the captured area so it never covers the source text, and
+    frame_rect tells the capture thread which part of the frame to mask
     """
 
+    padding_top = 10
+    padding_left_right = 10
+    min_width, min_height = 50, 20
+
     def __init__(self, parent, monitor_index, capture_area, text):
         """Basic init set values,attr,flags, and geometry"""
         super().__init__(parent)
@@ -24,88 +36,169 @@ class TranslatedTextWindow(QWidget):
         self.setAttribute(Qt.WA_TranslucentBackground)
         self.setAttribute(Qt.WA_NoSystemBackground)
 
-        # Get specific desktop geometry
-        desktop = QDesktopWidget()
-        self.monitor_geometry = desktop.screenGeometry(monitor_index)
-        x, y, width, height = capture_area
-        self.setGeometry(x, y, width, height)
+        self.text_font = self.font()
+        self.text_font.setPointSize(20)
+        self.text_font.setBold(True)
+        # picked once so repaints dont change the background
+        self.background_color = QColor(
+            random.randint(0, 255), random.randint(0, 255), random.randint(0, 255), 255
+        )
+        self.outline_pen = QPen(QColor(0, 0, 0), 3, Qt.SolidLine, Qt.RoundCap, Qt.RoundJoin)
+        self.text_lines = []
+        self.text_path = QPainterPath()
+        self.monitor_geometry = None
+        self.layouts = 0
+        self.frame_rect = None
+        self.position = (0, 0)
+        self.excluded_from_capture = self.exclude_from_capture()
+        self.set_area(monitor_index, capture_area, force=True)
+
+    def exclude_from_capture(self):
+        """asks windows to leave this window out of screen captures, false if it cant"""
+        if sys.platform != "win32":
+            return False
+        try:
+            import ctypes
+
+            return bool(
+                ctypes.windll.user32.SetWindowDisplayAffinity(
+                    int(self.winId()), WDA_EXCLUDEFROMCAPTURE
+                )
+            )
+        except (AttributeError, OSError) as e:
+            print(f"Error while excluding window from capture: {e}")
+            return False
+
+    def update_frame_rect(self):
+        """
+        window rect relative to the capture area while it is shown and still shows up
+        in captures, read by the capture thread so it never calls into qt
+        """
+        if self.excluded_from_capture or not self.isVisible():
+            self.frame_rect = None
+            return
+        self.frame_rect = (
+            self.position[0] - self.capture_area[0],
+            self.position[1] - self.capture_area[1],
+            self.width(),
+            self.height(),
+        )
+
+    def showEvent(self, event):
+        """starts masking the window in captured frames"""
+        super().showEvent(event)
+        self.update_frame_rect()
+
+    def hideEvent(self, event):
+        """stops masking the window in captured frames"""
+        super().hideEvent(event)
+        self.update_frame_rect()
 
     def paintEvent(self, event):
-        """Paints the translated window relative to amount of text and size of capture area"""
+        """draws the background and the text path laid out in relayout"""
         painter = QPainter(self)
         painter.setRenderHint(QPainter.Antialiasing)
         painter.setPen(QColor(255, 255, 255))
-        painter.setBrush(
-            QColor(
-                random.randint(0, 255),
-                random.randint(0, 255),
-                random.randint(0, 255),
-                255,
-            )
-        )
+        painter.setBrush(self.background_color)
         painter.drawRect(self.rect())
 
-        font = painter.font()
-        font.setPointSize(20)
-        font.setBold(True)
-        painter.setFont(font)
-
-        padding_top = 10
-        padding_left_right = 10
-        bounding_rect = QRect(0, 0, self.width() - 2 * padding_left_right, self.height())
+        # Draw outline
+        painter.setPen(self.outline_pen)
+        painter.setBrush(Qt.NoBrush)
+        painter.drawPath(self.text_path)
 
-        # Calculates the horizontal center
-        font_metrics = QFontMetrics(font)
-        text_rect = font_metrics.boundingRect(bounding_rect, Qt.TextWordWrap, self.text)
-        x_center = padding_left_right + (bounding_rect.width() - text_rect.width()) // 2
+        # Draw text with the fill color
+        painter.setPen(Qt.NoPen)
+        painter.setBrush(QColor(255, 255, 255))
+        painter.drawPath(self.text_path)
 
-        # Wrap the text into lines based on the available width
+    def wrap_lines(self, font_metrics, width):
+        """Wrap the text into lines based on the available width"""
         text_lines = []
-        words = self.text.split(' ')
+        words = self.text.split(" ")
         line = words[0]
         for word in words[1:]:
-            new_line = line + ' ' + word
-            if font_metrics.width(new_line) > bounding_rect.width():
+            new_line = line + " " + word
+            if font_metrics.horizontalAdvance(new_line) > width:
                 text_lines.append(line)
                 line = word
             else:
                 line = new_line
         text_lines.append(line)
-
-        text_path = QPainterPath()
-        current_y = font_metrics.capHeight() + padding_top
-        for line in text_lines:
-            text_path.addText(x_center, current_y, font, line)
+        return text_lines
+
+    def relayout(self):
+        """
+        wraps the text to the capture area width, builds the glyph path paintEvent
+        draws and resizes and centers the window around it
+        """
+        self.layouts += 1
+        font_metrics = QFontMetrics(self.text_font)
+        width = max(self.capture_area[2] - 2 * self.padding_left_right, 1)
+        self.text_lines = self.wrap_lines(font_metrics, width)
+
+        self.text_path = QPainterPath()
+        current_y = font_metrics.capHeight() + self.padding_top
+        for line in self.text_lines:
+            self.text_path.addText(self.padding_left_right, current_y, self.text_font, line)
             current_y += font_metrics.lineSpacing()
 
-        # Draw outline
-        painter.setPen(QPen(QColor(0, 0, 0), 3, Qt.SolidLine, Qt.RoundCap, Qt.RoundJoin))
-        painter.setBrush(Qt.NoBrush)
-        painter.drawPath(text_path)
-
-        # Draw text with the fill color
-        painter.setPen(Qt.NoPen)
-        painter.setBrush(QColor(255, 255, 255))
-        painter.drawPath(text_path)
-
-        # Resize the window based on text and capture area width and height
-        min_width, min_height = 50, 20
-        new_width = max(text_rect.width() + 2 * padding_left_right, min_width)
-        new_height = max(text_rect.height() + padding_top, min_height)
-        self.resize(new_width, new_height)
+        text_width = max(font_metrics.horizontalAdvance(line) for line in self.text_lines)
+        text_height = font_metrics.lineSpacing() * len(self.text_lines)
+        self.resize(
+            max(text_width + 2 * self.padding_left_right, self.min_width),
+            max(text_height + self.padding_top, self.min_height),
+        )
         self.update_position()
+        self.update()
 
-
-
-
+    def set_area(self, monitor_index, capture_area, force=False):
+        """moves the window to a new capture area, nothing happens if it is the same"""
+        if not force and (monitor_index, capture_area) == (
+            self.monitor_index,
+            self.capture_area,
+        ):
+            return
+        self.monitor_index = monitor_index
+        self.capture_area = capture_area
+        # monitor_index is the 1 based mss index, qt counts screens from 0
+        screens = QApplication.screens()
+        self.monitor_geometry = None
+        if 1 <= monitor_index <= len(screens):
+            self.monitor_geometry = screens[monitor_index - 1].geometry()
+        self.relayout()
 
     def update_position(self):
-        """Calculate the x and y coordinates relative to capture area"""
+        """
+        Calculate the x and y coordinates relative to capture area, centered on it
+        when the window is left out of captures and outside of it otherwise
+        """
         x = self.capture_area[0] + (self.capture_area[2] - self.width()) // 2
         y = self.capture_area[1] + (self.capture_area[3] - self.height()) // 2
+        if not self.excluded_from_capture:
+            y = self.outside_y(y)
+        self.position = (x, y)
         self.move(x, y)
+        self.update_frame_rect()
+
+    def outside_y(self, centered_y):
+        """
+        y right below the capture area, or right above it when the monitor has no
+        room below, centered if neither fits and the capture thread has to mask it
+        """
+        below = self.capture_area[1] + self.capture_area[3]
+        above = self.capture_area[1] - self.height()
+        if self.monitor_geometry is None:
+            return below
+        if below + self.height() <= self.monitor_geometry.y() + self.monitor_geometry.height():
+            return below
+        if above >= self.monitor_geometry.y():
+            return above
+        return centered_y
 
     def update_text(self, new_text):
-        """update the text to the window and draw it"""
+        """update the text to the window and draw it, the same text is left alone"""
+        if new_text == self.text:
+            return
         self.text = new_text
-        self.update()
+        self.relayout()
@@ -0,0 +1,138 @@
+"""translation batcher class"""
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from components.translation_cache import normalize_source
+
+
+class TranslationBatcher:
+    """
+    Collects texts to translate for a short window and sends each target language
+    as one request through TextProcessor.translate_batch. The same text asked for
+    twice in a window is only sent once. Every caller gets its own future chained to
+    the shared one of its text, cancelling it only drops the text from the batch
+    once no other caller still wants it
+    """
+
+    def __init__(self, text_processor, window=0.05, workers=2):
+        """init with the text processor, the collection window in seconds and senders"""
+        self.text_processor = text_processor
+        self.window = window
+        self.executor = ThreadPoolExecutor(
+            max_workers=workers, thread_name_prefix="translation"
+        )
+        self.lock = threading.Lock()
+        self.pending = {}
+        self.callers = {}
+        self.timer = None
+        self.stopped = False
+        self.batches = 0
+        self.segments = 0
+        self.duplicates = 0
+
+    def submit(self, text, target_language):
+        """returns a future for the translation of text, sent with the next batch"""
+        key = (normalize_source(text), target_language)
+        caller = Future()
+        with self.lock:
+            if self.stopped:
+                raise RuntimeError("cannot submit after stop")
+            shared = self.pending.get(key)
+            if shared is not None and not shared.cancelled():
+                self.duplicates += 1
+                self.callers[shared].append(caller)
+            else:
+                shared = Future()
+                self.pending[key] = shared
+                self.callers[shared] = [caller]
+                if self.timer is None:
+                    self.timer = threading.Timer(self.window, self.flush)
+                    self.timer.daemon = True
+                    self.timer.start()
+        # the shared future is still pending here, neither callback runs right away
+        shared.add_done_callback(lambda done: self.deliver(done, caller))
+        caller.add_done_callback(lambda done: self.release(shared, done))
+        return caller
+
+    def deliver(self, shared, caller):
+        """hands the result of the shared future to one caller"""
+        with self.lock:
+            self.callers.pop(shared, None)
+        if caller.done():
+            return
+        if shared.cancelled():
+            caller.cancel()
+        elif shared.exception() is not None:
+            caller.set_exception(shared.exception())
+        else:
+            caller.set_result(shared.result())
+
+    def release(self, shared, caller):
+        """a caller was cancelled, the shared future goes too once nobody wants it"""
+        if not caller.cancelled():
+            return
+        with self.lock:
+            callers = self.callers.get(shared, [])
+            wanted = any(not other.cancelled() for other in callers)
+        if not wanted:
+            shared.cancel()
+
+    def flush(self):
+        """sends everything collected so far, one batch per target language"""
+        with self.lock:
+            pending, self.pending = self.pending, {}
+            self.timer = None
+            if self.stopped:
+                return
+        batches = {}
+        for (text, target_language), future in pending.items():
+            if not future.cancelled():
+                batches.setdefault(target_language, []).append((text, future))
+        for target_language, items in batches.items():
+            self.executor.submit(self.send, items, target_language)
+
+    def send(self, items, target_language):
+        """
+        translates one batch and hands every result to its future, texts cancelled
+        while the batch waited for a sender are left out
+        """
+        items = [item for item in items if item[1].set_running_or_notify_cancel()]
+        if not items:
+            return
+        with self.lock:
+            # callers cant be cancelled any more once their text is on its way
+            for _, future in items:
+                for caller in self.callers.get(future, []):
+                    caller.set_running_or_notify_cancel()
+        with self.lock:
+            self.batches += 1
+            self.segments += len(items)
+        texts = [text for text, _ in items]
+        try:
+            results = self.text_processor.translate_batch(texts, target_language)
+        except Exception as e:
+            for _, future in items:
+                future.set_exception(e)
+            return
+        for (_, future), result in zip(items, results):
+            future.set_result(result)
+
+    def stats(self):
+        """batches sent, segments in them and duplicate requests folded into one"""
+        with self.lock:
+            return {
+                "batches": self.batches,
+                "segments": self.segments,
+                "duplicates": self.duplicates,
+            }
+
+    def stop(self):
+        """cancels everything not sent yet and stops the senders"""
+        with self.lock:
+            self.stopped = True
+            pending, self.pending = self.pending, {}
+            if self.timer is not None:
+                self.timer.cancel()
+                self.timer = None
+        for future in pending.values():
+            future.cancel()
+        self.executor.shutdown(wait=False, cancel_futures=True)
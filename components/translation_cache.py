@@ -0,0 +1,123 @@
+"""translation cache class"""
+import os
+import sqlite3
+import threading
+import unicodedata
+from collections import OrderedDict
+
+TRANSLATION_CACHE_PATH = os.path.join(
+    os.path.expanduser("~"), ".livescreentranslator", "translations.sqlite3"
+)
+
+
+def normalize_source(text):
+    """cache key form of the source text, unicode nfc and single spaces"""
+    return unicodedata.normalize("NFC", " ".join(text.split()))
+
+
+class TranslationCache:
+    """
+    Caches translations by (source text, target language) so repeated dialogue and
+    subtitles skip the network. Keeps an lru bounded dict in memory and optionally
+    an sqlite file that survives restarts
+    """
+
+    def __init__(self, maxsize=2048, path=None):
+        """init with memory bound and optional sqlite path, None keeps it in memory only"""
+        self.maxsize = maxsize
+        self.entries = OrderedDict()
+        self.lock = threading.Lock()
+        self.connection = None
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        if path:
+            self.open_disk(path)
+
+    def open_disk(self, path):
+        """opens or creates the sqlite store, the cache still works without it"""
+        try:
+            directory = os.path.dirname(path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            self.connection = sqlite3.connect(path, check_same_thread=False)
+            self.connection.execute(
+                "CREATE TABLE IF NOT EXISTS translations ("
+                "source TEXT NOT NULL, target TEXT NOT NULL, translated TEXT NOT NULL, "
+                "PRIMARY KEY (source, target))"
+            )
+            self.connection.commit()
+        except (OSError, sqlite3.Error) as e:
+            print(f"Error while opening translation cache: {e}")
+            self.connection = None
+
+    def get(self, text, target_language):
+        """returns the cached translation or None"""
+        key = (normalize_source(text), target_language)
+        with self.lock:
+            translated = self.entries.get(key)
+            if translated is not None:
+                self.entries.move_to_end(key)
+                self.hits += 1
+                return translated
+            translated = self.load(key)
+            if translated is not None:
+                self.remember(key, translated)
+                self.hits += 1
+                self.disk_hits += 1
+                return translated
+            self.misses += 1
+            return None
+
+    def put(self, text, target_language, translated):
+        """stores a translation in memory and on disk"""
+        key = (normalize_source(text), target_language)
+        with self.lock:
+            self.remember(key, translated)
+            if self.connection is not None:
+                try:
+                    self.connection.execute(
+                        "INSERT OR REPLACE INTO translations VALUES (?, ?, ?)",
+                        (key[0], key[1], translated),
+                    )
+                    self.connection.commit()
+                except sqlite3.Error as e:
+                    print(f"Error while saving translation: {e}")
+
+    def remember(self, key, translated):
+        """adds to the memory lru and evicts the least recently used entries"""
+        self.entries[key] = translated
+        self.entries.move_to_end(key)
+        while len(self.entries) > self.maxsize:
+            self.entries.popitem(last=False)
+
+    def load(self, key):
+        """looks the key up in the sqlite store"""
+        if self.connection is None:
+            return None
+        try:
+            row = self.connection.execute(
+                "SELECT translated FROM translations WHERE source = ? AND target = ?",
+                key,
+            ).fetchone()
+        except sqlite3.Error as e:
+            print(f"Error while reading translation cache: {e}")
+            return None
+        return row[0] if row else None
+
+    def stats(self):
+        """hits, hits that came from disk, misses and entries in memory"""
+        with self.lock:
+            return {
+                "hits": self.hits,
+                "disk_hits": self.disk_hits,
+                "misses": self.misses,
+                "size": len(self.entries),
+            }
+
+    def close(self):
+        """closes the sqlite store"""
+        with self.lock:
+            if self.connection is not None:
+                self.connection.close()
+                self.connection = None
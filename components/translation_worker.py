@@ -0,0 +1,95 @@
+"""translation worker class"""
+import threading
+from PyQt5.QtCore import QObject, pyqtSignal
+from components.translation_batcher import TranslationBatcher
+
+
+class TranslationWorker(QObject):
+    """
+    Runs translations through a batcher on a small thread pool so the blocking http
+    request never runs on the gui thread and texts that come in together share one
+    request. Requests are numbered and carry a key, the capture region they came
+    from. When a new one comes in every request of the same key still waiting in
+    the pool is cancelled, and a result older than the last one delivered for that
+    key is dropped. Results come back through the translated signal
+    """
+
+    translated = pyqtSignal(str, str, str, int)
+
+    def __init__(self, text_processor, workers=2, window=0.05):
+        """init with the text processor that does the translating and the batch window"""
+        super().__init__()
+        self.text_processor = text_processor
+        self.batcher = TranslationBatcher(text_processor, window=window, workers=workers)
+        self.lock = threading.Lock()
+        self.pending = {}
+        self.sequence = 0
+        self.last_emitted = {}
+        self.in_flight = {}
+        self.requests_cancelled = 0
+        self.results_stale = 0
+
+    def request(self, text, target_language, key=0):
+        """
+        queues text for translation and cancels older requests of the same key that
+        havent started
+        """
+        with self.lock:
+            self.sequence += 1
+            sequence = self.sequence
+            older = [
+                future
+                for pending_key, future in self.pending.values()
+                if pending_key == key
+            ]
+        # cancel runs the done callbacks right away, so not while holding the lock
+        cancelled = sum(future.cancel() for future in older)
+        future = self.batcher.submit(text, target_language)
+        with self.lock:
+            self.requests_cancelled += cancelled
+            self.pending[sequence] = (key, future)
+            self.in_flight[key] = (sequence, text)
+        future.add_done_callback(
+            lambda done: self.finish(sequence, text, target_language, done, key)
+        )
+        return sequence
+
+    def finish(self, sequence, text, target_language, future, key=0):
+        """
+        emits the translation unless it was cancelled or a newer one of the same key
+        got out first
+        """
+        with self.lock:
+            self.pending.pop(sequence, None)
+            if self.in_flight.get(key, (None,))[0] == sequence:
+                del self.in_flight[key]
+            if future.cancelled():
+                return
+            if sequence <= self.last_emitted.get(key, 0):
+                self.results_stale += 1
+                return
+            self.last_emitted[key] = sequence
+        try:
+            translated_text = future.result()
+        except Exception as e:
+            print(f"Error while translating: {e}")
+            return
+        self.translated.emit(text, translated_text, target_language, key)
+
+    def in_flight_text(self, key=0):
+        """text of the newest request of the key that hasnt finished, None if there is none"""
+        with self.lock:
+            return self.in_flight.get(key, (None, None))[1]
+
+    def stats(self):
+        """requests made, cancelled before they ran and results dropped as stale"""
+        with self.lock:
+            return {
+                "requests": self.sequence,
+                "cancelled": self.requests_cancelled,
+                "stale": self.results_stale,
+            }
+
+    def stop(self):
+        """cancels everything pending and stops the pool"""
+        self.batcher.stop()
@@ -0,0 +1,89 @@
+"""tts backend classes"""
+import io
+import shutil
+import subprocess
+
+GTTS = "gtts"
+ESPEAK = "espeak"
+
+
+class TTSBackend:
+    """Interface every text to speech backend implements"""
+
+    name = None
+    # file extension of the audio synthesize returns
+    extension = None
+
+    def synthesize(self, text, language_code):
+        """returns the spoken text as encoded audio bytes"""
+        raise NotImplementedError
+
+
+class GTTSBackend(TTSBackend):
+    """Google translate text to speech through gTTS, needs the network, returns mp3"""
+
+    name = GTTS
+    extension = "mp3"
+
+    def synthesize(self, text, language_code):
+        """asks google for the mp3 and collects it in memory"""
+        from gtts import gTTS
+
+        buffer = io.BytesIO()
+        gTTS(text=text, lang=language_code).write_to_fp(buffer)
+        return buffer.getvalue()
+
+
+class ESpeakBackend(TTSBackend):
+    """
+    Offline speech with the espeak-ng or espeak binary, the wav comes back on
+    stdout so nothing is written to disk
+    """
+
+    name = ESPEAK
+    extension = "wav"
+
+    def __init__(self):
+        """finds the espeak binary"""
+        self.command = shutil.which("espeak-ng") or shutil.which("espeak")
+        if self.command is None:
+            raise RuntimeError("espeak-ng or espeak not found")
+
+    def synthesize(self, text, language_code):
+        """runs espeak with the voice for the language, zh-cn uses the zh voice"""
+        voice = language_code.split("-")[0]
+        result = subprocess.run(
+            [self.command, "-v", voice, "--stdout", text],
+            capture_output=True,
+            check=True,
+        )
+        return result.stdout
+
+
+TTS_BACKENDS = {
+    GTTS: GTTSBackend,
+    ESPEAK: ESpeakBackend,
+}
+
+# names shown in the voice selection
+TTS_BACKEND_NAMES = {
+    GTTS: "Google",
+    ESPEAK: "eSpeak (offline)",
+}
+
+
+def available_tts_backends():
+    """names of the backends that can run here, gtts first"""
+    names = [GTTS]
+    if shutil.which("espeak-ng") or shutil.which("espeak"):
+        names.append(ESPEAK)
+    return names
+
+
+def create_tts_backend(name=GTTS):
+    """creates the named backend, falls back to gtts if it cant be loaded"""
+    try:
+        return TTS_BACKENDS[name]()
+    except RuntimeError as e:
+        print(f"Error while loading TTS backend {name}: {e}")
+        return GTTSBackend()
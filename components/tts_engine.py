@@ -0,0 +1,114 @@
+"""tts engine class"""
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from components.audio_cache import AudioCache, audio_key
+from components.tts_backends import GTTS, create_tts_backend
+
+
+class TTSEngine:
+    """
+    Synthesizes speech on a background thread so the gui never waits for the
+    backend or the disk. prepare returns a future for the audio bytes of the clip
+    right away, clips already in memory resolve immediately and a clip asked for
+    twice while it is being made is only synthesized once. Every caller gets its
+    own future chained to the shared synthesis, cancelling it only stops the
+    synthesis once no other caller still wants the clip
+    """
+
+    def __init__(self, cache_path=None, backend=GTTS, max_bytes=64 * 1024 * 1024, workers=1):
+        """init with the optional audio cache directory, the backend name and cache size"""
+        self.backend = create_tts_backend(backend)
+        self.cache = AudioCache(cache_path, max_bytes)
+        self.executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="tts")
+        self.lock = threading.Lock()
+        self.pending = {}
+        self.callers = {}
+        self.synthesized = 0
+
+    def prepare(self, text, language_code):
+        """future for the audio bytes of the spoken text, synthesis starts in the background"""
+        key = audio_key(text, language_code, self.backend.name)
+        data = self.cache.lookup(key)
+        if data is not None:
+            future = Future()
+            future.set_result(data)
+            return future
+        caller = Future()
+        with self.lock:
+            shared = self.pending.get(key)
+            if shared is not None and not shared.cancelled():
+                self.callers[shared].append(caller)
+                if shared.running():
+                    caller.set_running_or_notify_cancel()
+            else:
+                shared = self.executor.submit(
+                    self.synthesize, self.backend, key, text, language_code
+                )
+                self.pending[key] = shared
+                self.callers[shared] = [caller]
+        # a finished future runs the callback right away, so not while holding the lock
+        shared.add_done_callback(lambda done: self.forget(key, done))
+        shared.add_done_callback(lambda done: self.deliver(done, caller))
+        caller.add_done_callback(lambda done: self.release(shared, done))
+        return caller
+
+    def synthesize(self, backend, key, text, language_code):
+        """reads the clip from disk or runs the backend and stores it, runs on the engine thread"""
+        with self.lock:
+            # callers cant be cancelled any more once their clip is being made
+            for caller in self.callers.get(self.pending.get(key), []):
+                if not caller.running():
+                    caller.set_running_or_notify_cancel()
+        data = self.cache.get(key)
+        if data is not None:
+            return data
+        data = backend.synthesize(text, language_code)
+        with self.lock:
+            self.synthesized += 1
+        self.cache.put(key, data, backend.extension)
+        return data
+
+    def set_backend(self, name):
+        """switches the backend, clips already asked for finish with the old one"""
+        self.backend = create_tts_backend(name)
+        return self.backend.name
+
+    def forget(self, key, shared):
+        """done synthesizing, the next prepare goes through the cache"""
+        with self.lock:
+            if self.pending.get(key) is shared:
+                del self.pending[key]
+
+    def deliver(self, shared, caller):
+        """hands the result of the shared synthesis to one caller"""
+        with self.lock:
+            self.callers.pop(shared, None)
+        if caller.done():
+            return
+        if shared.cancelled():
+            caller.cancel()
+        elif shared.exception() is not None:
+            caller.set_exception(shared.exception())
+        else:
+            caller.set_result(shared.result())
+
+    def release(self, shared, caller):
+        """a caller was cancelled, the synthesis goes too once nobody wants it"""
+        if not caller.cancelled():
+            return
+        with self.lock:
+            callers = self.callers.get(shared, [])
+            wanted = any(not other.cancelled() for other in callers)
+        if not wanted:
+            shared.cancel()
+
+    def stats(self):
+        """clips synthesized plus the audio cache stats"""
+        with self.lock:
+            stats = {"synthesized": self.synthesized}
+        stats.update(self.cache.stats())
+        return stats
+
+    def stop(self):
+        """drops clips not started yet and stops the engine thread"""
+        self.executor.shutdown(wait=False, cancel_futures=True)
@@ -1,16 +1,38 @@
 """main.py intializes qapplicaiton and runs my main window"""
+import time
+
+START_TIME = time.perf_counter()
 import sys
 import os
+import multiprocessing
 from PyQt5.QtWidgets import QApplication, QMessageBox
-from PyQt5.QtCore import Qt
+from PyQt5.QtCore import Qt, QTimer
+
+QT_IMPORTED = time.perf_counter()
 from components.main_window import MainWindow
 
+WINDOW_IMPORTED = time.perf_counter()
+
 def check_tesseract_installation():
     tesseract_path = "C:\\Program Files\\Tesseract-OCR\\tesseract.exe"
     if not os.path.exists(tesseract_path):
         return False
     return True
 
+def report_startup_times(window_started):
+    """prints how long the imports, building the window and the first paint took"""
+    painted = time.perf_counter()
+    stages = [
+        ("Import PyQt5", START_TIME, QT_IMPORTED),
+        ("Import main window and components", QT_IMPORTED, WINDOW_IMPORTED),
+        ("Build and paint main window", window_started, painted),
+        ("Start to first paint", START_TIME, painted),
+    ]
+    for name, start, end in stages:
+        print(f"{name}: {(end - start) * 1000:.0f} ms")
+    lazy = [m for m in ("nltk", "sklearn", "googletrans", "gtts") if m in sys.modules]
+    print(f"Heavy modules loaded at first paint: {', '.join(lazy) or 'none'}")
+
 def show_error_message():
     msg = QMessageBox()
     msg.setIcon(QMessageBox.Critical)
@@ -20,11 +42,21 @@ def show_error_message():
     msg.exec_()
 
 if __name__ == "__main__":
+    # ocr pool workers are processes, needed for the pyinstaller build
+    multiprocessing.freeze_support()
+    if "--setup" in sys.argv:
+        from components.text_processor import download_corpora
+
+        download_corpora()
+        sys.exit(0)
     app = QApplication(sys.argv)
 
     if check_tesseract_installation():
+        window_started = time.perf_counter()
         main_window = MainWindow()
         main_window.show()
+        if "--startup-times" in sys.argv:
+            QTimer.singleShot(0, lambda: report_startup_times(window_started))
         sys.exit(app.exec_())
     else:
         show_error_message()
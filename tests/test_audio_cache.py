@@ -0,0 +1,83 @@
+import os
+from components.audio_cache import AudioCache, audio_key
+
+
+def test_audio_key():
+    assert audio_key("Hello  world", "en", "gtts") == audio_key("Hello world", "en", "gtts")
+    assert audio_key("Hello world", "en", "gtts") != audio_key("Hello world", "de", "gtts")
+    assert audio_key("Hello world", "en", "gtts") != audio_key("Hello world", "en", "espeak")
+
+
+def test_memory_only():
+    cache = AudioCache()
+    assert cache.get("clip") is None
+
+    cache.put("clip", b"audio", "mp3")
+    assert cache.lookup("clip") == b"audio"
+    assert cache.get("clip") == b"audio"
+    assert cache.stats() == {
+        "hits": 2,
+        "disk_hits": 0,
+        "misses": 1,
+        "evictions": 0,
+        "entries": 1,
+        "bytes": 5,
+        "disk_entries": 0,
+        "disk_bytes": 0,
+    }
+
+
+def test_memory_lru_is_bounded():
+    cache = AudioCache(memory_bytes=10)
+    cache.put("first", b"12345", "mp3")
+    cache.put("second", b"12345", "mp3")
+    cache.lookup("first")
+
+    cache.put("third", b"12345", "mp3")
+    assert cache.lookup("second") is None
+    assert cache.lookup("first") == b"12345"
+    assert cache.stats()["bytes"] == 10
+
+
+def test_put_writes_through_to_disk(tmp_path):
+    cache = AudioCache(str(tmp_path))
+    cache.put("clip", b"audio", "mp3")
+
+    with open(os.path.join(str(tmp_path), "clip.mp3"), "rb") as clip:
+        assert clip.read() == b"audio"
+    assert cache.stats()["disk_bytes"] == 5
+
+
+def test_evicts_least_recently_used_files(tmp_path):
+    cache = AudioCache(str(tmp_path), max_bytes=10)
+    cache.put("first", b"12345", "mp3")
+    cache.put("second", b"12345", "mp3")
+    cache.clips.clear()
+    cache.get("first")
+
+    cache.put("third", b"12345", "mp3")
+    assert not os.path.exists(os.path.join(str(tmp_path), "second.mp3"))
+    assert os.path.exists(os.path.join(str(tmp_path), "first.mp3"))
+    assert cache.stats()["evictions"] == 1
+
+
+def test_load_reads_existing_clips_from_disk(tmp_path):
+    AudioCache(str(tmp_path)).put("clip", b"audio", "wav")
+    (tmp_path / "partial.mp3.tmp").write_bytes(b"half")
+
+    cache = AudioCache(str(tmp_path))
+    assert cache.lookup("clip") is None
+    assert cache.get("clip") == b"audio"
+    assert cache.lookup("clip") == b"audio"
+    assert cache.stats()["disk_hits"] == 1
+    assert cache.stats()["disk_entries"] == 1
+
+
+def test_get_forgets_deleted_file(tmp_path):
+    cache = AudioCache(str(tmp_path))
+    cache.put("clip", b"audio", "mp3")
+    cache.clips.clear()
+    os.remove(os.path.join(str(tmp_path), "clip.mp3"))
+
+    assert cache.get("clip") is None
+    assert cache.stats()["disk_entries"] == 0
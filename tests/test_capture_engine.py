@@ -0,0 +1,124 @@
+import numpy as np
+import pytest
+from PIL import Image
+from mss.exception import ScreenShotError
+from components.capture_engine import CaptureEngine, clip_region, mask_rect
+
+
+class MockScreenshot:
+    def __init__(self, image):
+        self.width = image.width
+        self.height = image.height
+        self.rgb = image.tobytes()
+        self.raw = bytearray(image.convert("RGBA").tobytes())
+
+
+class MockSCT:
+    instances = 0
+    fail_next = False
+
+    def __init__(self):
+        MockSCT.instances += 1
+        self.monitors = [
+            {"left": 0, "top": 0, "width": 3840, "height": 1080},
+            {"left": 0, "top": 0, "width": 1920, "height": 1080},
+        ]
+        self.grabs = []
+        self.closed = False
+
+    def grab(self, bbox):
+        if MockSCT.fail_next:
+            MockSCT.fail_next = False
+            raise ScreenShotError("monitor went away")
+        self.grabs.append(bbox)
+        left, top, right, bottom = bbox
+        return MockScreenshot(Image.new("RGB", (right - left, bottom - top), "blue"))
+
+    def close(self):
+        self.closed = True
+
+
+@pytest.fixture
+def mock_mss(monkeypatch):
+    MockSCT.instances = 0
+    MockSCT.fail_next = False
+    monkeypatch.setattr("components.capture_engine.mss", MockSCT)
+    return MockSCT
+
+
+def test_clip_region():
+    monitor = {"left": 1800, "top": 1000, "width": 200, "height": 200}
+    monitor_geometry = {"left": 0, "top": 0, "width": 1920, "height": 1080}
+    assert clip_region(monitor, monitor_geometry) == (1800, 1000, 1920, 1080)
+
+
+def test_grab_reuses_handle(mock_mss):
+    monitor = {"left": 100, "top": 100, "width": 200, "height": 150}
+    engine = CaptureEngine(monitor, 1)
+
+    for _ in range(5):
+        image = engine.grab()
+
+    assert image.size == (200, 150)
+    assert mock_mss.instances == 1
+    assert engine.rebuilds == 1
+    assert engine.sct.grabs == [(100, 100, 300, 250)] * 5
+
+
+def test_invalidate_rebuilds(mock_mss):
+    engine = CaptureEngine({"left": 0, "top": 0, "width": 10, "height": 10}, 1)
+    engine.grab()
+    old_sct = engine.sct
+
+    engine.invalidate()
+    engine.grab()
+    assert engine.rebuilds == 2
+    assert old_sct.closed
+
+
+def test_grab_recovers_from_screenshot_error(mock_mss):
+    engine = CaptureEngine({"left": 0, "top": 0, "width": 10, "height": 10}, 1)
+    engine.grab()
+
+    mock_mss.fail_next = True
+    assert engine.grab().size == (10, 10)
+    assert engine.rebuilds == 2
+
+
+def test_context_manager_closes(mock_mss):
+    with CaptureEngine({"left": 0, "top": 0, "width": 10, "height": 10}, 1) as engine:
+        engine.grab()
+        sct = engine.sct
+    assert sct.closed
+    assert engine.sct is None
+
+
+def test_grab_gray_reuses_buffers(mock_mss):
+    engine = CaptureEngine({"left": 0, "top": 0, "width": 20, "height": 10}, 1, buffers=2)
+
+    first = engine.grab_gray()
+    second = engine.grab_gray()
+    third = engine.grab_gray()
+
+    assert first.shape == (10, 20)
+    assert first.dtype.name == "uint8"
+    assert first is not second
+    assert third is first
+    assert engine.frame_buffers.allocations == 1
+
+
+def test_mask_rect():
+    frame = np.full((10, 20), 200, dtype=np.uint8)
+    frame[0, 0] = 0
+    masked = mask_rect(frame, (15, 5, 10, 10))
+    assert masked is frame
+    assert (frame[5:, 15:] == 200).all()
+
+    frame[5:, 15:] = 30
+    mask_rect(frame, (15, 5, 10, 10))
+    assert (frame[5:, 15:] == 200).all()
+    assert frame[0, 0] == 0
+
+    mask_rect(frame, (30, 0, 5, 5))
+    mask_rect(frame, (-10, -10, 5, 5))
+    assert frame[0, 0] == 0
@@ -0,0 +1,36 @@
+import time
+from components.capture_scheduler import CaptureScheduler
+
+
+def test_backoff_and_snap_back():
+    scheduler = CaptureScheduler(target_fps=10, idle_fps=1, backoff=2)
+    assert scheduler.record(True) == 0.1
+    assert scheduler.record(False) == 0.2
+    assert scheduler.record(False) == 0.4
+    for _ in range(10):
+        interval = scheduler.record(False)
+    assert interval == 1.0
+    assert scheduler.record(True) == 0.1
+
+
+def test_busy_holds_interval():
+    scheduler = CaptureScheduler(target_fps=10, idle_fps=1, busy_interval=0.5)
+    assert scheduler.record(True, busy=True) == 0.5
+    assert scheduler.record(True) == 0.1
+    stats = scheduler.stats()
+    assert stats["ticks"] == 2
+    assert stats["active"] == 2
+    assert stats["busy"] == 1
+
+
+def test_remaining_counts_down_to_next_frame():
+    scheduler = CaptureScheduler(target_fps=20)
+    assert scheduler.remaining() == 0.0
+    scheduler.record(True)
+    assert 0 < scheduler.remaining() <= 0.05
+    time.sleep(0.06)
+    assert scheduler.remaining() == 0.0
+
+    scheduler.record(False)
+    scheduler.reset()
+    assert scheduler.remaining() == 0.0
@@ -0,0 +1,81 @@
+import numpy as np
+from PIL import Image
+from components.change_detector import ChangeDetector, downsample, changed_fraction
+
+
+def frame_with_box(x, y, size, width=200, height=100):
+    array = np.full((height, width), 255, dtype=np.uint8)
+    array[y:y + size, x:x + size] = 0
+    return Image.fromarray(array, "L")
+
+
+def test_downsample():
+    image = Image.new("L", (40, 20), color=100)
+    assert downsample(image, factor=4).shape == (5, 10)
+
+    rgb = np.zeros((8, 8, 3), dtype=np.uint8)
+    assert downsample(rgb, factor=2).shape == (4, 4)
+
+
+def test_changed_fraction():
+    previous = np.zeros((10, 10), dtype=np.float32)
+    current = previous.copy()
+    current[:5] = 255
+    assert changed_fraction(previous, current, 24) == 0.5
+    assert changed_fraction(None, current, 24) == 1.0
+
+
+def test_first_frame_forwarded():
+    detector = ChangeDetector()
+    assert detector.check(frame_with_box(10, 10, 20))
+    assert detector.stats() == {"forwarded": 1, "skipped": 0}
+
+
+def test_identical_frames_skipped():
+    detector = ChangeDetector()
+    frame = frame_with_box(10, 10, 20)
+    detector.check(frame)
+    for _ in range(5):
+        assert not detector.check(frame)
+    assert detector.stats() == {"forwarded": 1, "skipped": 5}
+
+
+def test_small_change_below_threshold():
+    detector = ChangeDetector()
+    detector.check(frame_with_box(10, 10, 20))
+    caret = np.asarray(frame_with_box(10, 10, 20)).copy()
+    caret[50:58, 150:152] = 0
+    assert not detector.check(Image.fromarray(caret, "L"))
+
+
+def test_large_change_forwarded_after_settle():
+    detector = ChangeDetector()
+    detector.check(frame_with_box(10, 10, 20))
+    new_frame = frame_with_box(100, 40, 40)
+    assert not detector.check(frame_with_box(10, 10, 20))
+    assert detector.check(new_frame)
+    assert not detector.check(new_frame)
+
+
+def test_hysteresis_holds_during_animation():
+    detector = ChangeDetector(max_hold_frames=3)
+    detector.check(frame_with_box(0, 0, 30))
+    results = [detector.check(frame_with_box(x, 0, 30)) for x in (40, 80, 120, 160)]
+    assert results == [False, False, True, False]
+
+
+def test_reset():
+    detector = ChangeDetector()
+    detector.check(frame_with_box(0, 0, 30))
+    detector.reset()
+    assert detector.stats() == {"forwarded": 0, "skipped": 0}
+    assert detector.check(frame_with_box(0, 0, 30))
+
+
+def test_moving_tracks_frame_to_frame_change():
+    detector = ChangeDetector()
+    frame = np.zeros((64, 64), dtype=np.uint8)
+    detector.check(frame)
+    assert detector.moving
+    detector.check(frame)
+    assert not detector.moving
@@ -0,0 +1,76 @@
+import numpy as np
+from components.dedup import DedupHistory, ngram_signature
+
+
+def test_ngram_signature():
+    signature = ngram_signature("Hello world")
+    assert signature.shape == (1024,)
+    assert np.isclose(np.linalg.norm(signature), 1.0)
+    assert np.array_equal(signature, ngram_signature("  hello   WORLD "))
+    assert not ngram_signature("").any()
+
+
+def test_similarity():
+    history = DedupHistory()
+    assert history.similarity("anything") == 0.0
+
+    history.add("This is a test sentence with some common English stopwords")
+    assert history.similarity("This is a test sentence with some common English stopwords") > 0.99
+    assert history.similarity("Completely unrelated words here") < 0.3
+
+
+def test_is_duplicate_remembers_history():
+    history = DedupHistory(depth=3)
+    assert not history.is_duplicate("first line of dialogue")
+    assert not history.is_duplicate("the storm is getting worse tonight")
+    assert history.is_duplicate("first line of dialogue")
+    assert history.size == 2
+
+
+def test_depth_drops_oldest():
+    history = DedupHistory(depth=2)
+    history.add("alpha beta gamma")
+    history.add("delta epsilon zeta")
+    history.add("eta theta iota")
+    assert history.size == 2
+    assert not history.is_duplicate("alpha beta gamma")
+
+
+def test_clear():
+    history = DedupHistory()
+    history.add("some text")
+    history.clear()
+    assert not history.is_duplicate("some text")
+
+
+def test_stats():
+    history = DedupHistory()
+    history.is_duplicate("first line of dialogue")
+    history.is_duplicate("first line of dialogue")
+    history.is_duplicate("the storm is getting worse tonight")
+    assert history.stats() == {"checked": 3, "duplicates": 1}
+    history.clear()
+    assert history.stats() == {"checked": 0, "duplicates": 0}
+
+
+def test_match_returns_remembered_text():
+    history = DedupHistory(depth=5)
+    history.add("first line of dialogue")
+    history.add("the storm is getting worse tonight")
+    assert history.match("the storm is getting worse tonight!") == "the storm is getting worse tonight"
+    assert history.match("completely unrelated words here") is None
+    assert history.stats() == {"checked": 0, "duplicates": 0}
+
+
+def test_count():
+    history = DedupHistory(depth=5)
+    history.count(True)
+    history.count(False)
+    assert history.stats() == {"checked": 2, "duplicates": 1}
+
+
+def test_similar():
+    history = DedupHistory()
+    assert history.similar("first line of dialogue", "First line of  dialogue")
+    assert not history.similar("first line of dialogue", "the storm is getting worse")
+    assert not history.similar("first line of dialogue", None)
@@ -0,0 +1,43 @@
+import numpy as np
+from components.frame_buffers import FrameBuffers
+from components.preprocessing import bgra_to_gray
+
+
+class MockScreenshot:
+    def __init__(self, bgra):
+        self.height, self.width = bgra.shape[:2]
+        self.raw = bytearray(bgra.tobytes())
+
+
+def random_bgra(height, width):
+    rng = np.random.default_rng(1)
+    return rng.integers(0, 256, (height, width, 4), dtype=np.uint8)
+
+
+def test_convert_matches_bgra_to_gray():
+    bgra = random_bgra(6, 8)
+    buffers = FrameBuffers()
+    gray = buffers.convert(bgra)
+    assert np.array_equal(gray, bgra_to_gray(bgra.tobytes(), 8, 6))
+
+
+def test_ring_rotation():
+    buffers = FrameBuffers(count=3)
+    bgra = random_bgra(4, 4)
+    frames = [buffers.convert(bgra) for _ in range(4)]
+    assert frames[0] is frames[3]
+    assert len({id(frame) for frame in frames[:3]}) == 3
+    assert buffers.allocations == 1
+
+
+def test_size_change_reallocates():
+    buffers = FrameBuffers()
+    buffers.convert(random_bgra(4, 4))
+    assert buffers.convert(random_bgra(5, 7)).shape == (5, 7)
+    assert buffers.allocations == 2
+
+
+def test_convert_screenshot():
+    bgra = random_bgra(3, 5)
+    gray = FrameBuffers().convert_screenshot(MockScreenshot(bgra))
+    assert np.array_equal(gray, bgra_to_gray(bgra.tobytes(), 5, 3))
@@ -0,0 +1,122 @@
+import threading
+import time
+import pytest
+from components.frame_mailbox import RegionMailbox, KEEP_LATEST, DROP_OLDEST, BLOCK
+
+
+def drain(mailbox):
+    items = []
+    while not mailbox.empty():
+        items.append(mailbox.get())
+    return items
+
+
+def test_invalid_arguments():
+    with pytest.raises(ValueError):
+        RegionMailbox(maxsize=0)
+    with pytest.raises(ValueError):
+        RegionMailbox(policy="newest")
+
+
+def test_keep_latest():
+    mailbox = RegionMailbox(maxsize=2, policy=KEEP_LATEST)
+    for item in range(5):
+        assert mailbox.put(item)
+    assert drain(mailbox) == [4]
+    assert mailbox.stats() == {"puts": 5, "drops": 4, "depth": 0, "max_depth": 2}
+
+
+def test_drop_oldest():
+    mailbox = RegionMailbox(maxsize=2, policy=DROP_OLDEST)
+    for item in range(5):
+        mailbox.put(item)
+    assert drain(mailbox) == [3, 4]
+    assert mailbox.stats()["drops"] == 3
+
+
+def test_block_times_out():
+    mailbox = RegionMailbox(maxsize=1, policy=BLOCK)
+    assert mailbox.put(1)
+    assert not mailbox.put(2, timeout=0.05)
+    assert drain(mailbox) == [1]
+    assert mailbox.stats()["drops"] == 1
+
+
+def test_block_waits_for_consumer():
+    mailbox = RegionMailbox(maxsize=1, policy=BLOCK)
+    mailbox.put(1)
+
+    def consume():
+        time.sleep(0.05)
+        mailbox.get()
+
+    consumer = threading.Thread(target=consume)
+    consumer.start()
+    assert mailbox.put(2, timeout=2)
+    consumer.join()
+    assert drain(mailbox) == [2]
+    assert mailbox.stats()["drops"] == 0
+
+
+def test_get_timeout():
+    mailbox = RegionMailbox()
+    with pytest.raises(TimeoutError):
+        mailbox.get(timeout=0.01)
+
+
+def test_get_waits_for_put():
+    mailbox = RegionMailbox()
+    threading.Timer(0.05, mailbox.put, args=("frame",)).start()
+    assert mailbox.get(timeout=2) == "frame"
+
+
+def test_clear():
+    mailbox = RegionMailbox(maxsize=3, policy=DROP_OLDEST)
+    mailbox.put(1)
+    mailbox.put(2)
+    mailbox.clear()
+    assert mailbox.qsize() == 0
+    assert mailbox.stats()["drops"] == 0
+
+
+def test_region_mailbox_keeps_latest_per_region():
+    mailbox = RegionMailbox()
+    mailbox.put("a1", key="a")
+    mailbox.put("b1", key="b")
+    mailbox.put("a2", key="a")
+    assert mailbox.pending("a")
+    assert drain(mailbox) == ["a2", "b1"]
+    assert not mailbox.pending("a")
+    assert mailbox.stats() == {"puts": 3, "drops": 1, "depth": 0, "max_depth": 2}
+
+
+def test_region_mailbox_is_fair():
+    mailbox = RegionMailbox()
+    mailbox.put("busy1", key="busy")
+    mailbox.put("quiet1", key="quiet")
+    assert mailbox.get() == "busy1"
+    mailbox.put("busy2", key="busy")
+    assert mailbox.get() == "quiet1"
+    assert mailbox.get() == "busy2"
+
+
+def test_region_mailbox_get_timeout():
+    with pytest.raises(TimeoutError):
+        RegionMailbox().get(timeout=0.01)
+
+
+def test_region_mailbox_policy_is_per_region():
+    mailbox = RegionMailbox(maxsize=2, policy=DROP_OLDEST)
+    for item in range(3):
+        mailbox.put(f"a{item}", key="a")
+    mailbox.put("b0", key="b")
+    assert drain(mailbox) == ["a1", "b0", "a2"]
+    assert mailbox.stats()["drops"] == 1
+
+
+def test_region_mailbox_block_only_waits_for_full_region():
+    mailbox = RegionMailbox(maxsize=1, policy=BLOCK)
+    assert mailbox.put("a0", key="a")
+    assert mailbox.put("b0", key="b", timeout=0.05)
+    assert not mailbox.put("a1", key="a", timeout=0.05)
+    assert drain(mailbox) == ["a0", "b0"]
@@ -4,12 +4,18 @@ from PyQt5.QtCore import Qt, QPoint, QEvent
 from PyQt5.QtTest import QTest
 from PyQt5.QtGui import QMouseEvent
 from components.main_window import MainWindow,capture_screenshot
+from components.region_manager import RegionManager
+from components.speech_scheduler import DROP_STALE, LATEST_ONLY, STALE_SECONDS
+from components.tts_backends import available_tts_backends
 from PIL import Image
+import numpy as np
 from constants.languages_google import LANGUAGES_GOOGLE
 from constants.languages_ocr import LANGUAGES_OCR
 import unittest
 from unittest.mock import MagicMock, patch
+import json
 import threading
+from concurrent.futures import Future
 import time 
 from contextlib import contextmanager
 
@@ -63,7 +69,7 @@ def test_main_window_init(main_window):
     assert main_window.capture_area is None
     assert main_window.correct_capture_area is None
     assert main_window.monitor_index is None
-    assert main_window.translated_text_window is None
+    assert main_window.region_manager.snapshot() == []
     assert main_window.save_translated_text is False
     assert main_window.save_destination == ""
     assert main_window.previous_translated_text is None
@@ -95,6 +101,7 @@ def test_checkboxes(main_window):
 def test_pushbuttons(main_window):
     assert isinstance(main_window.select_area_button, QPushButton)
     assert isinstance(main_window.capture_button, QPushButton)
+    assert isinstance(main_window.add_area_button, QPushButton)
 
     assert main_window.capture_button.isEnabled() is False
 
@@ -158,8 +165,61 @@ def test_select_save_destination(main_window):
     with unittest.mock.patch("PyQt5.QtWidgets.QFileDialog.getSaveFileName", return_value=("test.txt", None)):
         main_window.select_save_destination(Qt.Checked)
         assert main_window.save_path == "test.txt"
+        assert main_window.transcript_writer.path == "test.txt"
     main_window.select_save_destination(Qt.Unchecked)
     assert main_window.save_path is None
+    assert main_window.transcript_writer is None
+
+def test_update_translation_writes_transcript(main_window, tmp_path):
+    path = tmp_path / "session.jsonl"
+    region = main_window.region_manager.add((0, 0, 300, 200), (0, 0, 300, 200), 0, "jpn")
+    with unittest.mock.patch("PyQt5.QtWidgets.QFileDialog.getSaveFileName", return_value=(str(path), None)):
+        main_window.save_checkbox.setChecked(True)
+    main_window.update_translation("konnichiwa", "hello", "en", region.region_id)
+    main_window.save_checkbox.setChecked(False)
+
+    record = json.loads(path.read_text(encoding="utf-8"))
+    assert (record["source"], record["translated"]) == ("konnichiwa", "hello")
+    assert (record["from"], record["to"], record["region"]) == ("jpn", "en", region.region_id)
+    main_window.clear_regions()
+
+def test_update_translation_speaks_with_capture_time(main_window):
+    region = main_window.region_manager.add((0, 0, 300, 200), (0, 0, 300, 200), 0, "jpn")
+    main_window.ocr_worker.captured_at[region.region_id] = 42.0
+    with patch.object(main_window.translation_worker, "request"):
+        main_window.update_ocr_result("konnichiwa", region.region_id)
+    main_window.voice_checkbox.setChecked(True)
+    main_window.update_translation_window = True
+    with patch.object(main_window.text_to_speech, "play_text_voice") as mock_play:
+        main_window.update_translation("konnichiwa", "hello", "en", region.region_id)
+    main_window.voice_checkbox.setChecked(False)
+    mock_play.assert_called_once_with("hello", "en", 42.0)
+    main_window.clear_regions()
+
+def test_set_speech_policy(main_window):
+    index = main_window.voice_policy_combo.findData(LATEST_ONLY)
+    main_window.voice_policy_combo.setCurrentIndex(index)
+    assert main_window.text_to_speech.scheduler.latest_only
+    main_window.voice_policy_combo.setCurrentIndex(main_window.voice_policy_combo.findData(DROP_STALE))
+    assert main_window.text_to_speech.scheduler.max_age == STALE_SECONDS
+
+def test_language_from_change_updates_single_region(main_window):
+    main_window.clear_regions()
+    region = main_window.region_manager.add((0, 0, 300, 200), (0, 0, 300, 200), 0, "eng")
+    main_window.language_from_combo.setCurrentIndex(main_window.language_from_combo.findData("jpn"))
+    assert region.language_code == "jpn"
+
+    other = main_window.region_manager.add((0, 300, 300, 400), (0, 300, 300, 100), 0, "jpn")
+    main_window.language_from_combo.setCurrentIndex(main_window.language_from_combo.findData("eng"))
+    assert (region.language_code, other.language_code) == ("jpn", "jpn")
+    main_window.clear_regions()
+
+def test_voice_backend_combo_lists_available_backends(main_window):
+    backends = [main_window.voice_backend_combo.itemData(i) for i in range(main_window.voice_backend_combo.count())]
+    assert backends == available_tts_backends()
+    with patch.object(main_window.text_to_speech, "set_backend") as mock_set_backend:
+        main_window.set_speech_backend(0)
+    mock_set_backend.assert_called_once_with(backends[0])
 
 def test_enable_capture_button(main_window):
     main_window.capture_button.setDisabled(True)
@@ -197,10 +257,94 @@ def test_update_capture_area(main_window):
 
     assert main_window.correct_capture_area == (10, 20, 100, 100)
     assert main_window.capture_area == (10, 20, 100, 100)
+    regions = main_window.region_manager.snapshot()
+    assert len(regions) == 1
+    assert regions[0].bbox == (10, 20, 110, 120)
+    assert main_window.add_area_button.isEnabled()
+
+    main_window.show_add_area_window()
+    main_window.transparent_window.close()
+    main_window.update_capture_area(start, end, geometry)
+    assert len(main_window.region_manager.snapshot()) == 2
     with patch.object(main_window, "enable_capture_button") as mock_enable_capture_button:
         main_window.update_capture_area(start, end, geometry)
         mock_enable_capture_button.assert_called_once()
 
+def test_handle_screen_change(main_window):
+    main_window.capture_engine = MagicMock()
+    main_window.handle_screen_change(None)
+    main_window.capture_engine.invalidate.assert_called_once()
+    main_window.capture_engine = None
+    main_window.handle_screen_change(None)
+
+def test_update_ocr_result_skips_duplicates(main_window):
+    main_window.clear_regions()
+    chat = main_window.region_manager.add((0, 0, 300, 200), (0, 0, 300, 200), 0, "eng")
+    subtitles = main_window.region_manager.add((0, 300, 300, 400), (0, 300, 300, 100), 0, "eng")
+    with patch.object(main_window.translation_worker.batcher, "submit", side_effect=lambda *args: Future()) as mock_submit:
+        main_window.update_ocr_result("The storm is getting worse tonight", chat.region_id)
+        main_window.update_ocr_result("The storm is getting worse tonight", chat.region_id)
+        main_window.update_ocr_result("The storm is getting worse tonight", subtitles.region_id)
+        main_window.update_ocr_result("We should head back to the village", chat.region_id)
+    assert mock_submit.call_count == 3
+    assert chat.source_history.stats() == {"checked": 3, "duplicates": 1}
+    assert subtitles.source_history.stats() == {"checked": 1, "duplicates": 0}
+    main_window.clear_regions()
+
+def test_update_ocr_result_shows_text_that_comes_back(main_window):
+    main_window.clear_regions()
+    main_window.update_translation_window = True
+    region = main_window.region_manager.add((0, 0, 300, 200), (0, 0, 300, 200), 0, "eng")
+    language_to = main_window.language_to_combo.currentData()
+    first, second = "The storm is getting worse tonight", "We should head back to the village"
+    cached = {first: "storm", second: "village"}
+    with patch.object(main_window.translation_worker.batcher, "submit", side_effect=lambda *args: Future()) as mock_submit, \
+            patch.object(main_window.text_processor.translation_cache, "get", side_effect=lambda text, lang: cached.get(text)):
+        main_window.update_ocr_result(first, region.region_id)
+        main_window.update_translation(first, "storm", language_to, region.region_id)
+        main_window.update_ocr_result(first, region.region_id)
+        main_window.update_ocr_result(second, region.region_id)
+        main_window.update_translation(second, "village", language_to, region.region_id)
+        assert region.overlay.text == "village"
+        main_window.update_ocr_result(first, region.region_id)
+    assert region.overlay.text == "storm"
+    assert mock_submit.call_count == 2
+    assert region.source_history.stats() == {"checked": 4, "duplicates": 2}
+    main_window.clear_regions()
+
+def test_update_ocr_result_retries_failed_translation(main_window):
+    main_window.clear_regions()
+    region = main_window.region_manager.add((0, 0, 300, 200), (0, 0, 300, 200), 0, "eng")
+    futures = []
+    with patch.object(main_window.translation_worker.batcher, "submit", side_effect=lambda *args: futures.append(Future()) or futures[-1]):
+        main_window.update_ocr_result("The storm is getting worse tonight", region.region_id)
+        futures[0].set_exception(RuntimeError("offline"))
+        main_window.update_ocr_result("The storm is getting worse tonight", region.region_id)
+    assert len(futures) == 2
+    assert region.source_history.size == 0
+    main_window.clear_regions()
+
+def test_show_translated_text_reuses_window(main_window):
+    region = main_window.region_manager.add((0, 0, 300, 200), (0, 0, 300, 200), 0, "eng")
+    main_window.show_translated_text(region, "first")
+    window = region.overlay
+    main_window.show_translated_text(region, "second")
+    assert region.overlay is window
+    assert window.text == "second"
+    assert window.isVisible()
+    main_window.clear_regions()
+
+def test_mask_translated_text_windows(main_window):
+    frame = np.full((100, 100), 200, dtype=np.uint8)
+    frame[40:60, 40:60] = 0
+    region = main_window.region_manager.add((10, 10, 110, 110), (10, 10, 100, 100), 0, "eng")
+    assert main_window.mask_translated_text_windows(frame, (10, 10))[50, 50] == 0
+
+    region.overlay = MagicMock(frame_rect=(40, 40, 20, 20))
+    assert main_window.mask_translated_text_windows(frame, (10, 10))[50, 50] == 200
+    region.overlay = None
+    main_window.clear_regions()
+
 def test_show_transparent_window(main_window):
     main_window.transparent_window = None
     monitor_index = 1
@@ -242,7 +386,7 @@ def test_update_monitor_preview(main_window):
         
         monitor = {"width": 1920, "height": 1080}
         MockMSS.return_value.__enter__.return_value.monitors = {monitor_index: monitor}
-        screenshot = MagicMock(size=(1920, 1080), rgb=b"\x00" * 1920 * 1080 * 3)
+        screenshot = MagicMock(width=1920, height=1080, raw=b"\x00" * 1920 * 1080 * 4)
         MockMSS.return_value.__enter__.return_value.grab.return_value = screenshot
 
         main_window.update_monitor_preview(monitor_index)
@@ -252,9 +396,20 @@ def test_update_monitor_preview(main_window):
         mock_set_pixmap.assert_called_once()
 
 
+def test_toggle_live_preview(main_window):
+    main_window.capturing = False
+    main_window.toggle_live_preview(Qt.Checked)
+    assert main_window.live_preview_timer.isActive()
+    main_window.toggle_live_preview(Qt.Unchecked)
+    assert not main_window.live_preview_timer.isActive()
+
+    main_window.capturing = True
+    main_window.toggle_live_preview(Qt.Checked)
+    assert not main_window.live_preview_timer.isActive()
+    main_window.capturing = False
+
 def test_toggle_capturing_when_capturing_is_true(main_window):
     main_window.capturing = True
-    main_window.translated_text_window = MagicMock()
 
     with patch.object(main_window.capture_button, "setText") as mock_set_text, \
             patch.object(main_window.capture_button, "setDisabled") as mock_set_disabled:
@@ -286,8 +441,40 @@ def mock_capture_screenshot(monitor, monitor_index):
     return Image.new("RGB", (100, 100), (counter % 256, counter % 256, counter % 256))
 
 
+class MockCaptureEngine:
+    def __init__(self, monitor, monitor_index, buffers=3):
+        self.monitor = monitor
+        self.monitor_index = monitor_index
+
+    def grab(self):
+        return mock_capture_screenshot(self.monitor, self.monitor_index)
+
+    def grab_gray(self):
+        return np.asarray(self.grab().convert("L"))
+
+    def invalidate(self):
+        pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        pass
+
+
+class MockMSS:
+    monitors = [{"left": 0, "top": 0, "width": 1920, "height": 1080}]
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        pass
+
+
 def test_capture_loop_no_capture_area(main_window):
     main_window.capture_area = None
+    main_window.clear_regions()
 
     with patch("components.main_window.print") as mock_print:
         main_window.capture_loop()
@@ -295,13 +482,17 @@ def test_capture_loop_no_capture_area(main_window):
 
 
 def test_capture_loop_capturing_true(main_window, monkeypatch):
+    # everything the loop reads is set up here so earlier tests cant leak into it
     global counter
-    counter = 0 
+    counter = 0
 
     main_window.capture_area = (0, 0, 100, 100)
     main_window.capturing = True
-    monkeypatch.setattr("components.main_window.time.sleep", lambda *args, **kwargs: None)
-    monkeypatch.setattr("components.main_window.capture_screenshot", mock_capture_screenshot)
+    main_window.screenshot_queue.clear()
+    monkeypatch.setattr(main_window, "region_manager", RegionManager(target_fps=100, idle_fps=50))
+    region = main_window.region_manager.add((0, 0, 100, 100), (0, 0, 100, 100), 0, "eng")
+    monkeypatch.setattr("components.main_window.CaptureEngine", MockCaptureEngine)
+    monkeypatch.setattr("components.main_window.mss", MockMSS)
 
     loop_thread = threading.Thread(target=main_window.capture_loop)
     loop_thread.start()
@@ -309,15 +500,26 @@ def test_capture_loop_capturing_true(main_window, monkeypatch):
     main_window.capturing = False  
     loop_thread.join()
 
-    expected_number_of_screenshots = counter - 1  
-    assert main_window.screenshot_queue.qsize() == expected_number_of_screenshots
+    stats = region.change_detector.stats()
+    assert stats["forwarded"] + stats["skipped"] == counter
+    assert stats["forwarded"] >= 1
+    assert main_window.screenshot_queue.qsize() <= stats["forwarded"]
 
-def test_capture_loop_capturing_false(main_window):
+def test_capture_loop_capturing_false(main_window, monkeypatch):
     main_window.capture_area = (0, 0, 100, 100)
     main_window.capturing = False
+    monkeypatch.setattr(main_window, "region_manager", RegionManager(target_fps=100, idle_fps=50))
+    main_window.region_manager.add((0, 0, 100, 100), (0, 0, 100, 100), 0, "eng")
 
-    with patch("components.main_window.time.sleep") as mock_sleep:
-        main_window.capture_loop()
-        mock_sleep.assert_not_called()
+    main_window.capture_loop()
+    assert main_window.region_manager.stats()["ticks"] == 0
+
+def test_stop_capturing_wakes_scheduler(main_window):
+    main_window.region_manager = RegionManager(target_fps=0.1, idle_fps=0.1)
+    region = main_window.region_manager.add((0, 0, 100, 100), (0, 0, 100, 100), 0, "eng")
+    region.scheduler.record(False)
+    main_window.capturing = True
+    main_window.toggle_capturing()
+    assert main_window.region_manager.wait() is None
 
 
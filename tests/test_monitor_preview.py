@@ -0,0 +1,37 @@
+import numpy as np
+from PyQt5.QtWidgets import QApplication
+from components.monitor_preview import MonitorPreview
+
+app = QApplication.instance() or QApplication([])
+
+
+class MockScreenshot:
+    def __init__(self, width, height, bgra=(255, 0, 0, 255)):
+        self.width = width
+        self.height = height
+        self.raw = bytearray(bytes(bgra) * width * height)
+
+
+def test_downsample_strides_to_preview_size():
+    preview = MonitorPreview(640, 400)
+    buffer = preview.downsample(MockScreenshot(3840, 2160))
+    assert buffer.shape == (432, 768, 4)
+
+    small = preview.downsample(MockScreenshot(320, 200))
+    assert small.shape == (200, 320, 4)
+
+
+def test_buffer_reused():
+    preview = MonitorPreview(640, 400)
+    first = preview.downsample(MockScreenshot(1920, 1080))
+    second = preview.downsample(MockScreenshot(1920, 1080))
+    assert first is second
+    assert preview.allocations == 1
+
+
+def test_render_keeps_colors():
+    preview = MonitorPreview(64, 40)
+    pixmap = preview.render(MockScreenshot(256, 160, bgra=(255, 0, 0, 255)))
+    assert (pixmap.width(), pixmap.height()) == (64, 40)
+    color = pixmap.toImage().pixelColor(10, 10)
+    assert (color.red(), color.green(), color.blue()) == (0, 0, 255)
@@ -0,0 +1,97 @@
+import threading
+import pytest
+import unittest.mock as mock
+from PIL import Image
+import components.ocr_backends as ocr_backends
+from components.ocr_backends import (
+    PytesseractBackend,
+    TesserocrBackend,
+    available_backends,
+    create_backend,
+    get_backend,
+    use_backend,
+)
+
+
+class FakeAPI:
+    created = []
+
+    def __init__(self, **kwargs):
+        self.kwargs = kwargs
+        self.images = []
+        self.ended = False
+        FakeAPI.created.append(self)
+
+    def SetImage(self, image):
+        self.images.append(image)
+
+    def GetUTF8Text(self):
+        return f"text {self.kwargs['lang']}"
+
+    def End(self):
+        self.ended = True
+
+
+@pytest.fixture
+def fake_tesserocr(monkeypatch):
+    FakeAPI.created = []
+    fake = mock.MagicMock()
+    fake.PyTessBaseAPI = FakeAPI
+    monkeypatch.setattr(ocr_backends, "tesserocr", fake)
+    return fake
+
+
+@pytest.fixture
+def no_tesserocr(monkeypatch):
+    monkeypatch.setattr(ocr_backends, "tesserocr", None)
+
+
+def test_pytesseract_backend():
+    image = Image.new("RGB", (50, 50), color="white")
+    with mock.patch("pytesseract.image_to_string") as mocked_image_to_string:
+        mocked_image_to_string.return_value = "Test text"
+        assert PytesseractBackend().recognize(image, "eng") == "Test text"
+    mocked_image_to_string.assert_called_once_with(image, config="-l eng --psm 6 --oem 1")
+
+
+def test_tesserocr_backend_reuses_api(fake_tesserocr):
+    backend = TesserocrBackend()
+    image = Image.new("1", (50, 50))
+
+    assert backend.recognize(image, "eng") == "text eng"
+    assert backend.recognize(image, "eng") == "text eng"
+    assert backend.recognize(image, "jpn") == "text jpn"
+    assert len(FakeAPI.created) == 2
+    assert FakeAPI.created[0].images[0].mode == "L"
+
+    backend.close()
+    assert all(api.ended for api in FakeAPI.created)
+
+
+def test_tesserocr_missing(no_tesserocr):
+    with pytest.raises(RuntimeError):
+        TesserocrBackend()
+    assert available_backends() == ["pytesseract"]
+    assert isinstance(create_backend(), PytesseractBackend)
+
+
+def test_create_backend_prefers_tesserocr(fake_tesserocr):
+    assert available_backends() == ["tesserocr", "pytesseract"]
+    assert isinstance(create_backend(), TesserocrBackend)
+    assert isinstance(create_backend("pytesseract"), PytesseractBackend)
+
+
+def test_get_backend_is_kept_per_thread(no_tesserocr):
+    use_backend("pytesseract")
+    backends = []
+
+    def collect():
+        backends.append(get_backend())
+        backends.append(get_backend())
+
+    thread = threading.Thread(target=collect)
+    thread.start()
+    thread.join()
+    assert backends[0] is backends[1]
+    assert backends[0] is not get_backend()
+    use_backend("auto")
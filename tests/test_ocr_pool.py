@@ -0,0 +1,48 @@
+import os
+import pytest
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from components.ocr_pool import OCRPool, completed, default_pool_size
+
+
+def omp_thread_limit(_):
+    return os.environ.get("OMP_THREAD_LIMIT")
+
+
+def test_default_pool_size():
+    assert default_pool_size() >= 1
+
+
+def test_completed():
+    future = completed("text")
+    assert future.done()
+    assert future.result() == "text"
+
+
+def test_single_worker_uses_thread():
+    pool = OCRPool(1)
+    assert isinstance(pool.executor, ThreadPoolExecutor)
+    assert pool.submit(pow, 2, 3).result() == 8
+    pool.shutdown()
+
+
+def test_process_pool():
+    pool = OCRPool(2)
+    assert isinstance(pool.executor, ProcessPoolExecutor)
+    results = [pool.submit(pow, 2, n) for n in range(4)]
+    assert [future.result() for future in results] == [1, 2, 4, 8]
+    assert pool.submit(omp_thread_limit, None).result() == "1"
+    pool.shutdown()
+
+
+def test_restart_replaces_broken_pool():
+    pool = OCRPool(2)
+    with pytest.raises(BrokenProcessPool):
+        pool.submit(os._exit, 1).result()
+    with pytest.raises(BrokenProcessPool):
+        pool.submit(pow, 2, 3)
+
+    pool.restart()
+    assert pool.submit(pow, 2, 3).result() == 8
+    assert pool.restarts == 1
+    pool.shutdown()
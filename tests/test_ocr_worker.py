@@ -1,8 +1,12 @@
 import pytest
+import threading
 import unittest.mock as mock
+from concurrent.futures import Future
+from concurrent.futures.process import BrokenProcessPool
 from queue import Queue
-from PIL import Image
+from PIL import Image, ImageDraw
 from PyQt5.QtCore import Qt
+from components.frame_mailbox import RegionMailbox
 from components.ocr_worker import OCRWorker, upscale_image, adaptive_thresholding, ocr_screenshot
 
 language_test_texts = [
@@ -132,5 +136,106 @@ def test_ocr_worker_run(qtbot, language_code, expected_text):
         with qtbot.wait_signal(ocr_worker.ocr_result, timeout=5000) as blocker:
             ocr_worker.start()
             blocker.wait()
-        assert blocker.args == [expected_text]
+        assert blocker.args == [expected_text, 0]
 
+
+def test_ocr_worker_drops_stale_results(qtbot):
+    ocr_worker = OCRWorker(Queue(), "eng")
+    emitted = []
+    ocr_worker.ocr_result.connect(lambda text, region_id: emitted.append(text))
+
+    newer = [Future(), Future()]
+    older = [Future()]
+    ocr_worker.in_flight = threading.Semaphore(0)
+    ocr_worker.track_frame(1, older)
+    ocr_worker.track_frame(2, newer)
+
+    newer[0].set_result("new line 1")
+    assert emitted == []
+    newer[1].set_result("new line 2")
+    older[0].set_result("old line")
+
+    assert emitted == ["new line 1\nnew line 2"]
+    assert ocr_worker.frames_emitted == 1
+    assert ocr_worker.frames_stale == 1
+    ocr_worker.pool.shutdown()
+
+
+def test_ocr_worker_stop(qtbot):
+    ocr_worker = OCRWorker(Queue(), "eng", workers=2)
+    ocr_worker.start()
+    ocr_worker.stop()
+    assert ocr_worker.isFinished()
+
+
+def test_ocr_worker_stale_is_per_region(qtbot):
+    ocr_worker = OCRWorker(Queue(), "eng")
+    emitted = []
+    ocr_worker.ocr_result.connect(lambda text, region_id: emitted.append((text, region_id)))
+
+    first = [Future()]
+    second = [Future()]
+    ocr_worker.in_flight = threading.Semaphore(0)
+    ocr_worker.track_frame(1, first, region_id=1)
+    ocr_worker.track_frame(2, second, region_id=2)
+
+    second[0].set_result("subtitle")
+    first[0].set_result("chat")
+
+    assert emitted == [("subtitle", 2), ("chat", 1)]
+    assert ocr_worker.frames_stale == 0
+    ocr_worker.pool.shutdown()
+
+
+def test_ocr_worker_keeps_capture_time(qtbot):
+    ocr_worker = OCRWorker(Queue(), "eng")
+    ocr_worker.in_flight = threading.Semaphore(0)
+    ocr_worker.track_frame(1, [], region_id=1, captured_at=12.5)
+    ocr_worker.track_frame(2, [], region_id=2)
+
+    assert ocr_worker.captured_at == {1: 12.5, 2: None}
+    ocr_worker.pool.shutdown()
+
+
+def test_ocr_worker_band_cache_per_region(qtbot):
+    screenshot_queue = RegionMailbox()
+    screenshot_queue.put((Image.new("RGB", (50, 50), color="white"), "eng", 1), key=1)
+    screenshot_queue.put((Image.new("RGB", (80, 30), color="white"), "eng", 2), key=2)
+    ocr_worker = OCRWorker(screenshot_queue, "eng")
+    emitted = []
+    ocr_worker.ocr_result.connect(lambda text, region_id: emitted.append(region_id))
+
+    with mock.patch("components.ocr_worker.ocr_screenshot", return_value="text"):
+        ocr_worker.start()
+        qtbot.waitUntil(lambda: len(emitted) == 2, timeout=5000)
+    ocr_worker.stop()
+    assert sorted(emitted) == [1, 2]
+    assert set(ocr_worker.band_caches) == {1, 2}
+
+
+def test_ocr_worker_restarts_broken_pool(qtbot):
+    image = Image.new("RGB", (120, 60), color="white")
+    ImageDraw.Draw(image).rectangle((10, 20, 100, 35), fill="black")
+    screenshot_queue = RegionMailbox()
+    ocr_worker = OCRWorker(screenshot_queue, "eng")
+    emitted = []
+    ocr_worker.ocr_result.connect(lambda text, region_id: emitted.append(text))
+    submit = ocr_worker.pool.submit
+    calls = []
+
+    def flaky_submit(*args):
+        calls.append(args)
+        if len(calls) == 1:
+            raise BrokenProcessPool("worker died")
+        return submit(*args)
+
+    with mock.patch.object(ocr_worker.pool, "submit", side_effect=flaky_submit), \
+            mock.patch("components.ocr_worker.ocr_screenshot", return_value="text"):
+        screenshot_queue.put((image, "eng"))
+        ocr_worker.start()
+        qtbot.waitUntil(lambda: len(calls) == 1, timeout=5000)
+        screenshot_queue.put((image, "eng"))
+        qtbot.waitUntil(lambda: emitted == ["text"], timeout=5000)
+    assert ocr_worker.isRunning()
+    assert ocr_worker.pool.restarts == 1
+    ocr_worker.stop()
@@ -0,0 +1,94 @@
+import numpy as np
+import pytest
+from PIL import Image
+from components.preprocessing import (
+    OTSU,
+    SAUVOLA,
+    UPSCALE_FIRST,
+    bgra_to_gray,
+    binarize,
+    box_mean,
+    integral_image,
+    otsu_threshold,
+    preprocess,
+    sauvola_threshold,
+    to_gray,
+    upscale,
+)
+
+
+def text_like(background=200, ink=30):
+    gray = np.full((40, 100), background, dtype=np.uint8)
+    gray[10:30, 20:80] = ink
+    return gray
+
+
+def test_bgra_to_gray():
+    raw = np.zeros((2, 3, 4), dtype=np.uint8)
+    raw[:, :, 2] = 255
+    gray = bgra_to_gray(raw.tobytes(), 3, 2)
+    assert gray.shape == (2, 3)
+    assert gray.dtype == np.uint8
+    assert np.all(gray == 76)
+
+
+def test_to_gray():
+    image = Image.new("RGB", (10, 5), color="white")
+    assert to_gray(image).shape == (5, 10)
+    assert to_gray(np.asarray(image)).shape == (5, 10)
+
+
+def test_otsu_threshold():
+    threshold = otsu_threshold(text_like())
+    assert 30 <= threshold < 200
+
+
+def test_integral_image():
+    array = np.arange(12, dtype=np.float64).reshape(3, 4)
+    integral = integral_image(array)
+    assert integral.shape == (4, 5)
+    assert integral[-1, -1] == array.sum()
+    assert integral[2, 3] == array[:2, :3].sum()
+
+
+def test_sauvola_threshold_shape():
+    assert sauvola_threshold(text_like()).shape == (40, 100)
+
+
+@pytest.mark.parametrize("method", [OTSU, SAUVOLA])
+def test_binarize_dark_text(method):
+    binary = binarize(text_like(), method)
+    assert binary[0, 0] == 255
+    assert binary[20, 50] == 0
+
+
+@pytest.mark.parametrize("method", [OTSU, SAUVOLA])
+def test_binarize_light_text_is_inverted(method):
+    binary = binarize(text_like(background=30, ink=220), method)
+    assert binary[0, 0] == 255
+    assert binary[20, 50] == 0
+
+
+def test_binarize_unknown_method():
+    with pytest.raises(ValueError):
+        binarize(text_like(), "fixed")
+
+
+def test_upscale():
+    array = np.array([[0, 255]], dtype=np.uint8)
+    assert upscale(array, 2).tolist() == [[0, 0, 255, 255], [0, 0, 255, 255]]
+
+
+def test_preprocess_orders():
+    image = Image.fromarray(text_like())
+    assert preprocess(image).shape == (80, 200)
+    assert preprocess(image, order=UPSCALE_FIRST).shape == (80, 200)
+    assert set(np.unique(preprocess(image))) <= {0, 255}
+    with pytest.raises(ValueError):
+        preprocess(image, order="sideways")
+
+
+def test_box_mean():
+    array = np.arange(15, dtype=np.float64).reshape(3, 5)
+    assert box_mean(array, 3)[1, 1] == array[0:3, 0:3].mean()
+    assert box_mean(array, 25).shape == (3, 5)
@@ -0,0 +1,84 @@
+import threading
+import time
+from unittest.mock import MagicMock
+import numpy as np
+from components.region_manager import RegionManager, union_bbox
+
+
+def test_union_bbox():
+    assert union_bbox([(10, 10, 50, 50), (40, 0, 100, 20)]) == (10, 0, 100, 50)
+
+
+def test_add_get_remove():
+    manager = RegionManager()
+    chat = manager.add((0, 0, 100, 50), (0, 0, 100, 50), 1, "eng")
+    subtitles = manager.add((0, 400, 200, 450), (0, 400, 200, 50), 1, "jpn")
+
+    assert chat.region_id != subtitles.region_id
+    assert manager.get(subtitles.region_id) is subtitles
+    assert manager.union_bbox() == (0, 0, 200, 450)
+    assert chat.change_detector is not subtitles.change_detector
+    assert chat.scheduler is not subtitles.scheduler
+
+    assert manager.remove(chat.region_id) is chat
+    assert manager.get(chat.region_id) is None
+    assert manager.remove(chat.region_id) is None
+    assert manager.clear() == [subtitles]
+    assert manager.union_bbox() is None
+
+
+def test_crop_and_overlay_rect():
+    manager = RegionManager()
+    region = manager.add((110, 220, 130, 230), (110, 220, 20, 10), 1, "eng")
+    frame = np.arange(100 * 200, dtype=np.uint8).reshape(100, 200)
+
+    crop = region.crop(frame, (100, 200))
+    assert crop.shape == (10, 20)
+    assert crop[0, 0] == frame[20, 10]
+
+    assert region.overlay_rect((100, 200)) is None
+    region.overlay = MagicMock(frame_rect=(5, 2, 10, 6))
+    assert region.overlay_rect((100, 200)) == (15, 22, 10, 6)
+
+
+def test_wait_returns_due_regions():
+    manager = RegionManager(target_fps=20, idle_fps=1)
+    fast = manager.add((0, 0, 10, 10), (0, 0, 10, 10), 1, "eng")
+    slow = manager.add((0, 20, 10, 30), (0, 20, 10, 10), 1, "eng")
+
+    assert manager.wait() == [fast, slow]
+    fast.scheduler.record(True)
+    slow.scheduler.record(False)
+    slow.scheduler.record(False)
+
+    start = time.monotonic()
+    assert manager.wait() == [fast]
+    assert time.monotonic() - start >= 0.04
+
+
+def test_stop_cancels_wait():
+    manager = RegionManager(target_fps=0.1, idle_fps=0.1)
+    region = manager.add((0, 0, 10, 10), (0, 0, 10, 10), 1, "eng")
+    region.scheduler.record(False)
+    threading.Timer(0.05, manager.stop).start()
+
+    start = time.monotonic()
+    assert manager.wait() is None
+    assert time.monotonic() - start < 1
+
+    manager.reset()
+    assert manager.wait() == [region]
+    assert RegionManager().wait() is None
+
+
+def test_stats_add_up_regions():
+    manager = RegionManager()
+    for top in (0, 100):
+        region = manager.add((0, top, 10, top + 10), (0, top, 10, 10), 1, "eng")
+        region.scheduler.record(True)
+        region.source_history.is_duplicate("same text")
+        region.source_history.is_duplicate("same text")
+    stats = manager.stats()
+    assert stats["ticks"] == 2
+    assert stats["checked"] == 4
+    assert stats["duplicates"] == 2
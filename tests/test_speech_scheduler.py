@@ -0,0 +1,155 @@
+from concurrent.futures import Future
+import threading
+from unittest.mock import MagicMock
+from components.speech_scheduler import SpeechScheduler
+from components.tts_engine import TTSEngine
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 100.0
+
+    def __call__(self):
+        return self.now
+
+
+def ready_future(data=b"audio"):
+    future = Future()
+    future.set_result(data)
+    return future
+
+
+def make_scheduler(**policy):
+    clock = FakeClock()
+    prepare = MagicMock(side_effect=lambda text, lang: ready_future(text.encode()))
+    return SpeechScheduler(prepare, clock=clock, **policy), prepare, clock
+
+
+def test_queue_all_keeps_order():
+    scheduler, _, _ = make_scheduler()
+    scheduler.add("first", "en")
+    scheduler.add("second", "en")
+
+    assert scheduler.next_ready()[0] == "first"
+    assert scheduler.next_ready()[0] == "second"
+    assert scheduler.next_ready() is None
+
+
+def test_next_ready_waits_for_synthesis():
+    scheduler = SpeechScheduler(MagicMock(return_value=Future()))
+    scheduler.add("first", "en")
+
+    assert scheduler.next_ready() is None
+    assert scheduler.pending()
+
+
+def test_latest_only_drops_queued_lines():
+    scheduler, _, _ = make_scheduler(latest_only=True)
+    pending = Future()
+    scheduler.prepare.side_effect = [pending, ready_future()]
+    scheduler.add("first", "en")
+    scheduler.add("second", "en")
+
+    assert pending.cancelled()
+    assert scheduler.next_ready()[0] == "second"
+    assert scheduler.stats()["dropped"] == 1
+
+
+def test_max_age_drops_stale_lines():
+    scheduler, _, clock = make_scheduler(max_age=5.0)
+    scheduler.add("old", "en", captured_at=clock.now - 6)
+    scheduler.add("fresh", "en", captured_at=clock.now - 1)
+
+    assert scheduler.next_ready()[0] == "fresh"
+    assert scheduler.stats()["stale"] == 1
+
+
+def test_merge_joins_short_lines_not_started():
+    scheduler, prepare, clock = make_scheduler(merge_chars=40)
+    prepare.side_effect = lambda text, lang: Future()
+    scheduler.add("Look out!", "en", captured_at=clock.now - 2)
+    scheduler.add("Behind you!", "en", captured_at=clock.now - 1)
+
+    assert [item[0] for item in scheduler.items] == ["Look out! Behind you!"]
+    assert scheduler.items[0][2] == clock.now - 2
+    assert scheduler.stats()["merged"] == 1
+
+
+def test_merge_skips_long_other_language_and_started_lines():
+    scheduler, prepare, _ = make_scheduler(merge_chars=20)
+    prepare.side_effect = lambda text, lang: Future()
+    scheduler.add("A rather long line of text", "en")
+    scheduler.add("Short", "en")
+    scheduler.add("Kurz", "de")
+    scheduler.items[-1][3].set_running_or_notify_cancel()
+    scheduler.add("Noch", "de")
+
+    assert len(scheduler.items) == 4
+    assert scheduler.stats()["merged"] == 0
+
+
+def test_interrupt_policy():
+    scheduler, _, _ = make_scheduler(interrupt=True)
+    assert scheduler.add("first", "en")
+
+    scheduler.set_policy()
+    assert not scheduler.add("second", "en")
+
+
+def test_record_playback_tracks_lag():
+    scheduler, _, clock = make_scheduler()
+    scheduler.record_playback(clock.now - 0.5)
+    scheduler.record_playback(clock.now - 1.5)
+
+    stats = scheduler.stats()
+    assert stats["spoken"] == 2
+    assert stats["lag_ms"] == 1500
+    assert stats["average_lag_ms"] == 1000
+    assert stats["max_lag_ms"] == 1500
+
+
+def test_clear_cancels_queued_lines():
+    scheduler = SpeechScheduler(MagicMock(side_effect=lambda text, lang: Future()))
+    scheduler.add("first", "en")
+    future = scheduler.items[0][3]
+
+    scheduler.clear()
+    assert future.cancelled()
+    assert not scheduler.pending()
+
+
+def test_merge_keeps_earlier_line_with_the_same_text(tmp_path):
+    release = threading.Event()
+
+    class SlowBackend:
+        name = "slow"
+        extension = "wav"
+
+        def synthesize(self, text, language_code):
+            release.wait(5)
+            return text.encode("utf-8")
+
+    engine = TTSEngine(str(tmp_path))
+    engine.backend = SlowBackend()
+    scheduler = SpeechScheduler(engine.prepare, merge_chars=20)
+    scheduler.add("a busy line that is long", "en")
+    scheduler.add("Yes", "en")
+    scheduler.add("a line much too long to merge", "en")
+    scheduler.add("Yes", "en")
+    scheduler.add("No", "en")
+    release.set()
+
+    spoken = []
+    while scheduler.pending():
+        item = scheduler.next_ready()
+        if item is not None:
+            spoken.append((item[0], item[3].result(timeout=5)))
+        release.wait(0.01)
+    engine.stop()
+
+    assert spoken == [
+        ("a busy line that is long", b"a busy line that is long"),
+        ("Yes", b"Yes"),
+        ("a line much too long to merge", b"a line much too long to merge"),
+        ("Yes No", b"Yes No"),
+    ]
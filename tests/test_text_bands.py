@@ -0,0 +1,77 @@
+import numpy as np
+from PIL import Image
+from components.text_bands import BandCache, find_text_bands
+
+
+def lines_image(lines, width=120, line_height=10, gap=10):
+    """white image with a black bar per line, value of the bar set by the line"""
+    height = len(lines) * (line_height + gap) + gap
+    array = np.full((height, width), 255, dtype=np.uint8)
+    for index, value in enumerate(lines):
+        top = gap + index * (line_height + gap)
+        array[top:top + line_height, 10:10 + value] = 0
+    return Image.fromarray(array, "L")
+
+
+class CountingOCR:
+    def __init__(self):
+        self.calls = []
+
+    def __call__(self, band, language_code):
+        self.calls.append(band.shape)
+        return f"band {len(self.calls)}"
+
+
+def test_find_text_bands():
+    array = np.asarray(lines_image([50, 60, 70]))
+    assert find_text_bands(array, padding=0) == [(10, 20), (30, 40), (50, 60)]
+
+
+def test_find_text_bands_blank_frame():
+    array = np.full((30, 30), 255, dtype=np.uint8)
+    assert find_text_bands(array) == [(0, 30)]
+
+
+def test_only_changed_bands_recognized():
+    cache = BandCache()
+    ocr = CountingOCR()
+
+    text = cache.recognize(lines_image([50, 60, 70]), "eng", ocr)
+    assert text == "band 1\nband 2\nband 3"
+    assert len(ocr.calls) == 3
+
+    text = cache.recognize(lines_image([50, 90, 70]), "eng", ocr)
+    assert len(ocr.calls) == 4
+    assert text == "band 1\nband 4\nband 3"
+    assert cache.stats() == {"recognized": 4, "reused": 2}
+
+
+def test_language_change_drops_cache():
+    cache = BandCache()
+    ocr = CountingOCR()
+    cache.recognize(lines_image([50, 60]), "eng", ocr)
+    cache.recognize(lines_image([50, 60]), "jpn", ocr)
+    assert len(ocr.calls) == 4
+
+
+def test_rgb_input():
+    cache = BandCache()
+    ocr = CountingOCR()
+    cache.recognize(lines_image([50]).convert("RGB"), "eng", ocr)
+    assert ocr.calls == [(14, 120)]
+
+
+def test_bands_are_copied_out_of_the_frame():
+    cache = BandCache()
+    buffer = np.asarray(lines_image([50])).copy()
+    futures = cache.plan(buffer[:], "eng", lambda band, code: band)
+    buffer[:] = 0
+    assert futures[0].shape == (14, 120)
+    assert futures[0].max() == 255
+
+
+def test_owned_frame_is_not_copied_again():
+    cache = BandCache()
+    frame = np.asarray(lines_image([50])).copy()
+    futures = cache.plan(frame, "eng", lambda band, code: band)
+    assert np.shares_memory(futures[0], frame)
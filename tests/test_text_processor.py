@@ -1,5 +1,15 @@
 import pytest
-from components.text_processor import TextProcessor
+from unittest.mock import MagicMock
+import subprocess
+import sys
+from components.text_processor import (
+    TextProcessor,
+    download_corpora,
+    missing_corpora,
+    stopword_languages,
+    stopword_set,
+    tokenize,
+)
 
 language_test_texts = [
     ("af", "hallo"),
@@ -110,6 +120,12 @@ def test_translate_text(language_code, _):
 
 
 
+requires_corpora = pytest.mark.skipif(
+    bool(missing_corpora()), reason="nltk corpora missing, run python main.py --setup"
+)
+
+
+@requires_corpora
 @pytest.mark.parametrize("language_code, _", language_test_texts)
 def test_remove_stopwords(language_code, _):
     if language_code in ["az", "ca", "nl", "hu", "it", "pt", "ro", "es"]:
@@ -126,6 +142,7 @@ def test_remove_stopwords(language_code, _):
 
 
 
+@requires_corpora
 def test_calculate_similarity():
     text_processor = TextProcessor()
     text1 = "This is a test sentence with some common English stopwords"
@@ -133,3 +150,126 @@ def test_calculate_similarity():
     language_code = "en"
     similarity = text_processor.calculate_similarity(text1, text2, language_code)
     assert 0.5 < similarity < 1
+
+
+def test_translate_text_uses_cache():
+    text_processor = TextProcessor()
+    text_processor.translator = MagicMock()
+    text_processor.translator.translate.return_value = MagicMock(text="bonjour")
+
+    assert text_processor.translate_text("hello", "fr") == "bonjour"
+    assert text_processor.translate_text("hello", "fr") == "bonjour"
+    text_processor.translator.translate.assert_called_once_with("hello", dest="fr")
+    assert text_processor.translation_cache.stats()["hits"] == 1
+
+
+def test_translate_text_failure_not_cached():
+    text_processor = TextProcessor()
+    text_processor.translator = MagicMock()
+    text_processor.translator.translate.side_effect = Exception("rate limited")
+
+    assert text_processor.translate_text("hello", "fr") == "hello"
+    assert text_processor.translation_cache.get("hello", "fr") is None
+
+
+def test_translate_batch_single_request():
+    text_processor = TextProcessor()
+    text_processor.translator = MagicMock()
+    text_processor.translator.translate.return_value = MagicMock(text="un\ndeux")
+    text_processor.translation_cache.put("three", "fr", "trois")
+
+    results = text_processor.translate_batch(["one", "three", "", "two"], "fr")
+
+    assert results == ["un", "trois", "", "deux"]
+    text_processor.translator.translate.assert_called_once_with("one\ntwo", dest="fr")
+    assert text_processor.translation_cache.get("two", "fr") == "deux"
+
+
+def test_translate_batch_delimiter_lost():
+    text_processor = TextProcessor()
+    text_processor.translator = MagicMock()
+    text_processor.translator.translate.side_effect = [
+        MagicMock(text="un deux"),
+        MagicMock(text="un"),
+        MagicMock(text="deux"),
+    ]
+
+    assert text_processor.translate_batch(["one", "two"], "fr") == ["un", "deux"]
+    assert text_processor.translator.translate.call_count == 3
+
+
+def test_translate_batch_failure():
+    text_processor = TextProcessor()
+    text_processor.translator = MagicMock()
+    text_processor.translator.translate.side_effect = Exception("rate limited")
+
+    assert text_processor.translate_batch(["one", "two"], "fr") == ["one", "two"]
+    assert text_processor.translator.translate.call_count == 1
+
+
+def test_tokenize():
+    assert tokenize("already  cleaned text") == ["already", "cleaned", "text"]
+    assert tokenize("") == []
+
+
+def test_remove_stopwords_reads_corpus_once(monkeypatch):
+    corpus = MagicMock()
+    corpus.fileids.return_value = ["english"]
+    corpus.words.return_value = ["this", "is", "a", "with", "some"]
+    monkeypatch.setattr("nltk.corpus.stopwords", corpus)
+    monkeypatch.setattr("components.text_processor.missing_corpora", lambda: [])
+    stopword_languages.cache_clear()
+    stopword_set.cache_clear()
+    text_processor = TextProcessor()
+    try:
+        for _ in range(3):
+            result = text_processor.remove_stopwords("This is a test, with some words", "en")
+            assert result == "test words"
+    finally:
+        stopword_languages.cache_clear()
+        stopword_set.cache_clear()
+
+    corpus.fileids.assert_called_once()
+    corpus.words.assert_called_once_with("english")
+
+
+def test_import_is_lazy():
+    code = (
+        "import sys, components.text_processor as tp; tp.TextProcessor(); "
+        "print(sorted(m for m in ('nltk', 'sklearn', 'googletrans') if m in sys.modules))"
+    )
+    result = subprocess.run(
+        [sys.executable, "-c", code], capture_output=True, text=True, check=True
+    )
+    assert result.stdout.strip() == "[]"
+
+
+def test_download_corpora_only_fetches_missing(monkeypatch):
+    downloads = []
+    monkeypatch.setattr("components.text_processor.missing_corpora", lambda: ["punkt"])
+    monkeypatch.setattr("nltk.download", lambda name, quiet: downloads.append(name))
+    assert download_corpora() == ["punkt"]
+    assert downloads == ["punkt"]
+
+
+def test_missing_stopwords_corpus_is_looked_for_once(monkeypatch):
+    corpus = MagicMock()
+    corpus.fileids.return_value = ["english"]
+    corpus.words.return_value = ["this", "is"]
+    monkeypatch.setattr("nltk.corpus.stopwords", corpus)
+    missing = MagicMock(return_value=["stopwords"])
+    monkeypatch.setattr("components.text_processor.missing_corpora", missing)
+    monkeypatch.setattr("nltk.download", lambda name, quiet: None)
+    stopword_languages.cache_clear()
+    stopword_set.cache_clear()
+    text_processor = TextProcessor()
+    try:
+        assert text_processor.remove_stopwords("this is it", "en") == "this is it"
+        assert text_processor.remove_stopwords("this is it", "en") == "this is it"
+        assert missing.call_count == 1
+        download_corpora()
+        missing.return_value = []
+        assert text_processor.remove_stopwords("this is it", "en") == "it"
+    finally:
+        stopword_languages.cache_clear()
+        stopword_set.cache_clear()
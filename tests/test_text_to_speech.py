@@ -1,8 +1,10 @@
-import queue
+import time
+from concurrent.futures import Future
 import pytest
 from unittest.mock import MagicMock, patch
 from PyQt5.QtCore import QObject
 from PyQt5.QtMultimedia import QMediaPlayer
+from components.speech_scheduler import INTERRUPT, SpeechScheduler
 from components.text_to_speech import TextToSpeech
 LANGUAGES_GOOGLE = [
     ("Afrikaans", "af"),
@@ -97,56 +99,107 @@ LANGUAGES_GOOGLE = [
 @pytest.fixture
 def text_to_speech():
     parent = QObject()
-    return TextToSpeech(parent)
+    tts = TextToSpeech(parent)
+    yield tts
+    tts.close()
+
+
+def done_future(result=None, error=None):
+    future = Future()
+    if error is not None:
+        future.set_exception(error)
+    else:
+        future.set_result(result)
+    return future
+
+
+def queue_clip(text_to_speech, text, future, captured_at=None):
+    if captured_at is None:
+        captured_at = time.monotonic()
+    text_to_speech.scheduler.items.append((text, "en", captured_at, future))
 
 
 def test_init(text_to_speech):
     assert isinstance(text_to_speech.media_player, QMediaPlayer)
-    assert isinstance(text_to_speech.text_queue, queue.Queue)
+    assert isinstance(text_to_speech.scheduler, SpeechScheduler)
     assert text_to_speech.playback_enabled
 
 
-@patch("components.text_to_speech.tempfile.NamedTemporaryFile")
-@patch("components.text_to_speech.gTTS")
-@patch("components.text_to_speech.QUrl.fromLocalFile")
-def test_play_next_audio(mock_qurl_from_local_file, mock_gtts, mock_tempfile, text_to_speech):
-    mock_gtts_instance = MagicMock()
-    mock_gtts.return_value = mock_gtts_instance
-    mock_tempfile_instance = MagicMock()
-    mock_tempfile.return_value = mock_tempfile_instance
-    mock_qurl = MagicMock()
-    mock_qurl_from_local_file.return_value = mock_qurl
+def test_play_next_audio(text_to_speech):
+    text_to_speech.media_player = MagicMock()
+    queue_clip(text_to_speech, "Hello", done_future(b"mp3 data"), time.monotonic() - 1)
+
+    text_to_speech.play_next_audio()
+    _, audio_buffer = text_to_speech.media_player.setMedia.call_args[0]
+    assert audio_buffer is text_to_speech.audio_buffer
+    assert bytes(audio_buffer.data()) == b"mp3 data"
+    assert audio_buffer.isOpen()
+    text_to_speech.media_player.play.assert_called_once()
+    assert not text_to_speech.scheduler.pending()
+    stats = text_to_speech.scheduler.stats()
+    assert stats["spoken"] == 1
+    assert stats["lag_ms"] >= 1000
+
+
+def test_play_audio_releases_previous_buffer(text_to_speech):
+    text_to_speech.media_player = MagicMock()
+    text_to_speech.play_audio(b"first")
+    first = text_to_speech.audio_buffer
+
+    text_to_speech.play_audio(b"second")
+    assert not first.isOpen()
+    assert bytes(text_to_speech.audio_buffer.data()) == b"second"
 
-    text_to_speech.text_queue.put(("Hello", "en"))
+
+def test_play_next_audio_waits_for_synthesis(text_to_speech):
+    text_to_speech.media_player = MagicMock()
+    queue_clip(text_to_speech, "Hello", Future())
 
     text_to_speech.play_next_audio()
-    mock_gtts.assert_called_once_with(text="Hello", lang="en")
-    mock_tempfile.assert_called_once_with(delete=False, suffix=".mp3")
-    mock_gtts_instance.save.assert_called_once_with(mock_tempfile_instance.name)
-    mock_qurl_from_local_file.assert_called_once_with(mock_tempfile_instance.name)
+    assert text_to_speech.queue_timer.isActive()
+    assert text_to_speech.scheduler.stats()["queued"] == 1
+    text_to_speech.media_player.play.assert_not_called()
 
 
-@patch("components.text_to_speech.QFile")
-def test_remove_temp_voice_file(mock_qfile, text_to_speech):
-    text_to_speech.remove_temp_voice_file("test.mp3")
+def test_play_next_audio_skips_failed_clip(text_to_speech):
+    text_to_speech.media_player = MagicMock()
+    queue_clip(text_to_speech, "Hello", done_future(error=RuntimeError("offline")))
+    queue_clip(text_to_speech, "World", done_future(b"world"))
 
-    mock_qfile.exists.assert_called_once_with("test.mp3")
-    mock_qfile.remove.assert_called_once_with("test.mp3")
+    text_to_speech.play_next_audio()
+    assert bytes(text_to_speech.audio_buffer.data()) == b"world"
+    assert not text_to_speech.scheduler.pending()
 
 
 def test_stop_voice(text_to_speech):
+    future = Future()
+    queue_clip(text_to_speech, "Hello", future)
+    text_to_speech.play_audio(b"clip")
     text_to_speech.stop_voice()
+    assert text_to_speech.audio_buffer is None
     assert not text_to_speech.playback_enabled
     assert text_to_speech.media_player.state() == QMediaPlayer.StoppedState
-    assert text_to_speech.text_queue.empty()
+    assert not text_to_speech.scheduler.pending()
+    assert future.cancelled()
+
+
+def test_interrupt_policy_cuts_off_current_clip(text_to_speech):
+    text_to_speech.set_policy(INTERRUPT)
+    text_to_speech.media_player = MagicMock()
+    text_to_speech.media_player.state.return_value = QMediaPlayer.PlayingState
+    text_to_speech.scheduler.prepare = MagicMock(return_value=Future())
+
+    text_to_speech.play_text_voice("Newer line", "en")
+    text_to_speech.media_player.stop.assert_called_once()
+    assert text_to_speech.scheduler.stats()["interruptions"] == 1
+
 
 @patch("components.text_to_speech.TextToSpeech.play_next_audio")
 def test_play_text_voice_for_all_languages(mock_play_next_audio, text_to_speech):
     test_text = "Hello, World!"
+    text_to_speech.scheduler.prepare = MagicMock(side_effect=lambda text, lang: Future())
 
     for language, code in LANGUAGES_GOOGLE:
         text_to_speech.play_text_voice(test_text, code)
-        assert (test_text, code) in text_to_speech.text_queue.queue
+        assert (test_text, code) in [item[:2] for item in text_to_speech.scheduler.items]
     assert mock_play_next_audio.call_count == len(LANGUAGES_GOOGLE)
-
-
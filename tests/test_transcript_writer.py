@@ -0,0 +1,63 @@
+import json
+import pytest
+from components.transcript_writer import (
+    JSONL,
+    TEXT,
+    TranscriptWriter,
+    format_for_path,
+)
+
+
+def test_format_for_path():
+    assert format_for_path("session.JSONL") == JSONL
+    assert format_for_path("session.txt") == TEXT
+
+
+def test_invalid_format(tmp_path):
+    with pytest.raises(ValueError):
+        TranscriptWriter(str(tmp_path / "out.txt"), output_format="csv")
+
+
+def test_text_lines_batched_and_flushed_on_close(tmp_path):
+    path = tmp_path / "out.txt"
+    writer = TranscriptWriter(str(path), flush_interval=60)
+    for index in range(5):
+        writer.write(f"line {index}")
+    assert not path.exists()
+    writer.close()
+
+    assert path.read_text(encoding="utf-8").splitlines() == [f"line {i}" for i in range(5)]
+    assert writer.stats() == {"lines": 5, "batches": 1}
+    writer.write("after close")
+    writer.close()
+
+
+def test_max_batch_writes_early(tmp_path):
+    path = tmp_path / "out.txt"
+    writer = TranscriptWriter(str(path), flush_interval=60, max_batch=2)
+    for index in range(5):
+        writer.write(f"line {index}")
+    writer.close()
+    assert writer.stats() == {"lines": 5, "batches": 3}
+
+
+def test_interval_flush(tmp_path):
+    path = tmp_path / "out.txt"
+    writer = TranscriptWriter(str(path), flush_interval=0.05)
+    writer.write("hello")
+    writer.thread.join(timeout=0.3)
+    assert path.read_text(encoding="utf-8") == "hello\n"
+    writer.close()
+
+
+def test_jsonl_records(tmp_path):
+    path = tmp_path / "out.jsonl"
+    writer = TranscriptWriter(str(path), output_format=JSONL)
+    writer.write("bonjour", "hello", "eng", "fr", 2)
+    writer.close()
+
+    record = json.loads(path.read_text(encoding="utf-8"))
+    assert record["source"] == "hello"
+    assert record["translated"] == "bonjour"
+    assert (record["from"], record["to"], record["region"]) == ("eng", "fr", 2)
+    assert "T" in record["time"]
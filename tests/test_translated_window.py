@@ -29,12 +29,31 @@ def test_paint_event(text_window, qtbot):
 
 def test_update_position(text_window):
     text_window.move = MagicMock()
+    text_window.excluded_from_capture = True
     text_window.resize(100, 50)
     text_window.update_position()
     expected_x = text_window.capture_area[0] + (text_window.capture_area[2] - 100) // 2
     expected_y = text_window.capture_area[1] + (text_window.capture_area[3] - 50) // 2
     text_window.move.assert_called_once_with(expected_x, expected_y)
 
+def test_update_position_outside_area_when_not_excluded(text_window):
+    text_window.move = MagicMock()
+    text_window.excluded_from_capture = False
+    text_window.monitor_geometry = QRect(0, 0, 800, 600)
+    text_window.resize(100, 50)
+    text_window.update_position()
+    text_window.move.assert_called_once_with(100, 200)
+
+    text_window.move.reset_mock()
+    text_window.capture_area = (0, 500, 300, 100)
+    text_window.update_position()
+    text_window.move.assert_called_once_with(100, 450)
+
+    text_window.move.reset_mock()
+    text_window.capture_area = (0, 0, 300, 600)
+    text_window.update_position()
+    text_window.move.assert_called_once_with(100, 275)
+
 def test_update_text(text_window):
     new_text = "New test text"
     text_window.update_text(new_text)
@@ -42,3 +61,64 @@ def test_update_text(text_window):
 
 
 
+def test_update_text_relayouts_only_on_change(text_window):
+    layouts = text_window.layouts
+    text_window.update_text("Test text")
+    assert text_window.layouts == layouts
+
+    text_window.update_text("A much longer line of translated text that has to wrap")
+    assert text_window.layouts == layouts + 1
+    assert text_window.width() <= 300
+
+def test_set_area(text_window):
+    layouts = text_window.layouts
+    text_window.set_area(0, (0, 0, 300, 200))
+    assert text_window.layouts == layouts
+
+    text_window.set_area(0, (100, 100, 400, 300))
+    assert text_window.capture_area == (100, 100, 400, 300)
+    assert text_window.layouts == layouts + 1
+    assert text_window.x() == 100 + (400 - text_window.width()) // 2
+
+def test_relayout_wraps_lines(text_window):
+    text_window.update_text("word " * 40)
+    assert len(text_window.text_lines) > 1
+    assert not text_window.text_path.isEmpty()
+
+def test_paint_does_not_relayout(text_window):
+    size = text_window.size()
+    layouts = text_window.layouts
+    color = text_window.background_color
+    text_window.grab()
+    text_window.grab()
+    assert text_window.size() == size
+    assert text_window.layouts == layouts
+    assert text_window.background_color == color
+
+def test_frame_rect_follows_visibility(text_window, qtbot):
+    text_window.excluded_from_capture = False
+    text_window.set_area(1, (0, 0, 300, 600))
+    assert text_window.frame_rect is None
+    with qtbot.waitExposed(text_window):
+        text_window.show()
+    x, y, width, height = text_window.frame_rect
+    assert (width, height) == (text_window.width(), text_window.height())
+    assert x == (300 - width) // 2 and y == (600 - height) // 2
+    text_window.hide()
+    assert text_window.frame_rect is None
+
+def test_frame_rect_outside_area_misses_the_source_text(text_window, qtbot):
+    text_window.excluded_from_capture = False
+    text_window.set_area(1, (0, 0, 300, 200))
+    with qtbot.waitExposed(text_window):
+        text_window.show()
+    x, y, width, height = text_window.frame_rect
+    assert y == 200
+
+def test_set_area_uses_the_mss_monitor_geometry(text_window):
+    screen = QApplication.screens()[0].geometry()
+    text_window.excluded_from_capture = False
+    text_window.set_area(1, (0, screen.height() - 100, 300, 100))
+    assert text_window.monitor_geometry == screen
+    assert text_window.position[1] == screen.height() - 100 - text_window.height()
+    assert text_window.y() + text_window.height() <= screen.height()
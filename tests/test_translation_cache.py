@@ -0,0 +1,51 @@
+import os
+from components.translation_cache import TranslationCache, normalize_source
+
+
+def test_normalize_source():
+    assert normalize_source("  Hello \n world ") == "Hello world"
+    assert normalize_source("Café") == "Café"
+
+
+def test_hit_and_miss():
+    cache = TranslationCache()
+    assert cache.get("hello", "fr") is None
+    cache.put("hello", "fr", "bonjour")
+    assert cache.get(" hello ", "fr") == "bonjour"
+    assert cache.get("hello", "de") is None
+    assert cache.stats() == {"hits": 1, "disk_hits": 0, "misses": 2, "size": 1}
+
+
+def test_lru_eviction():
+    cache = TranslationCache(maxsize=2)
+    cache.put("one", "fr", "un")
+    cache.put("two", "fr", "deux")
+    cache.get("one", "fr")
+    cache.put("three", "fr", "trois")
+    assert cache.get("two", "fr") is None
+    assert cache.get("one", "fr") == "un"
+    assert cache.get("three", "fr") == "trois"
+
+
+def test_disk_store_survives_restart(tmp_path):
+    path = os.path.join(tmp_path, "cache", "translations.sqlite3")
+    cache = TranslationCache(path=path)
+    cache.put("hello", "fr", "bonjour")
+    cache.close()
+
+    cache = TranslationCache(path=path)
+    assert cache.get("hello", "fr") == "bonjour"
+    assert cache.stats()["disk_hits"] == 1
+    assert cache.get("hello", "fr") == "bonjour"
+    assert cache.stats()["disk_hits"] == 1
+    cache.close()
+
+
+def test_bad_disk_path_falls_back_to_memory(tmp_path):
+    blocker = os.path.join(tmp_path, "file")
+    with open(blocker, "w") as f:
+        f.write("")
+    cache = TranslationCache(path=os.path.join(blocker, "translations.sqlite3"))
+    assert cache.connection is None
+    cache.put("hello", "fr", "bonjour")
+    assert cache.get("hello", "fr") == "bonjour"
@@ -0,0 +1,165 @@
+import json
+import threading
+import time
+import pytest
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, quote, urlparse
+from urllib.request import urlopen
+from components.translation_worker import TranslationWorker
+
+DELAYS = {"slow": 0.5, "blocking": 0.3}
+
+
+class StubTranslationHandler(BaseHTTPRequestHandler):
+    """answers /translate?text=..&dest=.. with every line upper cased after a delay"""
+
+    def do_GET(self):
+        query = parse_qs(urlparse(self.path).query)
+        lines = query["text"][0].split("\n")
+        time.sleep(max(DELAYS.get(line, 0) for line in lines))
+        translated = [f"{line.upper()} ({query['dest'][0]})" for line in lines]
+        body = json.dumps({"text": "\n".join(translated)}).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture(scope="module")
+def stub_server():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), StubTranslationHandler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{server.server_address[1]}"
+    server.shutdown()
+
+
+class StubTextProcessor:
+    def __init__(self, url):
+        self.url = url
+        self.calls = []
+
+    def translate_batch(self, texts, target_language):
+        self.calls.append(texts)
+        url = f"{self.url}/translate?text={quote(chr(10).join(texts))}&dest={target_language}"
+        with urlopen(url) as response:
+            return json.loads(response.read())["text"].split("\n")
+
+
+def test_translation_delivered_through_signal(qtbot, stub_server):
+    worker = TranslationWorker(StubTextProcessor(stub_server))
+    with qtbot.wait_signal(worker.translated, timeout=5000) as blocker:
+        worker.request("hello", "fr")
+    assert blocker.args == ["hello", "HELLO (fr)", "fr", 0]
+    worker.stop()
+
+
+def test_request_returns_immediately(qtbot, stub_server):
+    worker = TranslationWorker(StubTextProcessor(stub_server))
+    start = time.perf_counter()
+    with qtbot.wait_signal(worker.translated, timeout=5000):
+        worker.request("slow", "fr")
+        assert time.perf_counter() - start < 0.2
+    worker.stop()
+
+
+def test_queued_requests_cancelled(qtbot, stub_server):
+    processor = StubTextProcessor(stub_server)
+    worker = TranslationWorker(processor, workers=1)
+    results = []
+    worker.translated.connect(lambda source, text, lang, key: results.append(source))
+
+    worker.request("blocking", "fr")
+    time.sleep(0.15)
+    worker.request("old", "fr")
+    time.sleep(0.15)
+    with qtbot.wait_signal(worker.translated, timeout=5000, check_params_cb=lambda *args: args[0] == "new"):
+        worker.request("new", "fr")
+
+    assert ["old"] not in processor.calls
+    assert results[-1] == "new"
+    assert worker.stats()["cancelled"] == 1
+    worker.stop()
+
+
+def test_stale_results_dropped(qtbot, stub_server):
+    worker = TranslationWorker(StubTextProcessor(stub_server), workers=2)
+    results = []
+    worker.translated.connect(lambda source, text, lang, key: results.append(source))
+
+    worker.request("slow", "fr")
+    time.sleep(0.15)
+    with qtbot.wait_signal(worker.translated, timeout=5000):
+        worker.request("fast", "fr")
+    qtbot.wait(800)
+
+    assert results == ["fast"]
+    assert worker.stats()["stale"] == 1
+    worker.stop()
+
+
+def test_requests_in_one_window_share_a_batch(qtbot, stub_server):
+    processor = StubTextProcessor(stub_server)
+    worker = TranslationWorker(processor, window=0.1)
+    results = []
+    worker.translated.connect(lambda source, text, lang, key: results.append(text))
+
+    futures = [worker.batcher.submit(text, "fr") for text in ("one", "two", "one")]
+    assert futures[0] is not futures[2]
+    assert [future.result(timeout=5) for future in futures] == ["ONE (fr)", "TWO (fr)", "ONE (fr)"]
+    assert processor.calls == [["one", "two"]]
+    assert worker.batcher.stats() == {"batches": 1, "segments": 2, "duplicates": 1}
+    worker.stop()
+
+
+def test_keys_dont_cancel_each_other(qtbot, stub_server):
+    worker = TranslationWorker(StubTextProcessor(stub_server), workers=2)
+    results = []
+    worker.translated.connect(lambda source, text, lang, key: results.append((source, key)))
+
+    worker.request("slow", "fr", key=1)
+    time.sleep(0.15)
+    worker.request("fast", "fr", key=2)
+    qtbot.waitUntil(lambda: len(results) == 2, timeout=5000)
+
+    assert results == [("fast", 2), ("slow", 1)]
+    assert worker.stats()["stale"] == 0
+    assert worker.stats()["cancelled"] == 0
+    worker.stop()
+
+
+def test_shared_text_survives_cancel_from_other_key(qtbot, stub_server):
+    processor = StubTextProcessor(stub_server)
+    worker = TranslationWorker(processor, window=0.1)
+    results = []
+    worker.translated.connect(lambda source, text, lang, key: results.append((source, key)))
+
+    worker.request("hello", "fr", key=1)
+    worker.request("hello", "fr", key=2)
+    worker.request("bye", "fr", key=1)
+    qtbot.waitUntil(lambda: len(results) == 2, timeout=5000)
+
+    assert sorted(results) == [("bye", 1), ("hello", 2)]
+    assert processor.calls == [["hello", "bye"]]
+    worker.stop()
+
+
+def test_shared_text_dropped_once_nobody_wants_it(qtbot, stub_server):
+    worker = TranslationWorker(StubTextProcessor(stub_server), window=0.1)
+    first = worker.batcher.submit("hello", "fr")
+    second = worker.batcher.submit("hello", "fr")
+
+    first.cancel()
+    assert not second.done()
+    assert second.result(timeout=5) == "HELLO (fr)"
+
+    third = worker.batcher.submit("bye", "fr")
+    fourth = worker.batcher.submit("bye", "fr")
+    third.cancel()
+    fourth.cancel()
+    qtbot.wait(300)
+    assert worker.batcher.stats()["segments"] == 1
+    worker.stop()
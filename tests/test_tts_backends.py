@@ -0,0 +1,40 @@
+import sys
+from unittest.mock import MagicMock, patch
+from components.tts_backends import (
+    ESPEAK,
+    GTTS,
+    ESpeakBackend,
+    GTTSBackend,
+    available_tts_backends,
+    create_tts_backend,
+)
+
+
+def test_gtts_backend_synthesizes_in_memory():
+    gtts_module = MagicMock()
+    gtts_module.gTTS.return_value.write_to_fp.side_effect = lambda fp: fp.write(b"mp3")
+
+    with patch.dict(sys.modules, {"gtts": gtts_module}):
+        assert GTTSBackend().synthesize("Hello", "en") == b"mp3"
+    gtts_module.gTTS.assert_called_once_with(text="Hello", lang="en")
+
+
+@patch("components.tts_backends.subprocess.run")
+@patch("components.tts_backends.shutil.which", return_value="/usr/bin/espeak-ng")
+def test_espeak_backend(mock_which, mock_run):
+    mock_run.return_value.stdout = b"wav"
+
+    assert ESpeakBackend().synthesize("Hallo", "zh-cn") == b"wav"
+    assert mock_run.call_args[0][0] == ["/usr/bin/espeak-ng", "-v", "zh", "--stdout", "Hallo"]
+
+
+@patch("components.tts_backends.shutil.which", return_value=None)
+def test_create_falls_back_to_gtts(mock_which):
+    assert available_tts_backends() == [GTTS]
+    assert isinstance(create_tts_backend(ESPEAK), GTTSBackend)
+
+
+@patch("components.tts_backends.shutil.which", return_value="/usr/bin/espeak")
+def test_create_espeak(mock_which):
+    assert available_tts_backends() == [GTTS, ESPEAK]
+    assert isinstance(create_tts_backend(ESPEAK), ESpeakBackend)
@@ -0,0 +1,129 @@
+import os
+import threading
+import pytest
+from unittest.mock import patch
+from components.tts_backends import ESPEAK, GTTS
+from components.tts_engine import TTSEngine
+
+
+class FakeBackend:
+    name = "fake"
+    extension = "wav"
+
+    def __init__(self):
+        self.calls = []
+        self.release = threading.Event()
+        self.release.set()
+
+    def synthesize(self, text, language_code):
+        self.release.wait(5)
+        self.calls.append((text, language_code))
+        return text.encode("utf-8")
+
+
+@pytest.fixture
+def engine(tmp_path):
+    engine = TTSEngine(str(tmp_path))
+    engine.backend = FakeBackend()
+    yield engine
+    engine.stop()
+
+
+def test_prepare_synthesizes_into_cache(engine, tmp_path):
+    assert engine.prepare("Hello", "en").result(timeout=5) == b"Hello"
+
+    assert [name.endswith(".wav") for name in os.listdir(str(tmp_path))] == [True]
+    assert engine.stats()["synthesized"] == 1
+
+
+def test_cached_clip_resolves_immediately(engine):
+    engine.prepare("Hello", "en").result(timeout=5)
+
+    future = engine.prepare("Hello", "en")
+    assert future.done()
+    assert future.result() == b"Hello"
+    assert engine.backend.calls == [("Hello", "en")]
+
+
+def test_clip_on_disk_is_not_synthesized_again(engine):
+    engine.prepare("Hello", "en").result(timeout=5)
+    engine.cache.clips.clear()
+
+    assert engine.prepare("Hello", "en").result(timeout=5) == b"Hello"
+    assert engine.backend.calls == [("Hello", "en")]
+    assert engine.stats()["disk_hits"] == 1
+
+
+def test_same_text_in_flight_is_synthesized_once(engine):
+    engine.backend.release.clear()
+    first = engine.prepare("Hello", "en")
+    second = engine.prepare("Hello", "en")
+    engine.backend.release.set()
+
+    assert first is not second
+    assert first.result(timeout=5) == second.result(timeout=5) == b"Hello"
+    assert engine.backend.calls == [("Hello", "en")]
+
+
+def test_cancelling_one_caller_keeps_the_shared_clip(engine):
+    engine.backend.release.clear()
+    engine.prepare("Busy", "en")
+    first = engine.prepare("Hello", "en")
+    second = engine.prepare("Hello", "en")
+
+    assert second.cancel()
+    engine.backend.release.set()
+
+    assert first.result(timeout=5) == b"Hello"
+    assert engine.backend.calls == [("Busy", "en"), ("Hello", "en")]
+
+
+def test_cancelling_every_caller_cancels_the_synthesis(engine):
+    engine.backend.release.clear()
+    engine.prepare("Busy", "en")
+    first = engine.prepare("Hello", "en")
+    second = engine.prepare("Hello", "en")
+
+    assert first.cancel() and second.cancel()
+    engine.backend.release.set()
+
+    assert engine.prepare("Other", "en").result(timeout=5) == b"Other"
+    assert engine.backend.calls == [("Busy", "en"), ("Other", "en")]
+
+
+def test_started_clip_cant_be_cancelled(engine):
+    engine.backend.release.clear()
+    first = engine.prepare("Hello", "en")
+    while not first.running():
+        engine.backend.release.wait(0.01)
+    second = engine.prepare("Hello", "en")
+
+    assert not first.cancel()
+    assert not second.cancel()
+    engine.backend.release.set()
+    assert second.result(timeout=5) == b"Hello"
+
+
+def test_failed_synthesis_raises_from_future(engine):
+    def fail(text, language_code):
+        raise RuntimeError("offline")
+
+    engine.backend.synthesize = fail
+    with pytest.raises(RuntimeError):
+        engine.prepare("Hello", "en").result(timeout=5)
+
+
+def test_set_backend_keeps_clips_apart(engine):
+    engine.prepare("Hello", "en").result(timeout=5)
+    other = FakeBackend()
+    other.name = "other"
+    engine.backend = other
+
+    engine.prepare("Hello", "en").result(timeout=5)
+    assert other.calls == [("Hello", "en")]
+    assert engine.stats()["synthesized"] == 2
+
+
+@patch("components.tts_backends.shutil.which", return_value=None)
+def test_set_backend_falls_back_to_gtts(mock_which, engine):
+    assert engine.set_backend(ESPEAK) == GTTS